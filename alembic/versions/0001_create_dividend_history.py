@@ -0,0 +1,32 @@
+"""Create the block-partitioned dividend history table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Only the partitioned parent; the ingestion task creates a partition
+    # per DIVIDEND_HISTORY_PARTITION_BLOCKS range as blocks arrive
+    op.create_table(
+        "dividend_history",
+        sa.Column("netuid", sa.Integer(), nullable=False),
+        sa.Column("hotkey", sa.String(length=64), nullable=False),
+        sa.Column("block", sa.BigInteger(), nullable=False),
+        sa.Column("value", sa.Double(), nullable=False),
+        sa.PrimaryKeyConstraint("netuid", "hotkey", "block"),
+        postgresql_partition_by="RANGE (block)",
+    )
+
+
+def downgrade() -> None:
+    # Dropping a partitioned table drops its partitions
+    op.drop_table("dividend_history")
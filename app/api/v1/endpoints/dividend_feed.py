@@ -0,0 +1,78 @@
+import asyncio
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
+from loguru import logger
+from pydantic import ValidationError
+from app.core.config import settings
+from app.api.v1.schemas.dividend_feed import DividendFeedRequest
+from app.services.dividend_feed import DividendFeed, FeedSubscription
+from app.core.dependencies import get_dividend_feed
+
+router = APIRouter()
+
+
+def _websocket_token(websocket: WebSocket) -> str:
+    """Read the API token from the Authorization header or, for browsers, the token query parameter."""
+    authorization = websocket.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        return authorization[7:]
+    return websocket.query_params.get("token", "")
+
+
+async def _send_messages(websocket: WebSocket, subscription: FeedSubscription) -> None:
+    """Forward queued messages to the client until cancelled."""
+    while True:
+        message = await subscription.queue.get()
+        await websocket.send_json(message)
+
+
+def _log_sender_failure(task: asyncio.Task) -> None:
+    """Log why a sender task stopped, unless it was cancelled on disconnect."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Dividend feed sender stopped: {task.exception()!r}")
+
+
+@router.websocket("/tao_dividends/feed")
+async def dividend_feed(
+    websocket: WebSocket,
+    feed: DividendFeed = Depends(get_dividend_feed)
+) -> None:
+    """
+    Push dividend changes of watched (netuid, hotkey) pairs.
+    
+    Clients send {"action": "subscribe" | "unsubscribe", "items": [...]}
+    and receive {"type": "update", ...} messages with the current value of
+    each new pair and then only when a value changes.
+    """
+    if _websocket_token(websocket) != settings.API_TOKEN:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    subscription = feed.open()
+    sender = asyncio.create_task(_send_messages(websocket, subscription))
+    sender.add_done_callback(_log_sender_failure)
+    try:
+        while True:
+            try:
+                request = DividendFeedRequest.model_validate(await websocket.receive_json())
+            except (ValidationError, ValueError) as e:
+                subscription.push({"type": "error", "detail": str(e)})
+                continue
+            
+            pairs = {(item.netuid, item.hotkey) for item in request.items}
+            if request.action == "unsubscribe":
+                feed.unwatch(subscription, pairs)
+                subscription.push({"type": "unsubscribed", "watching": len(subscription.pairs)})
+            elif len(subscription.pairs | pairs) > settings.DIVIDEND_FEED_MAX_PAIRS:
+                subscription.push({
+                    "type": "error",
+                    "detail": f"At most {settings.DIVIDEND_FEED_MAX_PAIRS} pairs can be watched"
+                })
+            else:
+                await feed.watch(subscription, pairs)
+                subscription.push({"type": "subscribed", "watching": len(subscription.pairs)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        feed.close(subscription)
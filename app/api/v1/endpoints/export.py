@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from app.core.security import verify_token
+from app.services.dividends_export import DividendsExportService, ExportFormat
+from app.core.dependencies import get_dividends_export_service
+
+router = APIRouter()
+
+
+@router.get("/export/dividends", response_class=StreamingResponse)
+async def export_dividends(
+    export_format: ExportFormat = Query("ndjson", alias="format", description="Output format, ndjson or csv"),
+    token: str = Depends(verify_token),
+    service: DividendsExportService = Depends(get_dividends_export_service)
+) -> StreamingResponse:
+    """
+    Stream the dividends of every hotkey in every subnet.
+    
+    Subnets are read page by page at a single block, so rows start arriving
+    before the whole network is scanned and memory stays flat.
+    """
+    return StreamingResponse(
+        service.stream(export_format),
+        media_type=DividendsExportService.MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f"attachment; filename=dividends.{export_format}"}
+    )
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, Request, Response
+from app.core.metrics import render_metrics
+from app.core.security import verify_token
+from app.db.session import db_pool_stats
+from app.api.v1.schemas.monitoring import CacheStatsResponse, PoolStatsResponse
+
+router = APIRouter()
+# Served outside the versioned API, where Prometheus scrapes by default
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    """
+    Expose Prometheus metrics.
+    
+    With PROMETHEUS_MULTIPROC_DIR set, the samples of every API worker
+    process are aggregated, whichever worker serves the scrape.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@router.get("/monitoring/pools", response_model=PoolStatsResponse)
+async def get_pool_stats(
+    request: Request,
+    token: str = Depends(verify_token)
+) -> PoolStatsResponse:
+    """
+    Get statistics of the application-scoped connection pools.
+    
+    Reports the database and Redis connection pools, the Bittensor client
+    pool and the thread pool that runs blocking substrate calls.
+    """
+    state = request.app.state
+    return PoolStatsResponse(
+        database=db_pool_stats(state.db_engine),
+        redis=state.redis_pool.stats(),
+        bittensor=state.bittensor_pool.stats(),
+        chain_executor=state.chain_executor.stats()
+    )
+
+
+@router.get("/monitoring/cache", response_model=CacheStatsResponse)
+async def get_cache_stats(
+    request: Request,
+    token: str = Depends(verify_token)
+) -> CacheStatsResponse:
+    """
+    Get hit and miss counters of the in-process and Redis cache tiers.
+    
+    Counters are kept per API worker process.
+    """
+    state = request.app.state
+    local_cache = state.local_cache
+    return CacheStatsResponse(
+        l1_enabled=local_cache is not None,
+        l1_size=len(local_cache) if local_cache is not None else 0,
+        **state.cache_stats.snapshot()
+    )
@@ -0,0 +1,38 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from app.core.security import verify_token
+from app.core.config import settings
+from app.core.responses import fast_response
+from app.api.v1.schemas.subnets import SortOrder, SubnetDividendsResponse, SubnetDividendsSort
+from app.services.subnet_dividends import SubnetDividendsService
+from app.core.dependencies import get_subnet_dividends_service
+
+router = APIRouter()
+
+
+@router.get("/subnets/{netuid}/dividends", response_model=SubnetDividendsResponse)
+async def get_subnet_dividends(
+    netuid: int = Path(..., description="The subnet ID", ge=0),
+    sort_by: SubnetDividendsSort = Query("dividend", description="Field to sort by"),
+    order: SortOrder = Query("desc", description="Sort order"),
+    limit: int = Query(
+        settings.SUBNET_DIVIDENDS_PAGE_SIZE,
+        description="Maximum hotkeys per page; the first page is the top-N",
+        ge=1,
+        le=settings.SUBNET_DIVIDENDS_MAX_PAGE_SIZE
+    ),
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous page"),
+    token: str = Depends(verify_token),
+    service: SubnetDividendsService = Depends(get_subnet_dividends_service)
+) -> SubnetDividendsResponse:
+    """
+    Get the dividends of every hotkey in a subnet.
+    
+    The whole subnet is read from one snapshot and cached as a single blob,
+    so paging through it does not touch the chain.
+    """
+    try:
+        page = await service.get_page(netuid, sort_by=sort_by, order=order, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return fast_response(page)
@@ -1,8 +1,12 @@
+from typing import List
 from fastapi import APIRouter, Depends, Query
+from app.core.config import settings
+from app.core.responses import PreEncodedJSONResponse, fast_response
 from app.core.security import verify_token
-from app.api.v1.schemas.tao import TaoDividendsResponse
+from app.api.v1.schemas.tao import TaoDividendsBatchRequest, TaoDividendsResponse
+from app.services.stake_pipeline import StakeJobQueue
 from app.services.tao_dividends import TaoDividendsService
-from app.core.dependencies import get_tao_dividends_service
+from app.core.dependencies import get_stake_job_queue, get_tao_dividends_service
 
 router = APIRouter()
 
@@ -11,15 +15,42 @@ router = APIRouter()
 async def get_tao_dividends(
     netuid: int = Query(..., description="The subnet ID", ge=0),
     hotkey: str = Query(..., description="The hotkey (account ID or public key)", min_length=48, max_length=64),
+    trade: bool = Query(False, description="Stake to or unstake from the hotkey based on the subnet's Twitter sentiment"),
     token: str = Depends(verify_token),
-    service: TaoDividendsService = Depends(get_tao_dividends_service)
+    service: TaoDividendsService = Depends(get_tao_dividends_service),
+    stake_queue: StakeJobQueue = Depends(get_stake_job_queue)
 ) -> TaoDividendsResponse:
     """
     Get Tao dividends for a given subnet and hotkey.
     
     This endpoint:
-    - Queries the Bittensor blockchain for dividend data
-    - Will support caching in future updates
-    - Will trigger background stake operations in future updates
+    - Queries the Bittensor blockchain for dividend data, served from cache when possible
+    - With trade=true, queues a sentiment and stake job. Jobs of the same
+      subnet are debounced and run by a Celery worker as one sentiment
+      request and one extrinsic
+    - With FAST_RESPONSES_ENABLED and no trade, encodes cache hits with
+      orjson straight from the cached entry
+    """
+    if settings.FAST_RESPONSES_ENABLED and not trade:
+        return PreEncodedJSONResponse(await service.get_dividends_body(netuid=netuid, hotkey=hotkey))
+    
+    response = await service.get_dividends(netuid=netuid, hotkey=hotkey)
+    response.stake_tx_triggered = await stake_queue.enqueue(netuid, hotkey) if trade else False
+    return fast_response(response)
+
+
+@router.post("/tao_dividends/batch", response_model=List[TaoDividendsResponse])
+async def get_tao_dividends_batch(
+    request: TaoDividendsBatchRequest,
+    token: str = Depends(verify_token),
+    service: TaoDividendsService = Depends(get_tao_dividends_service)
+) -> List[TaoDividendsResponse]:
+    """
+    Get Tao dividends for many (netuid, hotkey) pairs in one call.
+    
+    Cached pairs are served from Redis; the remaining pairs are fetched from
+    the chain with at most one read per subnet. Results are returned in
+    request order.
     """
-    return await service.get_dividends(netuid=netuid, hotkey=hotkey) 
\ No newline at end of file
+    pairs = [(item.netuid, item.hotkey) for item in request.items]
+    return fast_response(await service.get_dividends_batch(pairs))
\ No newline at end of file
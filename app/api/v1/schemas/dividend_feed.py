@@ -0,0 +1,16 @@
+from typing import List, Literal
+from pydantic import BaseModel, Field
+from app.api.v1.schemas.tao import TaoDividendsBatchItem
+from app.core.config import settings
+
+
+class DividendFeedRequest(BaseModel):
+    """Message a feed client sends to change the pairs it watches."""
+    
+    action: Literal["subscribe", "unsubscribe"] = Field(..., description="Whether to add or remove the pairs")
+    items: List[TaoDividendsBatchItem] = Field(
+        ...,
+        description="The (netuid, hotkey) pairs",
+        min_length=1,
+        max_length=settings.DIVIDEND_FEED_MAX_PAIRS
+    )
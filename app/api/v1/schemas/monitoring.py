@@ -0,0 +1,68 @@
+from pydantic import BaseModel, Field
+
+
+class RedisPoolStats(BaseModel):
+    """Statistics of the shared Redis connection pool."""
+    
+    max_connections: int = Field(..., description="Maximum connections in the pool")
+    in_use: int = Field(..., description="Connections currently checked out")
+    idle: int = Field(..., description="Open connections waiting in the pool")
+    acquisitions: int = Field(..., description="Connections checked out since startup")
+    avg_wait_seconds: float = Field(..., description="Average time spent waiting for a connection")
+    max_wait_seconds: float = Field(..., description="Longest time spent waiting for a connection")
+
+
+class BittensorPoolStats(BaseModel):
+    """Statistics of the Bittensor client pool."""
+    
+    size: int = Field(..., description="Clients owned by the pool")
+    available: int = Field(..., description="Clients waiting in the pool")
+    in_use: int = Field(..., description="Clients currently checked out")
+
+
+class ChainExecutorStats(BaseModel):
+    """Statistics of the thread pool running substrate calls."""
+    
+    max_workers: int = Field(..., description="Threads available for chain I/O")
+    queued: int = Field(..., description="Calls waiting for a thread")
+    running: int = Field(..., description="Calls currently executing")
+    calls: int = Field(..., description="Calls started since startup")
+    timeouts: int = Field(..., description="Calls that exceeded their timeout")
+    avg_queue_wait_seconds: float = Field(..., description="Average time calls waited for a thread")
+    max_queue_wait_seconds: float = Field(..., description="Longest time a call waited for a thread")
+
+
+class DatabasePoolStats(BaseModel):
+    """Statistics of the database connection pool."""
+    
+    size: int = Field(..., description="Connections kept in the pool")
+    max_overflow: int = Field(..., description="Extra connections allowed under load")
+    checked_in: int = Field(..., description="Open connections waiting in the pool")
+    checked_out: int = Field(..., description="Connections currently in use")
+    overflow: int = Field(..., description="Connections open beyond the pool size")
+
+
+class PoolStatsResponse(BaseModel):
+    """Schema for connection pool statistics."""
+    
+    database: DatabasePoolStats
+    redis: RedisPoolStats
+    bittensor: BittensorPoolStats
+    chain_executor: ChainExecutorStats
+
+
+class CacheTierStats(BaseModel):
+    """Hit and miss counters of one cache tier."""
+    
+    hits: int = Field(..., description="Lookups answered by this tier")
+    misses: int = Field(..., description="Lookups this tier could not answer")
+    hit_ratio: float = Field(..., description="Hits divided by all lookups")
+
+
+class CacheStatsResponse(BaseModel):
+    """Schema for cache statistics per tier."""
+    
+    l1_enabled: bool = Field(..., description="Whether the in-process cache is enabled")
+    l1_size: int = Field(..., description="Entries currently held in the in-process cache")
+    l1: CacheTierStats
+    redis: CacheTierStats
@@ -0,0 +1,26 @@
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+
+SubnetDividendsSort = Literal["dividend", "hotkey"]
+SortOrder = Literal["asc", "desc"]
+
+
+class HotkeyDividend(BaseModel):
+    """Dividend of one hotkey in a subnet."""
+    
+    hotkey: str = Field(..., description="The hotkey (SS58 address)")
+    dividend: float = Field(..., description="The dividend value")
+
+
+class SubnetDividendsResponse(BaseModel):
+    """Schema for one page of a subnet's dividends."""
+    
+    netuid: int = Field(..., description="The subnet ID")
+    block: int = Field(..., description="The block the dividends were read at")
+    total: int = Field(..., description="Number of hotkeys with dividends in the subnet")
+    cached: bool = Field(..., description="Whether the subnet was served without touching the chain")
+    items: List[HotkeyDividend] = Field(..., description="The hotkeys of this page, in the requested order")
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor of the next page, None on the last page"
+    )
@@ -1,4 +1,6 @@
+from typing import List, Optional
 from pydantic import BaseModel, Field
+from app.core.config import settings
 
 
 class TaoDividendsResponse(BaseModel):
@@ -8,4 +10,31 @@ class TaoDividendsResponse(BaseModel):
     hotkey: str = Field(..., description="The hotkey (account ID or public key)")
     dividend: float = Field(..., description="The dividend value")
     cached: bool = Field(default=True, description="Whether the response was served from cache")
-    stake_tx_triggered: bool = Field(default=True, description="Whether a stake transaction was triggered") 
\ No newline at end of file
+    stake_tx_triggered: bool = Field(default=True, description="Whether a stake transaction was triggered")
+    block: Optional[int] = Field(default=None, description="The block the dividend was read at")
+    snapshot_age_seconds: Optional[float] = Field(
+        default=None,
+        description="Age of the subnet snapshot the dividend was served from"
+    )
+    stale: bool = Field(
+        default=False,
+        description="Whether the cached value is past its soft TTL and being refreshed"
+    ) 
+
+
+class TaoDividendsBatchItem(BaseModel):
+    """A single (netuid, hotkey) pair of a batch request."""
+    
+    netuid: int = Field(..., description="The subnet ID", ge=0)
+    hotkey: str = Field(..., description="The hotkey (account ID or public key)", min_length=48, max_length=64)
+
+
+class TaoDividendsBatchRequest(BaseModel):
+    """Schema for a batch Tao dividends request."""
+    
+    items: List[TaoDividendsBatchItem] = Field(
+        ...,
+        description="The (netuid, hotkey) pairs to look up",
+        min_length=1,
+        max_length=settings.TAO_DIVIDENDS_BATCH_MAX_ITEMS
+    )
\ No newline at end of file
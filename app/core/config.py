@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 from pydantic import AnyHttpUrl, PostgresDsn, RedisDsn, field_validator, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -50,6 +50,22 @@ class Settings(BaseSettings):
             path=f"{values.get('POSTGRES_DB') or ''}",
         )
     
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = Field(
+        default=20,
+        description="Connections opened beyond DB_POOL_SIZE under load and closed when returned"
+    )
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = Field(
+        default=1800,
+        description="Age after which a pooled connection is replaced"
+    )
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = Field(
+        default=500,
+        description="Prepared statements cached per database connection"
+    )
+    
     # Redis configuration
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
@@ -73,8 +89,79 @@ class Settings(BaseSettings):
             path=f"/{values.get('REDIS_DB', 0)}",
         )
     
+    REDIS_POOL_MAX_CONNECTIONS: int = Field(
+        default=50,
+        description="Connections in the shared Redis pool"
+    )
+    REDIS_POOL_TIMEOUT_SECONDS: float = 5.0
+    REDIS_POOL_DRAIN_TIMEOUT_SECONDS: float = 5.0
+    
+    # Batch and pagination configuration
+    SUBNET_DIVIDENDS_PAGE_SIZE: int = 100
+    SUBNET_DIVIDENDS_MAX_PAGE_SIZE: int = 1000
+    EXPORT_PAGE_SIZE: int = Field(
+        default=1000,
+        description="Storage entries read per chain request when exporting every subnet"
+    )
+    EXPORT_POOL_SIZE: int = Field(
+        default=1,
+        description="Substrate connections kept for exports apart from BITTENSOR_POOL_SIZE, "
+                    "which bounds the exports running at once"
+    )
+    TAO_DIVIDENDS_BATCH_MAX_ITEMS: int = Field(
+        default=1000,
+        description="Maximum (netuid, hotkey) pairs accepted by the batch endpoint"
+    )
+    FAST_RESPONSES_ENABLED: bool = Field(
+        default=True,
+        description=(
+            "Encode dividend responses with orjson, answering cache hits "
+            "straight from the cached entry without building a response model"
+        )
+    )
+    
     # Cache configuration
-    CACHE_EXPIRATION_SECONDS: int = 120  # 2 minutes
+    CACHE_EXPIRATION_SECONDS: int = 120  # 2 minutes, hard TTL
+    CACHE_SOFT_TTL_SECONDS: float = Field(
+        default=60.0,
+        description="Age after which cached entries are served stale and refreshed in the background"
+    )
+    CACHE_REFRESH_AHEAD_RATIO: float = Field(
+        default=0.8,
+        description="Fraction of the soft TTL after which hot entries are refreshed ahead"
+    )
+    CACHE_HOT_KEY_MIN_HITS: int = 10
+    CACHE_HOT_KEY_WINDOW_SECONDS: float = 60.0
+    CACHE_HOT_KEY_MAX_TRACKED: int = 10000
+    CACHE_L1_ENABLED: bool = Field(
+        default=True,
+        description="Keep an in-process LRU cache in front of Redis"
+    )
+    CACHE_L1_MAX_SIZE: int = 10000
+    CACHE_L1_TTL_SECONDS: float = 5.0
+    CACHE_INVALIDATION_CHANNEL: str = "tao_watch:cache_invalidation"
+    CACHE_LAYOUT: Literal["key", "hash"] = Field(
+        default="key",
+        description=(
+            "Redis layout of cached dividends: 'key' for one key per entry, "
+            "'hash' for one hash per subnet, shared by the hotkey and subnet "
+            "endpoints and replaced atomically on refresh"
+        )
+    )
+    CACHE_SERIALIZER: Literal["json", "msgpack", "struct"] = Field(
+        default="json",
+        description=(
+            "Encoding of cached values ('json', 'msgpack' or 'struct'). Every "
+            "format is readable; switch from 'json' once all workers are upgraded"
+        )
+    )
+    CACHE_LOCK_ENABLED: bool = Field(
+        default=False,
+        description="Use a Redis lock so only one API worker refreshes an expired key"
+    )
+    CACHE_LOCK_TIMEOUT_SECONDS: float = 30.0
+    CACHE_LOCK_WAIT_SECONDS: float = 10.0
+    CACHE_LOCK_POLL_INTERVAL_SECONDS: float = 0.05
     
     # Authentication
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
@@ -86,10 +173,109 @@ class Settings(BaseSettings):
         description="Network to connect to ('finney' or 'test')"
     )
     BITTENSOR_WALLET_SEED: str = ""
+    BITTENSOR_POOL_SIZE: int = Field(
+        default=4,
+        description="Number of long-lived substrate connections kept by the API"
+    )
+    BITTENSOR_POOL_ACQUIRE_TIMEOUT_SECONDS: float = 10.0
+    BITTENSOR_POOL_HEALTH_CHECK_INTERVAL_SECONDS: float = 30.0
+    BITTENSOR_EXECUTOR_WORKERS: int = Field(
+        default=8,
+        description="Threads available for blocking substrate calls"
+    )
+    BITTENSOR_CALL_TIMEOUT_SECONDS: float = 30.0
+    SUBNET_SNAPSHOT_TTL_SECONDS: float = Field(
+        default=12.0,
+        description="Seconds a per-subnet dividends snapshot is reused (about one block)"
+    )
+    SUBNET_SNAPSHOT_MIN_HOTKEYS: int = Field(
+        default=32,
+        description="Hotkeys of one subnet requested together above which the full map is fetched"
+    )
+    BLOCK_WATCHER_ENABLED: bool = Field(
+        default=True,
+        description="Follow subnet epochs so cached dividends expire when they actually change"
+    )
+    BLOCK_WATCHER_POLL_INTERVAL_SECONDS: float = Field(
+        default=6.0,
+        description="Seconds between chain head polls (half a block)"
+    )
+    
+    # Dividend feed configuration
+    DIVIDEND_FEED_PREFIX: str = "tao_watch:dividend_feed"
+    DIVIDEND_FEED_QUEUE_SIZE: int = Field(
+        default=1000,
+        description="Messages buffered per feed client before the oldest are dropped"
+    )
+    DIVIDEND_FEED_MAX_PAIRS: int = Field(
+        default=1000,
+        description="Maximum (netuid, hotkey) pairs one feed client may watch"
+    )
+    DIVIDEND_FEED_CLAIM_TTL_SECONDS: int = 60
+    
+    # Dividend history configuration
+    DIVIDEND_HISTORY_PARTITION_BLOCKS: int = Field(
+        default=216000,
+        description="Blocks per dividend_history partition (about 30 days of 12s blocks)"
+    )
+    DIVIDEND_HISTORY_INTERVAL_SECONDS: float = Field(
+        default=4320.0,
+        description="Seconds between dividend history ingestions (one 360-block tempo)"
+    )
     
     # Celery configuration
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/2"
+    CELERY_WORKER_CONCURRENCY: int = Field(
+        default=2,
+        description="Worker processes per Celery worker, each holding one chain connection"
+    )
+    CELERY_WORKER_PREFETCH_MULTIPLIER: int = Field(
+        default=4,
+        description="Tasks each worker process reserves ahead of running them"
+    )
+    PREFETCH_INTERVAL_SECONDS: float = Field(
+        default=12.0,
+        description="Seconds between whole-network dividend prefetches (one block)"
+    )
+    PREFETCH_STATUS_KEY: str = "tao_watch:prefetch:last_run"
+    
+    # Stake pipeline configuration
+    STAKE_PIPELINE_PREFIX: str = "tao_watch:stake_pipeline"
+    STAKE_PIPELINE_DEBOUNCE_SECONDS: float = Field(
+        default=12.0,
+        description="Seconds stake jobs of a subnet are collected before they run as one batch"
+    )
+    STAKE_PIPELINE_JOB_TTL_SECONDS: int = Field(
+        default=300,
+        description="Seconds pending stake jobs are kept if their batch never runs"
+    )
+    STAKE_TAO_PER_SENTIMENT_POINT: float = Field(
+        default=0.01,
+        description="TAO staked (or unstaked when negative) per hotkey per point of sentiment"
+    )
+    STAKE_SUBMIT_PREFIX: str = "tao_watch:stake_submit"
+    STAKE_SUBMIT_WINDOW_SECONDS: float = Field(
+        default=12.0,
+        description="Seconds stake changes of a subnet are netted into one extrinsic (one block)"
+    )
+    STAKE_SUBMIT_MAX_RETRIES: int = Field(
+        default=3,
+        description="Times stake changes that failed before reaching the chain are re-queued, "
+                    "with the delay doubling from twice the window each time"
+    )
+    STAKE_SUBMIT_QUEUE: str = Field(
+        default="stake",
+        description="Celery queue of stake submissions, consumed by a single worker process "
+                    "so the wallet nonce is tracked in one place"
+    )
+    SENTIMENT_TWEET_COUNT: int = 20
+    SENTIMENT_QUERY_TEMPLATE: str = "Bittensor netuid {netuid}"
+    SENTIMENT_HTTP_TIMEOUT_SECONDS: float = 30.0
+    SENTIMENT_HTTP_MAX_CONNECTIONS: int = Field(
+        default=10,
+        description="HTTP connections kept per Celery worker process for the sentiment APIs"
+    )
     
     # Environment configuration
     ENVIRONMENT: str = "development"  # 'development', 'staging', 'production'
@@ -97,10 +283,35 @@ class Settings(BaseSettings):
     
     # Logging
     LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = Field(
+        default=True,
+        description="Write one JSON object per log record instead of colored text"
+    )
+    LOG_ENQUEUE: bool = Field(
+        default=True,
+        description="Write log records from a background thread so callers never block on stdout"
+    )
+    LOG_SAMPLE_RATES: Dict[str, float] = Field(
+        default={
+            "tao_dividends.hot_path": 0.01,
+            "redis_cache.hot_path": 0.01,
+            "bittensor_client.hot_path": 0.01,
+        },
+        description="Share of records below WARNING kept per logger name, for loggers of per-request events"
+    )
+    
+    # Metrics
+    CELERY_METRICS_PORT: int = Field(
+        default=0,
+        description="Port each Celery worker serves Prometheus metrics on, 0 to disable"
+    )
     
     # External APIs
     DATURA_API_KEY: str = ""
+    DATURA_API_URL: str = "https://apis.datura.ai/twitter"
     CHUTES_API_KEY: str = ""
+    CHUTES_API_URL: str = "https://llm.chutes.ai/v1/chat/completions"
+    CHUTES_MODEL: str = "unsloth/Llama-3.2-3B-Instruct"
     
     # Bittensor Network Settings
     bittensor_finney_endpoint: str = Field(
@@ -1,39 +1,102 @@
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from redis.asyncio import Redis
-from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends, Request, WebSocket
 from app.services.bittensor_client import BittensorClient
+from app.services.bittensor_pool import BittensorClientPool
+from app.services.block_watcher import BlockWatcher
+from app.services.cache_refresher import CacheRefresher
+from app.services.dividend_feed import DividendFeed
+from app.services.dividends_export import DividendsExportService
+from app.services.subnet_dividends import SubnetDividendsService
 from app.services.tao_dividends import TaoDividendsService
 from app.services.redis_cache import RedisCache
-from app.core.config import settings
+from app.services.single_flight import SingleFlight
+from app.services.stake_pipeline import StakeJobQueue
+from app.services.subnet_snapshot import SubnetSnapshotStore
+from app.tasks.stake import schedule_stake_pipeline
 
 
-async def get_redis() -> AsyncGenerator[Redis, None]:
-    """Get Redis client."""
-    redis = Redis.from_url(str(settings.REDIS_URI))
-    try:
-        yield redis
-    finally:
-        await redis.close()
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Get a database session from the shared engine, closed after the request."""
+    async with request.app.state.db_sessionmaker() as session:
+        yield session
 
 
-async def get_redis_cache(redis: Redis = Depends(get_redis)) -> RedisCache:
-    """Get Redis cache service."""
-    return RedisCache(redis)
+async def get_redis(request: Request) -> Redis:
+    """Get a Redis client backed by the shared connection pool."""
+    return Redis(connection_pool=request.app.state.redis_pool)
 
 
-async def get_bittensor_client() -> AsyncGenerator[BittensorClient, None]:
-    """Get Bittensor client."""
-    client = BittensorClient()
-    try:
-        await client.connect()
+async def get_redis_cache(request: Request, redis: Redis = Depends(get_redis)) -> RedisCache:
+    """Get Redis cache service, fronted by the process-local cache when enabled."""
+    return RedisCache(redis, request.app.state.local_cache, request.app.state.cache_stats)
+
+
+async def get_bittensor_client(request: Request) -> AsyncGenerator[BittensorClient, None]:
+    """Check out a connected Bittensor client from the application pool."""
+    async with request.app.state.bittensor_pool.acquire() as client:
         yield client
-    finally:
-        await client.close()
+
+
+async def get_bittensor_pool(request: Request) -> BittensorClientPool:
+    """Get the application pool of connected Bittensor clients."""
+    return request.app.state.bittensor_pool
+
+
+async def get_subnet_snapshots(request: Request) -> SubnetSnapshotStore:
+    """Get the application-scoped subnet snapshot store."""
+    return request.app.state.subnet_snapshots
+
+
+async def get_single_flight(request: Request) -> SingleFlight:
+    """Get the application-scoped single-flight group."""
+    return request.app.state.single_flight
+
+
+async def get_cache_refresher(request: Request) -> CacheRefresher:
+    """Get the application-scoped background cache refresher."""
+    return request.app.state.cache_refresher
+
+
+async def get_block_watcher(request: Request) -> Optional[BlockWatcher]:
+    """Get the application-scoped block watcher, None when disabled."""
+    return request.app.state.block_watcher
 
 
 async def get_tao_dividends_service(
-    client: BittensorClient = Depends(get_bittensor_client),
-    cache: RedisCache = Depends(get_redis_cache)
+    pool: BittensorClientPool = Depends(get_bittensor_pool),
+    cache: RedisCache = Depends(get_redis_cache),
+    snapshots: SubnetSnapshotStore = Depends(get_subnet_snapshots),
+    single_flight: SingleFlight = Depends(get_single_flight),
+    refresher: CacheRefresher = Depends(get_cache_refresher),
+    block_watcher: Optional[BlockWatcher] = Depends(get_block_watcher)
 ) -> TaoDividendsService:
-    """Get Tao dividends service."""
-    return TaoDividendsService(client, cache) 
\ No newline at end of file
+    """Get Tao dividends service, which checks a client out of the pool only to read the chain."""
+    return TaoDividendsService(None, cache, snapshots, single_flight, refresher, block_watcher, pool=pool)
+
+
+async def get_stake_job_queue(redis: Redis = Depends(get_redis)) -> StakeJobQueue:
+    """Get the queue that debounces sentiment and stake jobs into Celery batches."""
+    return StakeJobQueue(redis, schedule_stake_pipeline)
+
+
+async def get_subnet_dividends_service(
+    pool: BittensorClientPool = Depends(get_bittensor_pool),
+    cache: RedisCache = Depends(get_redis_cache),
+    snapshots: SubnetSnapshotStore = Depends(get_subnet_snapshots),
+    single_flight: SingleFlight = Depends(get_single_flight),
+    block_watcher: Optional[BlockWatcher] = Depends(get_block_watcher)
+) -> SubnetDividendsService:
+    """Get subnet dividends service, which checks a client out of the pool only to read the chain."""
+    return SubnetDividendsService(None, cache, snapshots, single_flight, block_watcher, pool=pool)
+
+
+async def get_dividends_export_service(request: Request) -> DividendsExportService:
+    """Get the dividends export service, checking clients out of the pool reserved for exports."""
+    return DividendsExportService(request.app.state.export_pool)
+
+
+async def get_dividend_feed(websocket: WebSocket) -> DividendFeed:
+    """Get the application-scoped dividend change feed."""
+    return websocket.app.state.dividend_feed
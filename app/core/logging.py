@@ -1,40 +1,110 @@
+import itertools
 import logging
 import sys
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, TextIO
 
+import orjson
 from loguru import logger
 
 from app.core.config import settings
 
+TEXT_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+
+# Loguru level names of the standard logging levels
+_LEVEL_NAMES = {
+    logging.CRITICAL: "CRITICAL",
+    logging.ERROR: "ERROR",
+    logging.WARNING: "WARNING",
+    logging.INFO: "INFO",
+    logging.DEBUG: "DEBUG",
+}
+
 
 class InterceptHandler(logging.Handler):
     """
-    Default handler from examples in loguru documentation.
-    Used to intercept standard logging messages toward loguru.
+    Route standard logging records to loguru.
+
+    The logger name, function and line of the standard record are copied
+    onto the loguru record, so no stack frames are walked to find the caller.
     See https://loguru.readthedocs.io/en/stable/overview.html#entirely-compatible-with-standard-logging
     """
 
     def emit(self, record: logging.LogRecord) -> None:
-        # Get corresponding Loguru level if it exists
-        try:
-            level = logger.level(record.levelname).name
-        except ValueError:
-            level = record.levelno
+        level = _LEVEL_NAMES.get(record.levelno, record.levelno)
+
+        def origin(loguru_record: Dict[str, Any]) -> None:
+            loguru_record.update(name=record.name, function=record.funcName, line=record.lineno)
+
+        logger.patch(origin).opt(exception=record.exc_info).log(level, record.getMessage())
+
+
+class SamplingFilter:
+    """
+    Keep a share of the records of high-frequency loggers.
+
+    A record's logger is the name bound with get_logger, else its module.
+    Records below WARNING of a logger with rate r are kept one in round(1/r),
+    counted per logger; a rate of 0 drops them all. Warnings and errors are
+    always kept.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        self._every = {name: max(1, round(1 / rate)) for name, rate in rates.items() if rate > 0}
+        self._muted = {name for name, rate in rates.items() if rate <= 0}
+        self._counters = {name: itertools.count() for name in self._every}
+        self._warning_no = logger.level("WARNING").no
 
-        # Find caller from where originated the logged message
-        frame, depth = logging.currentframe(), 2
-        while frame.f_code.co_filename == logging.__file__:
-            frame = frame.f_back
-            depth += 1
+    def __call__(self, record: Dict[str, Any]) -> bool:
+        if record["level"].no >= self._warning_no:
+            return True
+        name = record["extra"].get("name", record["name"])
+        every = self._every.get(name)
+        if every is None:
+            return name not in self._muted
+        return next(self._counters[name]) % every == 0
 
-        logger.opt(depth=depth, exception=record.exc_info).log(
-            level, record.getMessage()
-        )
+
+class JsonSink:
+    """
+    Write records as one JSON object per line.
+
+    With an enqueued handler the sink is called from loguru's worker thread,
+    so records are encoded off the thread that logged them.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self._stream = stream or sys.stdout
+
+    def __call__(self, message: Any) -> None:
+        record = message.record
+        extra = dict(record["extra"])
+        entry = {
+            "time": record["time"].isoformat(),
+            "level": record["level"].name,
+            "logger": extra.pop("name", record["name"]),
+            "function": record["function"],
+            "line": record["line"],
+            "message": record["message"],
+        }
+        if extra:
+            entry["extra"] = extra
+        if record["exception"] is not None:
+            # The handler appends the formatted traceback to the message
+            entry["exception"] = str(message)[len(record["message"]):].strip()
+        self._stream.write(orjson.dumps(entry, default=str).decode() + "\n")
+        self._stream.flush()
 
 
 def configure_logging() -> None:
-    """Configure loguru logging."""
-    
+    """
+    Configure loguru logging.
+
+    With LOG_ENQUEUE, records are handed to a background thread that
+    writes them, so logging never blocks on stdout. LOG_JSON writes one
+    JSON object per record instead of colored text, and LOG_SAMPLE_RATES
+    thins out the records of high-frequency loggers.
+    """
+
     log_level = settings.LOG_LEVEL.upper()
     
     # Intercept standard logging
@@ -46,15 +116,16 @@ def configure_logging() -> None:
         logging.getLogger(name).propagate = True
     
     # Configure loguru
-    logger.configure(
-        handlers=[
-            {
-                "sink": sys.stdout,
-                "level": log_level,
-                "format": "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-            }
-        ]
-    )
+    handler = {
+        "sink": sys.stdout,
+        "level": log_level,
+        "format": TEXT_FORMAT,
+        "enqueue": settings.LOG_ENQUEUE,
+        "filter": SamplingFilter(settings.LOG_SAMPLE_RATES),
+    }
+    if settings.LOG_JSON:
+        handler.update(sink=JsonSink(), format="{message}")
+    logger.configure(handlers=[handler])
     
     # Add specific loggers
     for logger_name in [
@@ -67,8 +138,10 @@ def configure_logging() -> None:
     ]:
         logging_logger = logging.getLogger(logger_name)
         logging_logger.handlers = [InterceptHandler()]
+        # The record is already routed; propagating would log it again per ancestor
+        logging_logger.propagate = False
 
 
 def get_logger(name: str) -> logger:
     """Get a logger instance with the specified name."""
-    return logger.bind(name=name) 
\ No newline at end of file
+    return logger.bind(name=name)
@@ -0,0 +1,166 @@
+import functools
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, MutableMapping, Tuple, TypeVar
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Latency buckets for calls expected to take milliseconds (Redis, cache tiers)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+# Latency buckets for chain calls and background tasks
+SLOW_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "tao_watch_http_request_duration_seconds",
+    "HTTP request latency per route",
+    ["method", "route", "status"],
+)
+CACHE_OPERATION_SECONDS = Histogram(
+    "tao_watch_cache_operation_duration_seconds",
+    "RedisCache operation latency",
+    ["operation"],
+    buckets=FAST_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "tao_watch_cache_lookups_total",
+    "Cache lookups per tier and result; hit ratio is hits over all lookups",
+    ["tier", "result"],
+)
+CHAIN_CONNECT_SECONDS = Histogram(
+    "tao_watch_chain_connect_duration_seconds",
+    "Time to open and test a substrate connection",
+    buckets=SLOW_BUCKETS,
+)
+CHAIN_QUERY_SECONDS = Histogram(
+    "tao_watch_chain_query_duration_seconds",
+    "Substrate storage query latency, including decoding",
+    ["method", "storage_function"],
+    buckets=SLOW_BUCKETS,
+)
+CHAIN_DECODED_ENTRIES = Counter(
+    "tao_watch_chain_decoded_entries_total",
+    "Storage entries decoded from substrate queries",
+    ["method", "storage_function"],
+)
+CHAIN_EXECUTOR_QUEUED = Gauge(
+    "tao_watch_chain_executor_queued",
+    "Chain calls waiting for an executor thread",
+    multiprocess_mode="livesum",
+)
+CHAIN_EXECUTOR_RUNNING = Gauge(
+    "tao_watch_chain_executor_running",
+    "Chain calls running on an executor thread",
+    multiprocess_mode="livesum",
+)
+CHAIN_EXECUTOR_QUEUE_WAIT_SECONDS = Histogram(
+    "tao_watch_chain_executor_queue_wait_seconds",
+    "Time chain calls wait for an executor thread",
+    buckets=FAST_BUCKETS + (2.5, 5.0, 10.0, 30.0),
+)
+CELERY_TASK_SECONDS = Histogram(
+    "tao_watch_celery_task_duration_seconds",
+    "Celery task run time per task and final state",
+    ["task", "state"],
+    buckets=SLOW_BUCKETS,
+)
+
+T = TypeVar("T")
+
+
+def observe_async(histogram: Histogram, *labels: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Decorate a coroutine function to observe its duration in histogram under labels."""
+    def decorator(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            started_at = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                histogram.labels(*labels).observe(time.perf_counter() - started_at)
+        return wrapper
+    return decorator
+
+
+def multiprocess_enabled() -> bool:
+    """Whether metrics are shared between worker processes through PROMETHEUS_MULTIPROC_DIR."""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def metrics_registry() -> CollectorRegistry:
+    """
+    Get the registry metrics are exposed from.
+
+    In multiprocess mode every process writes its samples to
+    PROMETHEUS_MULTIPROC_DIR, so a fresh registry aggregates them on each
+    scrape. Otherwise the process's own default registry is used.
+    """
+    if not multiprocess_enabled():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render every metric in the Prometheus text format.
+
+    Returns:
+        Tuple of (body, content type)
+    """
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop the live gauges of an exited worker process in multiprocess mode."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid)
+
+
+Scope = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the latency of every HTTP request per route.
+
+    Requests are labelled with the route's path template rather than the
+    requested path so path parameters do not create new series; requests
+    matching no route share the 'unmatched' label. Streaming responses are
+    timed until their last chunk is sent.
+    """
+
+    def __init__(self, app: Callable[[Scope, Receive, Send], Awaitable[None]]):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router records the matched route in the scope
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route, str(status["code"])).observe(
+                time.perf_counter() - started_at
+            )
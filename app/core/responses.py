@@ -0,0 +1,31 @@
+from typing import Any, List, Union
+import orjson
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel
+from app.core.config import settings
+
+
+class PreEncodedJSONResponse(Response):
+    """JSON response sent with a body that is already encoded."""
+
+    media_type = "application/json"
+
+
+def encode_model(model: BaseModel) -> bytes:
+    """Encode a response model as JSON with orjson."""
+    return orjson.dumps(model.model_dump())
+
+
+def fast_response(content: Union[BaseModel, List[BaseModel]]) -> Any:
+    """
+    Return endpoint content for the configured encoder.
+
+    With FAST_RESPONSES_ENABLED the content is encoded with orjson into a
+    response, which FastAPI sends without validating it against the
+    route's response_model again. Otherwise the content is returned as is.
+    """
+    if not settings.FAST_RESPONSES_ENABLED:
+        return content
+    if isinstance(content, list):
+        return ORJSONResponse([item.model_dump() for item in content])
+    return ORJSONResponse(content.model_dump())
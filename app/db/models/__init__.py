@@ -0,0 +1,3 @@
+from app.db.models.dividend_history import DividendHistory
+
+__all__ = ["DividendHistory"]
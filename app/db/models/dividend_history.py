@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Double, Integer, PrimaryKeyConstraint, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class DividendHistory(Base):
+    """
+    Dividend of a hotkey in a subnet at a block.
+    
+    The table is range-partitioned by block. The primary key doubles as the
+    (netuid, hotkey, block) index used by history lookups, and includes the
+    partition key as Postgres requires.
+    """
+    
+    __tablename__ = "dividend_history"
+    __table_args__ = (
+        PrimaryKeyConstraint("netuid", "hotkey", "block"),
+        {"postgresql_partition_by": "RANGE (block)"},
+    )
+    
+    netuid: Mapped[int] = mapped_column(Integer)
+    hotkey: Mapped[str] = mapped_column(String(64))
+    block: Mapped[int] = mapped_column(BigInteger)
+    value: Mapped[float] = mapped_column(Double)
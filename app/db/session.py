@@ -0,0 +1,44 @@
+from typing import Any, Dict
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from app.core.config import settings
+
+
+def create_db_engine() -> AsyncEngine:
+    """
+    Create the shared async database engine from settings.
+    
+    No connection is opened until the first session uses one.
+    """
+    return create_async_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        # Statements prepared on a connection are reused for its lifetime
+        connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    )
+
+
+def create_sessionmaker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """Create the session factory bound to the shared engine."""
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def db_pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    """
+    Get connection pool statistics of an engine for monitoring.
+    
+    Returns:
+        Dict with the pool size, overflow limit and the checked in,
+        checked out and overflow connection counts
+    """
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
@@ -1,10 +1,24 @@
+import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from loguru import logger
+from redis.asyncio import Redis
 
 from app.core.config import settings
 from app.core.logging import configure_logging
-from app.api.v1.endpoints import tao
+from app.core.metrics import MetricsMiddleware, mark_process_dead
+from app.db.session import create_db_engine, create_sessionmaker
+from app.api.v1.endpoints import dividend_feed, export, monitoring, subnets, tao
+from app.services.bittensor_pool import BittensorClientPool
+from app.services.block_watcher import BlockWatcher
+from app.services.cache_refresher import CacheRefresher
+from app.services.chain_executor import ChainExecutor
+from app.services.dividend_feed import DividendFeed
+from app.services.local_cache import CacheInvalidationListener, CacheStats, LocalCache
+from app.services.redis_pool import create_redis_pool
+from app.services.single_flight import SingleFlight
+from app.services.subnet_snapshot import SubnetSnapshotStore
 
 
 @asynccontextmanager
@@ -16,10 +30,68 @@ async def lifespan(app: FastAPI):
     # Startup
     configure_logging()
     
+    db_engine = create_db_engine()
+    app.state.db_engine = db_engine
+    app.state.db_sessionmaker = create_sessionmaker(db_engine)
+    
+    redis_pool = create_redis_pool()
+    app.state.redis_pool = redis_pool
+    app.state.cache_stats = CacheStats()
+    app.state.local_cache = None
+    invalidation_listener = None
+    if settings.CACHE_L1_ENABLED:
+        app.state.local_cache = LocalCache()
+        invalidation_listener = CacheInvalidationListener(
+            Redis(connection_pool=redis_pool),
+            app.state.local_cache
+        )
+        invalidation_listener.start()
+    
+    chain_executor = ChainExecutor()
+    bittensor_pool = BittensorClientPool(executor=chain_executor)
+    await bittensor_pool.start()
+    # Exports hold a client for minutes, so they get connections of their own
+    export_pool = BittensorClientPool(size=settings.EXPORT_POOL_SIZE, executor=chain_executor)
+    await export_pool.start()
+    app.state.chain_executor = chain_executor
+    app.state.bittensor_pool = bittensor_pool
+    app.state.export_pool = export_pool
+    app.state.subnet_snapshots = SubnetSnapshotStore()
+    block_watcher = None
+    if settings.BLOCK_WATCHER_ENABLED:
+        block_watcher = BlockWatcher(bittensor_pool, app.state.subnet_snapshots)
+    app.state.block_watcher = block_watcher
+    dividend_feed = DividendFeed(
+        Redis(connection_pool=redis_pool),
+        bittensor_pool,
+        app.state.subnet_snapshots,
+        block_watcher
+    )
+    dividend_feed.start()
+    app.state.dividend_feed = dividend_feed
+    if block_watcher:
+        block_watcher.add_listener(dividend_feed.on_epochs)
+        block_watcher.start()
+    app.state.single_flight = SingleFlight()
+    cache_refresher = CacheRefresher(bittensor_pool)
+    app.state.cache_refresher = cache_refresher
+    
     yield
     
     # Shutdown
-    # Add cleanup code here
+    if block_watcher:
+        await block_watcher.stop()
+    await dividend_feed.stop()
+    await cache_refresher.close()
+    if invalidation_listener:
+        await invalidation_listener.stop()
+    await bittensor_pool.close()
+    await export_pool.close()
+    chain_executor.shutdown()
+    await redis_pool.drain()
+    await db_engine.dispose()
+    mark_process_dead(os.getpid())
+    await logger.complete()
 
 
 def create_application() -> FastAPI:
@@ -45,8 +117,15 @@ def create_application() -> FastAPI:
             allow_headers=["*"],
         )
     
+    application.add_middleware(MetricsMiddleware)
+    
     # Include API routers
     application.include_router(tao.router, prefix=settings.API_V1_STR, tags=["tao"])
+    application.include_router(dividend_feed.router, prefix=settings.API_V1_STR, tags=["tao"])
+    application.include_router(subnets.router, prefix=settings.API_V1_STR, tags=["subnets"])
+    application.include_router(export.router, prefix=settings.API_V1_STR, tags=["export"])
+    application.include_router(monitoring.router, prefix=settings.API_V1_STR, tags=["monitoring"])
+    application.include_router(monitoring.metrics_router, tags=["monitoring"])
     
     return application
 
@@ -1,13 +1,27 @@
-from typing import Optional, Literal
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Literal, Tuple, TypeVar
 import asyncio
+import threading
 import traceback
 from loguru import logger
-from substrateinterface import SubstrateInterface
-from bittensor.core.chain_data import decode_account_id
+from substrateinterface import Keypair, SubstrateInterface
 from bittensor.core.settings import SS58_FORMAT
 from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import CHAIN_CONNECT_SECONDS, CHAIN_DECODED_ENTRIES, CHAIN_QUERY_SECONDS
+from app.services.chain_executor import ChainExecutor, get_default_chain_executor
 
 NetworkType = Literal["finney", "test"]
+T = TypeVar("T")
+
+RAO_PER_TAO = 10**9
+
+# Per-request point lookups, sampled by LOG_SAMPLE_RATES
+hot_path_logger = get_logger("bittensor_client.hot_path")
+
+
+class ExtrinsicNotSubmittedError(RuntimeError):
+    """An extrinsic failed before it was handed to the node, so it was never broadcast."""
+
 
 class BittensorClient:
     """Client for interacting with the Bittensor blockchain."""
@@ -16,16 +30,25 @@ class BittensorClient:
     MAX_RETRIES = 3
     RETRY_DELAY = 1  # seconds
     
-    def __init__(self, network: Optional[str] = None):
+    def __init__(self, network: Optional[str] = None, executor: Optional[ChainExecutor] = None):
         """
         Initialize the Bittensor client.
         
         Args:
             network: The network to connect to (e.g., 'finney', 'test').
                     If not provided, uses BITTENSOR_NETWORK from settings.
+            executor: Thread pool that runs the blocking substrate calls.
+                      If not provided, uses the process-wide chain executor.
         """
         self._network = self._validate_network(network or settings.BITTENSOR_NETWORK)
         self._substrate: Optional[SubstrateInterface] = None
+        self._executor = executor or get_default_chain_executor()
+        # Next nonce of the signing account, tracked locally so extrinsics can
+        # be submitted back to back without waiting for inclusion
+        self._next_nonce: Optional[int] = None
+        # Guards the tracked nonce against submissions still running in the
+        # executor after their caller gave up on them
+        self._nonce_lock = threading.Lock()
         
         # Map network names to WebSocket endpoints from settings
         self._endpoints = {
@@ -42,6 +65,31 @@ class BittensorClient:
             )
         return network  # type: ignore
     
+    async def _run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking substrate call on the chain executor.
+        
+        A call that times out may leave a response in flight on the
+        websocket, so the connection is dropped and must be re-established.
+        """
+        try:
+            return await self._executor.run(fn, *args, **kwargs)
+        except TimeoutError:
+            substrate, self._substrate = self._substrate, None
+            if substrate:
+                asyncio.get_running_loop().run_in_executor(None, substrate.close)
+            raise
+    
+    @staticmethod
+    def _open_substrate(endpoint: str) -> SubstrateInterface:
+        """Open a substrate connection and test it with a simple query."""
+        substrate = SubstrateInterface(
+            url=endpoint,
+            ss58_format=SS58_FORMAT
+        )
+        substrate.query("System", "Events")
+        return substrate
+    
     async def connect(self) -> None:
         """Establish connection to the Bittensor network with retries."""
         endpoint = self._endpoints.get(self._network)
@@ -50,14 +98,9 @@ class BittensorClient:
         
         for attempt in range(self.MAX_RETRIES):
             try:
-                # Create a substrate interface
-                self._substrate = SubstrateInterface(
-                    url=endpoint,
-                    ss58_format=SS58_FORMAT
-                )
-                
-                # Test the connection by making a simple query
-                self._substrate.query("System", "Events")
+                # Create and test a substrate interface off the event loop
+                with CHAIN_CONNECT_SECONDS.time():
+                    self._substrate = await self._executor.run(self._open_substrate, endpoint)
                 
                 logger.info(f"Connected to Bittensor {self._network} network at {endpoint}")
                 return
@@ -76,17 +119,42 @@ class BittensorClient:
         """Close the connection to the Bittensor network."""
         if self._substrate:
             try:
-                self._substrate.close()
+                await self._executor.run(self._substrate.close)
                 self._substrate = None
                 logger.info("Closed connection to Bittensor network")
             except Exception as e:
                 logger.error(f"Error closing Bittensor connection: {e}")
                 raise
     
+    @property
+    def is_connected(self) -> bool:
+        """Whether the client currently holds a substrate connection."""
+        return self._substrate is not None
+    
+    async def health_check(self) -> bool:
+        """
+        Check that the underlying websocket is still usable.
+        
+        Returns:
+            True if the node answered a lightweight RPC, False otherwise
+        """
+        if not self._substrate:
+            return False
+            
+        try:
+            await self._run(self._substrate.rpc_request, "system_health", [])
+            return True
+        except Exception as e:
+            logger.warning(f"Bittensor health check failed: {e}")
+            return False
+    
     async def get_tao_dividends(self, netuid: int, uid: str) -> float:
         """
         Get the Tao dividends for a given subnet and hotkey.
         
+        Reads the single TaoDividendsPerSubnet double-map entry for the
+        hotkey instead of scanning the whole subnet map.
+        
         Args:
             netuid: The subnet ID (will be converted to int if string)
             uid: The hotkey (account ID or public key in SS58 format)
@@ -105,28 +173,377 @@ class BittensorClient:
             # Ensure netuid is an integer
             netuid_int = int(netuid)
             
-            # Query the TaoDividendsPerSubnet storage
-            query_result = self._substrate.query_map(
-                module="SubtensorModule",
-                storage_function="TaoDividendsPerSubnet",
-                params=[netuid_int]
-            )
+            # Query the TaoDividendsPerSubnet entry for this hotkey
+            with CHAIN_QUERY_SECONDS.labels("query", "TaoDividendsPerSubnet").time():
+                query_result = await self._run(
+                    self._substrate.query,
+                    module="SubtensorModule",
+                    storage_function="TaoDividendsPerSubnet",
+                    params=[netuid_int, uid]
+                )
+            
+            if query_result is None or query_result.value is None:
+                logger.warning(f"No dividend found for netuid={netuid_int}, uid={uid}")
+                return 0.0
             
-            # Process results
-            for key, value in query_result:
-                # The key is already in SS58 format, so we can compare directly
-                if str(key) == uid:
-                    dividend = float(value.value)  # Ensure we return a float
-                    logger.info(f"Retrieved dividend for netuid={netuid_int}, uid={uid}: {dividend}")
-                    return dividend
-                    
-            # If we get here, the UID wasn't found
-            logger.warning(f"No dividend found for netuid={netuid_int}, uid={uid}")
-            return 0.0
+            dividend = float(query_result.value)  # Ensure we return a float
+            CHAIN_DECODED_ENTRIES.labels("query", "TaoDividendsPerSubnet").inc()
+            hot_path_logger.debug("Retrieved dividend for netuid={}, uid={}: {}", netuid_int, uid, dividend)
+            return dividend
             
         except ValueError as e:
             logger.error(f"Invalid netuid value: {netuid}. Must be convertible to integer.")
             raise ValueError(f"Invalid netuid value: {netuid}. Must be convertible to integer.") from e
         except Exception as e:
             logger.error(f"Failed to get Tao dividends: {e} with traceback: {traceback.format_exc()}")
-            raise 
\ No newline at end of file
+            raise
+    
+    async def get_tao_dividends_multi(self, netuid: int, uids: List[str]) -> Dict[str, float]:
+        """
+        Get the Tao dividends for several hotkeys of a subnet in one RPC.
+        
+        Builds one storage key per hotkey and reads them with query_multi.
+        
+        Args:
+            netuid: The subnet ID (will be converted to int if string)
+            uids: The hotkeys (SS58 addresses)
+            
+        Returns:
+            Dict mapping each requested hotkey to its dividend (0.0 if none)
+            
+        Raises:
+            RuntimeError: If the client is not connected
+            ValueError: If netuid cannot be converted to integer
+        """
+        if not self._substrate:
+            raise RuntimeError("Not connected to Bittensor network")
+        
+        if not uids:
+            return {}
+            
+        try:
+            netuid_int = int(netuid)
+            substrate = self._substrate
+            
+            def read_entries() -> list:
+                storage_keys = [
+                    substrate.create_storage_key(
+                        "SubtensorModule",
+                        "TaoDividendsPerSubnet",
+                        [netuid_int, uid]
+                    )
+                    for uid in uids
+                ]
+                return substrate.query_multi(storage_keys)
+            
+            with CHAIN_QUERY_SECONDS.labels("query_multi", "TaoDividendsPerSubnet").time():
+                query_result = await self._run(read_entries)
+            
+            # query_multi returns (storage_key, value) pairs in request order
+            dividends = {
+                uid: float(value.value) if value is not None and value.value is not None else 0.0
+                for uid, (_, value) in zip(uids, query_result)
+            }
+            CHAIN_DECODED_ENTRIES.labels("query_multi", "TaoDividendsPerSubnet").inc(len(dividends))
+            logger.info(f"Retrieved {len(dividends)} dividends for netuid={netuid_int}")
+            return dividends
+            
+        except ValueError as e:
+            logger.error(f"Invalid netuid value: {netuid}. Must be convertible to integer.")
+            raise ValueError(f"Invalid netuid value: {netuid}. Must be convertible to integer.") from e
+        except Exception as e:
+            logger.error(f"Failed to get Tao dividends: {e} with traceback: {traceback.format_exc()}")
+            raise
+    
+    async def get_subnet_dividends(self, netuid: int) -> Tuple[int, Dict[str, float]]:
+        """
+        Get the Tao dividends of every hotkey in a subnet at the current chain head.
+        
+        The whole TaoDividendsPerSubnet map is read at a single block hash so
+        the returned index is a consistent snapshot of the subnet.
+        
+        Args:
+            netuid: The subnet ID (will be converted to int if string)
+            
+        Returns:
+            Tuple of (block number, dict mapping hotkey to dividend)
+            
+        Raises:
+            RuntimeError: If the client is not connected
+            ValueError: If netuid cannot be converted to integer
+        """
+        if not self._substrate:
+            raise RuntimeError("Not connected to Bittensor network")
+            
+        try:
+            netuid_int = int(netuid)
+            substrate = self._substrate
+            
+            def read_map() -> Tuple[int, Dict[str, float]]:
+                block_hash = substrate.get_chain_head()
+                block_number = substrate.get_block_number(block_hash)
+                
+                # Iterating the result fetches further pages, so it stays in the thread
+                with CHAIN_QUERY_SECONDS.labels("query_map", "TaoDividendsPerSubnet").time():
+                    query_result = substrate.query_map(
+                        module="SubtensorModule",
+                        storage_function="TaoDividendsPerSubnet",
+                        params=[netuid_int],
+                        block_hash=block_hash
+                    )
+                    dividends = {str(key): float(value.value) for key, value in query_result}
+                CHAIN_DECODED_ENTRIES.labels("query_map", "TaoDividendsPerSubnet").inc(len(dividends))
+                return block_number, dividends
+            
+            block_number, dividends = await self._run(read_map)
+            logger.info(f"Retrieved {len(dividends)} dividends for netuid={netuid_int} at block {block_number}")
+            return block_number, dividends
+            
+        except ValueError as e:
+            logger.error(f"Invalid netuid value: {netuid}. Must be convertible to integer.")
+            raise ValueError(f"Invalid netuid value: {netuid}. Must be convertible to integer.") from e
+        except Exception as e:
+            logger.error(f"Failed to get subnet dividends: {e} with traceback: {traceback.format_exc()}")
+            raise
+    
+    async def get_subnet_epoch_blocks(self) -> Tuple[int, Dict[int, int]]:
+        """
+        Get the block at which each subnet last ran its epoch.
+        
+        Dividends of a subnet only change when its epoch runs, so comparing
+        these blocks between two chain heads tells which subnets changed.
+        Both values are read at the same block hash.
+        
+        Returns:
+            Tuple of (chain head block number, dict mapping netuid to the
+            block of its last epoch)
+            
+        Raises:
+            RuntimeError: If the client is not connected
+        """
+        if not self._substrate:
+            raise RuntimeError("Not connected to Bittensor network")
+            
+        try:
+            substrate = self._substrate
+            
+            def read_epochs() -> Tuple[int, Dict[int, int]]:
+                block_hash = substrate.get_chain_head()
+                block_number = substrate.get_block_number(block_hash)
+                with CHAIN_QUERY_SECONDS.labels("query_map", "LastMechansimStepBlock").time():
+                    query_result = substrate.query_map(
+                        module="SubtensorModule",
+                        storage_function="LastMechansimStepBlock",
+                        block_hash=block_hash
+                    )
+                    epoch_blocks = {int(key): int(value.value) for key, value in query_result}
+                CHAIN_DECODED_ENTRIES.labels("query_map", "LastMechansimStepBlock").inc(len(epoch_blocks))
+                return block_number, epoch_blocks
+            
+            return await self._run(read_epochs)
+            
+        except Exception as e:
+            logger.error(f"Failed to get subnet epoch blocks: {e} with traceback: {traceback.format_exc()}")
+            raise
+    
+    @staticmethod
+    def _read_netuids(substrate: SubstrateInterface) -> Tuple[str, int, List[int]]:
+        """Read the chain head and the subnets registered at it, on an executor thread."""
+        block_hash = substrate.get_chain_head()
+        block_number = substrate.get_block_number(block_hash)
+        with CHAIN_QUERY_SECONDS.labels("query_map", "NetworksAdded").time():
+            networks = [(int(key), added.value) for key, added in substrate.query_map(
+                module="SubtensorModule",
+                storage_function="NetworksAdded",
+                block_hash=block_hash
+            )]
+        CHAIN_DECODED_ENTRIES.labels("query_map", "NetworksAdded").inc(len(networks))
+        return block_hash, block_number, sorted(netuid for netuid, added in networks if added)
+    
+    async def get_subnet_netuids(self) -> Tuple[int, List[int]]:
+        """
+        Get the IDs of every registered subnet at the current chain head.
+        
+        Returns:
+            Tuple of (block number, sorted netuids)
+            
+        Raises:
+            RuntimeError: If the client is not connected
+        """
+        if not self._substrate:
+            raise RuntimeError("Not connected to Bittensor network")
+        
+        try:
+            _, block_number, netuids = await self._run(self._read_netuids, self._substrate)
+            return block_number, netuids
+        except Exception as e:
+            logger.error(f"Failed to list subnets: {e} with traceback: {traceback.format_exc()}")
+            raise
+    
+    async def iter_network_dividends(
+        self,
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, int, List[Tuple[str, float]]]]:
+        """
+        Iterate the Tao dividends of every hotkey in every subnet, page by page.
+        
+        All subnets are read at the chain head found when iteration starts.
+        Each page is requested only when the caller asks for it and is not
+        kept afterwards, so memory use does not grow with the network.
+        
+        Args:
+            page_size: Entries per storage page.
+                       If not provided, uses EXPORT_PAGE_SIZE from settings.
+            
+        Yields:
+            Tuples of (block number, netuid, list of (hotkey, dividend))
+            
+        Raises:
+            RuntimeError: If the client is not connected
+        """
+        if not self._substrate:
+            raise RuntimeError("Not connected to Bittensor network")
+        
+        substrate = self._substrate
+        size = page_size or settings.EXPORT_PAGE_SIZE
+        
+        try:
+            block_hash, block_number, netuids = await self._run(self._read_netuids, substrate)
+        except Exception as e:
+            logger.error(f"Failed to list subnets: {e} with traceback: {traceback.format_exc()}")
+            raise
+        
+        for netuid in netuids:
+            start_key = None
+            while True:
+                # A QueryMapResult keeps every page it has loaded, so each page
+                # is a separate query resuming from the previous last key
+                def read_page(netuid: int = netuid, start_key: Optional[str] = start_key) -> Tuple[list, Optional[str]]:
+                    with CHAIN_QUERY_SECONDS.labels("query_map", "TaoDividendsPerSubnet").time():
+                        query_result = substrate.query_map(
+                            module="SubtensorModule",
+                            storage_function="TaoDividendsPerSubnet",
+                            params=[netuid],
+                            block_hash=block_hash,
+                            page_size=size,
+                            max_results=size,
+                            start_key=start_key
+                        )
+                        entries = [(str(key), float(value.value)) for key, value in query_result]
+                    CHAIN_DECODED_ENTRIES.labels("query_map", "TaoDividendsPerSubnet").inc(len(entries))
+                    return entries, query_result.last_key
+                
+                page, start_key = await self._run(read_page)
+                if page:
+                    yield block_number, netuid, page
+                if len(page) < size:
+                    break
+        
+        logger.info(f"Iterated dividends of {len(netuids)} subnets at block {block_number}")
+    
+    @staticmethod
+    def _load_keypair(seed: str) -> Keypair:
+        """Load the signing keypair from a mnemonic or a hex seed."""
+        if not seed:
+            raise ValueError("BITTENSOR_WALLET_SEED is not configured")
+        if " " in seed.strip():
+            return Keypair.create_from_mnemonic(seed.strip(), ss58_format=SS58_FORMAT)
+        return Keypair.create_from_seed(seed.strip(), ss58_format=SS58_FORMAT)
+    
+    async def submit_stake(
+        self,
+        netuid: int,
+        amounts: Dict[str, float],
+        wait_for_inclusion: bool = False
+    ) -> str:
+        """
+        Stake to or unstake from hotkeys of a subnet in a single extrinsic.
+        
+        Every hotkey becomes an add_stake or remove_stake call, and the calls
+        are submitted together as one Utility.batch_all extrinsic signed with
+        BITTENSOR_WALLET_SEED, so they all apply or none do.
+        
+        The account nonce is read from the chain once and then tracked by
+        the client, so later extrinsics can be pipelined behind ones that are
+        not yet included. Any failed submission drops the tracked nonce and
+        the next one reads it from the chain again. A submission that fails
+        or times out before the extrinsic is handed to the node is abandoned:
+        its thread neither submits afterwards nor updates the tracked nonce.
+        
+        Args:
+            netuid: The subnet ID
+            amounts: Dict mapping hotkey to TAO amount; positive amounts are
+                     staked and negative amounts are unstaked
+            wait_for_inclusion: Whether to wait for the extrinsic to be
+                                included in a block and check its result
+            
+        Returns:
+            The extrinsic hash
+            
+        Raises:
+            ExtrinsicNotSubmittedError: If the client is not connected or the
+                extrinsic failed before it was submitted, so it is safe to retry
+            RuntimeError: If the extrinsic failed after it was submitted
+            ValueError: If no non-zero amount is given or no wallet is configured
+        """
+        if not self._substrate:
+            raise ExtrinsicNotSubmittedError("Not connected to Bittensor network")
+        
+        amounts = {hotkey: amount for hotkey, amount in amounts.items() if round(amount * RAO_PER_TAO)}
+        if not amounts:
+            raise ValueError("No stake amounts to submit")
+        
+        substrate = self._substrate
+        keypair = self._load_keypair(settings.BITTENSOR_WALLET_SEED)
+        state = {"submitted": False, "abandoned": False}
+        
+        def submit() -> str:
+            calls = []
+            for hotkey, amount in amounts.items():
+                rao = round(abs(amount) * RAO_PER_TAO)
+                if amount > 0:
+                    calls.append(substrate.compose_call(
+                        call_module="SubtensorModule",
+                        call_function="add_stake",
+                        call_params={"hotkey": hotkey, "netuid": netuid, "amount_staked": rao}
+                    ))
+                else:
+                    calls.append(substrate.compose_call(
+                        call_module="SubtensorModule",
+                        call_function="remove_stake",
+                        call_params={"hotkey": hotkey, "netuid": netuid, "amount_unstaked": rao}
+                    ))
+            batch = substrate.compose_call(
+                call_module="Utility",
+                call_function="batch_all",
+                call_params={"calls": calls}
+            )
+            nonce = self._next_nonce
+            if nonce is None:
+                nonce = substrate.get_account_nonce(keypair.ss58_address)
+            extrinsic = substrate.create_signed_extrinsic(call=batch, keypair=keypair, nonce=nonce)
+            with self._nonce_lock:
+                if state["abandoned"]:
+                    raise ExtrinsicNotSubmittedError("Stake submission abandoned before it was submitted")
+                state["submitted"] = True
+            receipt = substrate.submit_extrinsic(extrinsic, wait_for_inclusion=wait_for_inclusion)
+            with self._nonce_lock:
+                if not state["abandoned"]:
+                    self._next_nonce = nonce + 1
+            if wait_for_inclusion and not receipt.is_success:
+                raise RuntimeError(f"Stake extrinsic {receipt.extrinsic_hash} failed: {receipt.error_message}")
+            return receipt.extrinsic_hash
+        
+        try:
+            extrinsic_hash = await self._run(submit)
+            logger.info(f"Submitted stake changes for {len(amounts)} hotkeys on netuid={netuid}: {extrinsic_hash}")
+            return extrinsic_hash
+        except Exception as e:
+            with self._nonce_lock:
+                state["abandoned"] = True
+                self._next_nonce = None
+                submitted = state["submitted"]
+            logger.error(f"Failed to submit stake: {e} with traceback: {traceback.format_exc()}")
+            if not submitted and not isinstance(e, ExtrinsicNotSubmittedError):
+                raise ExtrinsicNotSubmittedError(f"Stake extrinsic was not submitted: {e}") from e
+            raise
\ No newline at end of file
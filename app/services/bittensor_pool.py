@@ -0,0 +1,175 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from loguru import logger
+from app.services.bittensor_client import BittensorClient
+from app.services.chain_executor import ChainExecutor
+from app.core.config import settings
+
+
+class BittensorClientPool:
+    """Application-scoped pool of long-lived, connected Bittensor clients."""
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        network: Optional[str] = None,
+        acquire_timeout: Optional[float] = None,
+        health_check_interval: Optional[float] = None,
+        executor: Optional[ChainExecutor] = None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            size: Number of clients to keep connected.
+                  If not provided, uses BITTENSOR_POOL_SIZE from settings.
+            network: The network the clients connect to.
+                     If not provided, uses BITTENSOR_NETWORK from settings.
+            acquire_timeout: Seconds to wait for a free client on checkout
+            health_check_interval: Seconds a client may sit idle before it is
+                                   health checked again on checkout
+            executor: Thread pool shared by the clients for chain I/O
+        """
+        self._size = size or settings.BITTENSOR_POOL_SIZE
+        self._network = network
+        self._acquire_timeout = acquire_timeout or settings.BITTENSOR_POOL_ACQUIRE_TIMEOUT_SECONDS
+        self._health_check_interval = (
+            health_check_interval
+            if health_check_interval is not None
+            else settings.BITTENSOR_POOL_HEALTH_CHECK_INTERVAL_SECONDS
+        )
+        self._executor = executor
+        self._clients: List[BittensorClient] = []
+        self._available: asyncio.Queue = asyncio.Queue()
+        self._last_checked: Dict[int, float] = {}
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        """Number of clients owned by the pool."""
+        return len(self._clients)
+
+    @property
+    def available(self) -> int:
+        """Number of clients currently checked in."""
+        return self._available.qsize()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics for monitoring.
+
+        Returns:
+            Dict with the pool size and the number of idle and checked out clients
+        """
+        return {
+            "size": self.size,
+            "available": self.available,
+            "in_use": self.size - self.available,
+        }
+
+    async def start(self) -> None:
+        """
+        Create and connect the pooled clients.
+
+        Clients that fail to connect are still added to the pool and will be
+        reconnected on their first checkout, so a flaky node at startup does
+        not prevent the application from booting.
+        """
+        clients = [
+            BittensorClient(network=self._network, executor=self._executor)
+            for _ in range(self._size)
+        ]
+        results = await asyncio.gather(
+            *(client.connect() for client in clients),
+            return_exceptions=True
+        )
+
+        for client, result in zip(clients, results):
+            if isinstance(result, Exception):
+                logger.error(f"Pooled Bittensor client failed to connect, will retry on checkout: {result}")
+            else:
+                self._last_checked[id(client)] = time.monotonic()
+            self._clients.append(client)
+            self._available.put_nowait(client)
+
+        logger.info(f"Started Bittensor client pool with {self._size} clients")
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[BittensorClient]:
+        """
+        Check out a healthy client for the duration of the context.
+
+        Yields:
+            A connected BittensorClient
+
+        Raises:
+            RuntimeError: If the pool has been closed
+            asyncio.TimeoutError: If no client became free within the acquire timeout
+        """
+        if self._closed:
+            raise RuntimeError("Bittensor client pool is closed")
+
+        client = await asyncio.wait_for(self._available.get(), timeout=self._acquire_timeout)
+        try:
+            await self._ensure_healthy(client)
+            yield client
+        except Exception:
+            # Force a health check on the next checkout in case the socket died
+            self._last_checked.pop(id(client), None)
+            raise
+        finally:
+            self._available.put_nowait(client)
+
+    async def _ensure_healthy(self, client: BittensorClient) -> None:
+        """Health check an idle client and reconnect it if its socket is dead."""
+        last_checked = self._last_checked.get(id(client))
+        if (
+            client.is_connected
+            and last_checked is not None
+            and time.monotonic() - last_checked < self._health_check_interval
+        ):
+            return
+
+        if client.is_connected and await client.health_check():
+            self._last_checked[id(client)] = time.monotonic()
+            return
+
+        logger.warning("Reconnecting pooled Bittensor client")
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Error closing dead Bittensor connection: {e}")
+        await client.connect()
+        self._last_checked[id(client)] = time.monotonic()
+
+    async def close(self) -> None:
+        """Close every pooled client."""
+        self._closed = True
+        for client in self._clients:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.error(f"Error closing pooled Bittensor client: {e}")
+        self._clients.clear()
+        self._last_checked.clear()
+        logger.info("Closed Bittensor client pool")
+
+
+@asynccontextmanager
+async def checkout_client(
+    pool: Optional[BittensorClientPool],
+    client: Optional[BittensorClient],
+) -> AsyncIterator[BittensorClient]:
+    """
+    Check a client out of a pool for the context, or lend client when there is no pool.
+
+    Services given a pool hold a client only while they read the chain, and
+    a fetch shared by concurrent callers holds one of its own.
+    """
+    if pool is None:
+        yield client
+        return
+    async with pool.acquire() as pooled:
+        yield pooled
@@ -0,0 +1,127 @@
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncio
+from loguru import logger
+from app.services.bittensor_pool import BittensorClientPool
+from app.services.subnet_snapshot import SubnetSnapshotStore
+from app.core.config import settings
+
+# Called with the new chain head and the new epoch block of each changed subnet
+EpochListener = Callable[[int, Dict[int, int]], Awaitable[None]]
+
+
+class BlockWatcher:
+    """Follows the chain head and records when each subnet last ran its epoch."""
+
+    def __init__(
+        self,
+        pool: BittensorClientPool,
+        snapshots: Optional[SubnetSnapshotStore] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            pool: Pool the watcher checks a client out of for each poll
+            snapshots: Optional snapshot store whose subnets are dropped when
+                       their epoch runs
+            poll_interval: Seconds between chain head polls.
+                           If not provided, uses BLOCK_WATCHER_POLL_INTERVAL_SECONDS.
+        """
+        self._pool = pool
+        self._snapshots = snapshots
+        self._poll_interval = poll_interval or settings.BLOCK_WATCHER_POLL_INTERVAL_SECONDS
+        self._epoch_blocks: Dict[int, int] = {}
+        self._latest_block: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._listeners: List[EpochListener] = []
+
+    def add_listener(self, listener: EpochListener) -> None:
+        """Call a coroutine function after each poll that saw subnets run their epoch."""
+        self._listeners.append(listener)
+
+    @property
+    def latest_block(self) -> Optional[int]:
+        """Chain head block number seen by the last poll, None before the first."""
+        return self._latest_block
+
+    def epoch_block(self, netuid: int) -> Optional[int]:
+        """
+        Get the block at which a subnet last ran its epoch.
+
+        Args:
+            netuid: The subnet ID
+
+        Returns:
+            The block number, or None if the subnet has not been seen yet
+        """
+        return self._epoch_blocks.get(netuid)
+
+    def is_outdated(self, netuid: int, computed_at_block: Optional[int]) -> Optional[bool]:
+        """
+        Tell whether a value computed at a block predates the subnet's last epoch.
+
+        Args:
+            netuid: The subnet ID
+            computed_at_block: Chain head block when the value was read
+
+        Returns:
+            True or False, or None if either block is unknown and the caller
+            has to fall back to time-based expiry
+        """
+        epoch_block = self._epoch_blocks.get(netuid)
+        if epoch_block is None or computed_at_block is None:
+            return None
+        return computed_at_block < epoch_block
+
+    def start(self) -> None:
+        """Start polling in a background task."""
+        self._task = asyncio.create_task(self._watch())
+
+    async def _watch(self) -> None:
+        """Poll the chain head until stopped, logging and retrying after errors."""
+        while True:
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Block watcher poll failed: {e}")
+            await asyncio.sleep(self._poll_interval)
+
+    async def poll(self) -> None:
+        """Read the chain head and invalidate the subnets whose epoch ran since the last poll."""
+        async with self._pool.acquire() as client:
+            block, epoch_blocks = await client.get_subnet_epoch_blocks()
+
+        if block == self._latest_block:
+            return
+
+        changed = [
+            netuid for netuid, epoch_block in epoch_blocks.items()
+            if netuid in self._epoch_blocks and self._epoch_blocks[netuid] != epoch_block
+        ]
+        self._epoch_blocks = epoch_blocks
+        self._latest_block = block
+
+        if self._snapshots:
+            for netuid in changed:
+                self._snapshots.invalidate(netuid)
+        if changed:
+            logger.info(f"Block {block}: dividends changed for subnets {changed}")
+            for listener in self._listeners:
+                try:
+                    await listener(block, {netuid: epoch_blocks[netuid] for netuid in changed})
+                except Exception as e:
+                    logger.error(f"Block watcher listener failed: {e}")
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Stopped block watcher")
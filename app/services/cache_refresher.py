@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+import time
+from loguru import logger
+from app.services.bittensor_client import BittensorClient
+from app.services.bittensor_pool import BittensorClientPool
+from app.core.config import settings
+
+RefreshFn = Callable[[BittensorClient], Awaitable[object]]
+
+
+class CacheRefresher:
+    """Runs cache refreshes in the background and tracks how hot each key is."""
+
+    def __init__(
+        self,
+        pool: BittensorClientPool,
+        hot_key_window: Optional[float] = None,
+        max_tracked_keys: Optional[int] = None,
+    ):
+        """
+        Initialize the refresher.
+
+        Args:
+            pool: Pool the background refreshes check clients out of, since
+                  the request that scheduled them releases its own client
+            hot_key_window: Seconds over which accesses to a key are counted.
+                            If not provided, uses CACHE_HOT_KEY_WINDOW_SECONDS.
+            max_tracked_keys: Keys whose access counts are kept in memory.
+                              If not provided, uses CACHE_HOT_KEY_MAX_TRACKED.
+        """
+        self._pool = pool
+        self._window = hot_key_window or settings.CACHE_HOT_KEY_WINDOW_SECONDS
+        self._max_tracked_keys = max_tracked_keys or settings.CACHE_HOT_KEY_MAX_TRACKED
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        # Window start and count per key, ordered by window start so the
+        # oldest window is evicted first
+        self._accesses: OrderedDict[Hashable, Tuple[float, int]] = OrderedDict()
+
+    @property
+    def pending(self) -> int:
+        """Number of refreshes currently running."""
+        return len(self._tasks)
+
+    def record_access(self, key: Hashable) -> int:
+        """
+        Count an access to a key.
+
+        Args:
+            key: The cache key that was read
+
+        Returns:
+            Accesses to the key within the current window, including this one
+        """
+        now = time.monotonic()
+        window_start, count = self._accesses.get(key, (now, 0))
+        if count and now - window_start < self._window:
+            self._accesses[key] = (window_start, count + 1)
+            return count + 1
+
+        # A new window starts now, later than every tracked one
+        self._accesses[key] = (now, 1)
+        self._accesses.move_to_end(key)
+        if len(self._accesses) > self._max_tracked_keys:
+            self._accesses.popitem(last=False)
+        return 1
+
+    def schedule(self, key: Hashable, fn: RefreshFn) -> bool:
+        """
+        Refresh a key in the background unless a refresh is already running.
+
+        Args:
+            key: The cache key being refreshed
+            fn: Coroutine function performing the refresh with a pooled client
+
+        Returns:
+            True if a refresh was started, False if one was already running
+        """
+        if key in self._tasks:
+            return False
+
+        task = asyncio.create_task(self._run(key, fn))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return True
+
+    async def _run(self, key: Hashable, fn: RefreshFn) -> None:
+        """Check out a client and run one refresh, logging any failure."""
+        try:
+            async with self._pool.acquire() as client:
+                await fn(client)
+            logger.debug(f"Background refresh completed for key: {key}")
+        except Exception as e:
+            logger.error(f"Background refresh failed for key {key}: {e}")
+
+    async def close(self) -> None:
+        """Cancel running refreshes and wait for them to finish."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        logger.info("Stopped cache refresher")
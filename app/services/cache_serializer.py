@@ -0,0 +1,171 @@
+from typing import Any, Callable, Dict, Optional, Protocol, Tuple
+import json
+import math
+import struct
+import msgpack
+from app.core.config import settings
+
+# Encoded values start with a zero byte, which JSON text never does, followed
+# by the format id and its version. Headerless values are legacy JSON.
+MAGIC = 0
+HEADER = struct.Struct("!BBB")
+
+MSGPACK_FORMAT = 1
+DIVIDEND_STRUCT_FORMAT = 2
+
+# Fields of a cached dividend entry; netuid and hotkey are already in the key
+DIVIDEND_FIELDS = frozenset(
+    {"dividend", "stake_tx_triggered", "block", "snapshot_age_seconds", "cached_at", "computed_at_block"}
+)
+# Pre-encoded response body that version 2 dividend entries, written by
+# earlier releases, stored after the layout
+DIVIDEND_BODY_FIELD = "body"
+# dividend, flags, block, computed_at_block, cached_at, snapshot_age_seconds
+DIVIDEND_LAYOUT = struct.Struct("!dBQQdd")
+FLAG_STAKE_TX_TRIGGERED = 1
+FLAG_HAS_BLOCK = 2
+FLAG_HAS_COMPUTED_AT_BLOCK = 4
+FLAG_HAS_SNAPSHOT_AGE = 8
+
+
+class CacheSerializer(Protocol):
+    """Encodes values written to the cache."""
+
+    name: str
+
+    def dumps(self, value: Any) -> bytes:
+        """Encode a value, prefixed with its format header unless it is legacy JSON."""
+        ...
+
+
+def _header(format_id: int, version: int) -> bytes:
+    return HEADER.pack(MAGIC, format_id, version)
+
+
+class JsonSerializer:
+    """Headerless JSON, readable by workers that predate format headers."""
+
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value).encode("utf-8")
+
+
+class MsgpackSerializer:
+    """MessagePack behind a format header."""
+
+    name = "msgpack"
+    VERSION = 1
+
+    def dumps(self, value: Any) -> bytes:
+        return _header(MSGPACK_FORMAT, self.VERSION) + msgpack.packb(value, use_bin_type=True)
+
+
+class DividendStructSerializer:
+    """
+    Fixed binary layout for cached dividend entries.
+
+    A dividend entry takes 44 bytes against about 160 as JSON. Values of
+    any other shape, like whole-subnet blobs, are written as MessagePack.
+    """
+
+    name = "struct"
+    VERSION = 1
+
+    def __init__(self):
+        self._fallback = MsgpackSerializer()
+
+    def dumps(self, value: Any) -> bytes:
+        encoded = self._pack_dividend(value)
+        if encoded is None:
+            return self._fallback.dumps(value)
+        return _header(DIVIDEND_STRUCT_FORMAT, self.VERSION) + encoded
+
+    @staticmethod
+    def _pack_dividend(value: Any) -> Optional[bytes]:
+        """Pack the fixed fields of a dividend entry, None if the value does not fit the layout."""
+        if not isinstance(value, dict) or value.keys() != DIVIDEND_FIELDS:
+            return None
+        block = value["block"]
+        computed_at_block = value["computed_at_block"]
+        snapshot_age = value["snapshot_age_seconds"]
+        flags = (
+            (FLAG_STAKE_TX_TRIGGERED if value["stake_tx_triggered"] else 0)
+            | (FLAG_HAS_BLOCK if block is not None else 0)
+            | (FLAG_HAS_COMPUTED_AT_BLOCK if computed_at_block is not None else 0)
+            | (FLAG_HAS_SNAPSHOT_AGE if snapshot_age is not None else 0)
+        )
+        try:
+            return DIVIDEND_LAYOUT.pack(
+                value["dividend"],
+                flags,
+                block or 0,
+                computed_at_block or 0,
+                value["cached_at"],
+                snapshot_age if snapshot_age is not None else math.nan,
+            )
+        except (struct.error, TypeError):
+            return None
+
+
+def _unpack_dividend(data: bytes) -> Dict[str, Any]:
+    dividend, flags, block, computed_at_block, cached_at, snapshot_age = DIVIDEND_LAYOUT.unpack(data)
+    return {
+        "dividend": dividend,
+        "stake_tx_triggered": bool(flags & FLAG_STAKE_TX_TRIGGERED),
+        "block": block if flags & FLAG_HAS_BLOCK else None,
+        "snapshot_age_seconds": snapshot_age if flags & FLAG_HAS_SNAPSHOT_AGE else None,
+        "cached_at": cached_at,
+        "computed_at_block": computed_at_block if flags & FLAG_HAS_COMPUTED_AT_BLOCK else None,
+    }
+
+
+# Decoder of each (format id, version); readers keep decoding every version
+# that may still be cached while writers move to a new one
+DECODERS: Dict[Tuple[int, int], Callable[[bytes], Any]] = {
+    (MSGPACK_FORMAT, 1): lambda data: msgpack.unpackb(data, raw=False),
+    (DIVIDEND_STRUCT_FORMAT, 1): _unpack_dividend,
+    (DIVIDEND_STRUCT_FORMAT, 2): lambda data: {
+        **_unpack_dividend(data[:DIVIDEND_LAYOUT.size]),
+        DIVIDEND_BODY_FIELD: data[DIVIDEND_LAYOUT.size:].decode("utf-8"),
+    },
+}
+
+SERIALIZERS: Dict[str, CacheSerializer] = {
+    serializer.name: serializer
+    for serializer in (JsonSerializer(), MsgpackSerializer(), DividendStructSerializer())
+}
+
+
+def loads(data: bytes) -> Any:
+    """
+    Decode a cached value written by any serializer.
+
+    Raises:
+        ValueError: If the value has a format or version this worker cannot read
+    """
+    if not data or data[0] != MAGIC:
+        return json.loads(data)
+    _, format_id, version = HEADER.unpack_from(data)
+    decoder = DECODERS.get((format_id, version))
+    if decoder is None:
+        raise ValueError(f"Unsupported cache format {format_id} version {version}")
+    return decoder(data[HEADER.size:])
+
+
+def get_serializer(name: Optional[str] = None) -> CacheSerializer:
+    """
+    Get a serializer by name.
+
+    Args:
+        name: One of 'json', 'msgpack' or 'struct'.
+              If not provided, uses CACHE_SERIALIZER from settings.
+
+    Raises:
+        ValueError: If no serializer has that name
+    """
+    name = name or settings.CACHE_SERIALIZER
+    try:
+        return SERIALIZERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown cache serializer: {name}") from None
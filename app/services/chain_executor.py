@@ -0,0 +1,140 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+import asyncio
+import threading
+import time
+from loguru import logger
+from app.core.config import settings
+from app.core.metrics import CHAIN_EXECUTOR_QUEUED, CHAIN_EXECUTOR_QUEUE_WAIT_SECONDS, CHAIN_EXECUTOR_RUNNING
+
+T = TypeVar("T")
+
+
+class ChainExecutor:
+    """Bounded thread pool that runs blocking substrate calls off the event loop."""
+
+    def __init__(self, max_workers: Optional[int] = None, timeout: Optional[float] = None):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Number of threads available for chain I/O.
+                         If not provided, uses BITTENSOR_EXECUTOR_WORKERS from settings.
+            timeout: Default per-call timeout in seconds.
+                     If not provided, uses BITTENSOR_CALL_TIMEOUT_SECONDS from settings.
+        """
+        self._max_workers = max_workers or settings.BITTENSOR_EXECUTOR_WORKERS
+        self._timeout = timeout or settings.BITTENSOR_CALL_TIMEOUT_SECONDS
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix="substrate"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._calls = 0
+        self._timeouts = 0
+        self._total_queue_wait = 0.0
+        self._max_queue_wait = 0.0
+
+    async def run(self, fn: Callable[..., T], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> T:
+        """
+        Run a blocking callable in the executor and await its result.
+
+        Args:
+            fn: The blocking callable
+            *args: Positional arguments for fn
+            timeout: Per-call timeout in seconds, defaults to the executor timeout
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            The return value of fn
+
+        Raises:
+            TimeoutError: If the call did not complete within the timeout
+        """
+        loop = asyncio.get_running_loop()
+        submitted_at = time.monotonic()
+        state = {"started": False, "abandoned": False}
+        with self._lock:
+            self._queued += 1
+        CHAIN_EXECUTOR_QUEUED.inc()
+
+        def call() -> T:
+            queue_wait = time.monotonic() - submitted_at
+            with self._lock:
+                if state["abandoned"]:
+                    raise asyncio.CancelledError()
+                state["started"] = True
+                self._queued -= 1
+                self._running += 1
+                self._calls += 1
+                self._total_queue_wait += queue_wait
+                self._max_queue_wait = max(self._max_queue_wait, queue_wait)
+            CHAIN_EXECUTOR_QUEUED.dec()
+            CHAIN_EXECUTOR_RUNNING.inc()
+            CHAIN_EXECUTOR_QUEUE_WAIT_SECONDS.observe(queue_wait)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                CHAIN_EXECUTOR_RUNNING.dec()
+
+        future = loop.run_in_executor(self._executor, call)
+        call_timeout = timeout or self._timeout
+        try:
+            return await asyncio.wait_for(future, timeout=call_timeout)
+        except asyncio.TimeoutError as e:
+            self._abandon(state)
+            with self._lock:
+                self._timeouts += 1
+            name = getattr(fn, "__name__", repr(fn))
+            logger.error(f"Chain call {name} timed out after {call_timeout}s")
+            raise TimeoutError(f"Chain call {name} timed out after {call_timeout}s") from e
+        except asyncio.CancelledError:
+            self._abandon(state)
+            raise
+
+    def _abandon(self, state: Dict[str, bool]) -> None:
+        """Make sure a call given up on while still queued never runs."""
+        with self._lock:
+            if not state["started"] and not state["abandoned"]:
+                state["abandoned"] = True
+                self._queued -= 1
+                CHAIN_EXECUTOR_QUEUED.dec()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get executor statistics for monitoring.
+
+        Returns:
+            Dict with worker count, queued and running calls, completed call
+            count, timeouts and average/max queue wait in seconds
+        """
+        with self._lock:
+            return {
+                "max_workers": self._max_workers,
+                "queued": self._queued,
+                "running": self._running,
+                "calls": self._calls,
+                "timeouts": self._timeouts,
+                "avg_queue_wait_seconds": self._total_queue_wait / self._calls if self._calls else 0.0,
+                "max_queue_wait_seconds": self._max_queue_wait,
+            }
+
+    def shutdown(self) -> None:
+        """Stop accepting calls and release the worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("Shut down chain executor")
+
+
+_default_executor: Optional[ChainExecutor] = None
+
+
+def get_default_chain_executor() -> ChainExecutor:
+    """Get the process-wide chain executor, creating it on first use."""
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = ChainExecutor()
+    return _default_executor
@@ -0,0 +1,292 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
+import json
+from redis.asyncio import Redis
+from loguru import logger
+from app.services.bittensor_pool import BittensorClientPool
+from app.services.block_watcher import BlockWatcher
+from app.services.subnet_snapshot import SubnetSnapshotStore
+from app.core.config import settings
+
+Pair = Tuple[int, str]
+
+
+class FeedSubscription:
+    """The (netuid, hotkey) pairs one client watches and the queue its messages land in."""
+
+    def __init__(self, max_queued: int):
+        """
+        Initialize an empty subscription.
+
+        Args:
+            max_queued: Messages held for a slow client before the oldest are dropped
+        """
+        self.pairs: Set[Pair] = set()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+
+    def push(self, message: Dict[str, Any]) -> None:
+        """Queue a message, dropping the oldest one if the client is not keeping up."""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+
+class DividendFeed:
+    """
+    Pushes dividend changes to subscribed clients across all API workers.
+
+    When a watched subnet runs its epoch, the first worker to claim it in
+    Redis reads the subnet once, diffs it against the last published values
+    and publishes only the changed hotkeys. Every worker receives the change
+    over pub/sub and forwards it to its own clients watching those hotkeys.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        pool: BittensorClientPool,
+        snapshots: SubnetSnapshotStore,
+        block_watcher: Optional[BlockWatcher] = None,
+        channel_prefix: Optional[str] = None,
+        max_queued: Optional[int] = None,
+    ):
+        """
+        Initialize the feed.
+
+        Args:
+            redis: Redis client used for claims, published state and pub/sub
+            pool: Pool a client is checked out of to read a subnet
+            snapshots: Snapshot store the subnet reads go through
+            block_watcher: Optional watcher used to tell whether published
+                           values predate a subnet's last epoch
+            channel_prefix: Prefix of the feed's Redis keys and channels.
+                            If not provided, uses DIVIDEND_FEED_PREFIX.
+            max_queued: Messages buffered per client.
+                        If not provided, uses DIVIDEND_FEED_QUEUE_SIZE.
+        """
+        self._redis = redis
+        self._pool = pool
+        self._snapshots = snapshots
+        self._block_watcher = block_watcher
+        self._prefix = channel_prefix or settings.DIVIDEND_FEED_PREFIX
+        self._max_queued = max_queued or settings.DIVIDEND_FEED_QUEUE_SIZE
+        self._watchers: Dict[Pair, Set[FeedSubscription]] = {}
+        self._netuid_watchers: Dict[int, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _key(self, *parts: Any) -> str:
+        """Build a Redis key or channel name under the feed prefix."""
+        return ":".join(str(part) for part in (self._prefix, *parts))
+
+    @property
+    def watched_netuids(self) -> Set[int]:
+        """Subnets with at least one local subscriber."""
+        return set(self._netuid_watchers)
+
+    def open(self) -> FeedSubscription:
+        """Create a subscription for a newly connected client."""
+        return FeedSubscription(self._max_queued)
+
+    def close(self, subscription: FeedSubscription) -> None:
+        """Drop every pair a disconnected client was watching."""
+        self.unwatch(subscription, list(subscription.pairs))
+
+    async def watch(self, subscription: FeedSubscription, pairs: Iterable[Pair]) -> None:
+        """
+        Start pushing changes of pairs to a subscription.
+
+        The last published value of each pair is pushed right away. Subnets
+        without published values, or whose values predate their last epoch,
+        are read and published first. A subnet that cannot be read is
+        reported to the subscription as an error message.
+
+        Args:
+            subscription: The client's subscription
+            pairs: The (netuid, hotkey) pairs to watch
+        """
+        new_pairs = set(pairs) - subscription.pairs
+        for pair in new_pairs:
+            subscription.pairs.add(pair)
+            self._watchers.setdefault(pair, set()).add(subscription)
+            self._netuid_watchers[pair[0]] = self._netuid_watchers.get(pair[0], 0) + 1
+
+        by_netuid: Dict[int, List[str]] = {}
+        for netuid, hotkey in new_pairs:
+            by_netuid.setdefault(netuid, []).append(hotkey)
+
+        for netuid, hotkeys in by_netuid.items():
+            try:
+                await self._push_current(subscription, netuid, hotkeys)
+            except Exception as e:
+                # The pairs stay watched, so later changes still reach the client
+                logger.error(f"Failed to load current dividends of netuid={netuid} for a subscriber: {e}")
+                subscription.push({
+                    "type": "error",
+                    "netuid": netuid,
+                    "detail": f"Could not load the current dividends of netuid {netuid}"
+                })
+
+    async def _push_current(self, subscription: FeedSubscription, netuid: int, hotkeys: List[str]) -> None:
+        """Push the last published values of a subnet's hotkeys, reading the subnet first if needed."""
+        block = await self._redis.get(self._key("block", netuid))
+        published: Dict[str, float] = {}
+        if self._needs_seed(netuid, block):
+            # Changed values reach this subscription through pub/sub
+            published = await self.publish_changes(netuid, self._seed_claim(netuid)) or {}
+            block = await self._redis.get(self._key("block", netuid))
+        values = await self._redis.hmget(self._key("last", netuid), hotkeys)
+        for hotkey, value in zip(hotkeys, values):
+            if value is not None and hotkey not in published:
+                subscription.push(self._update(netuid, hotkey, float(value), int(block) if block else None))
+
+    def unwatch(self, subscription: FeedSubscription, pairs: Iterable[Pair]) -> None:
+        """Stop pushing changes of pairs to a subscription."""
+        for pair in set(pairs) & subscription.pairs:
+            subscription.pairs.discard(pair)
+            watchers = self._watchers.get(pair)
+            if watchers is not None:
+                watchers.discard(subscription)
+                if not watchers:
+                    del self._watchers[pair]
+            self._netuid_watchers[pair[0]] -= 1
+            if not self._netuid_watchers[pair[0]]:
+                del self._netuid_watchers[pair[0]]
+
+    def _needs_seed(self, netuid: int, block: Optional[bytes]) -> bool:
+        """Whether a subnet has no published values or they predate its last epoch."""
+        if block is None:
+            return True
+        if self._block_watcher:
+            return bool(self._block_watcher.is_outdated(netuid, int(block)))
+        return False
+
+    def _seed_claim(self, netuid: int) -> str:
+        """Claim for reading a subnet on subscribe, shared with the epoch claim when the epoch is known."""
+        epoch_block = self._block_watcher.epoch_block(netuid) if self._block_watcher else None
+        return f"epoch:{netuid}:{epoch_block}" if epoch_block is not None else f"seed:{netuid}"
+
+    async def on_epochs(self, block: int, epoch_blocks: Dict[int, int]) -> None:
+        """
+        Publish changes of watched subnets that just ran their epoch.
+
+        Registered as a BlockWatcher listener in every worker; the claim key
+        includes the epoch block so exactly one worker reads each subnet.
+        """
+        for netuid, epoch_block in epoch_blocks.items():
+            if netuid in self._netuid_watchers:
+                try:
+                    await self.publish_changes(netuid, f"epoch:{netuid}:{epoch_block}")
+                except Exception as e:
+                    logger.error(f"Failed to publish dividend changes for netuid={netuid}: {e}")
+
+    async def publish_changes(self, netuid: int, claim: str) -> Optional[Dict[str, float]]:
+        """
+        Read a subnet and publish the hotkeys whose dividend changed.
+
+        Args:
+            netuid: The subnet ID
+            claim: Identifies this read; workers that lose the claim skip it
+
+        Returns:
+            The published changes, or None if another worker holds the claim
+
+        Raises:
+            Exception: If the subnet cannot be read or published; the claim
+                       is released so the read can be retried
+        """
+        claim_key = self._key("claim", claim)
+        claimed = await self._redis.set(claim_key, 1, nx=True, ex=settings.DIVIDEND_FEED_CLAIM_TTL_SECONDS)
+        if not claimed:
+            return None
+
+        try:
+            async with self._pool.acquire() as client:
+                snapshot = await self._snapshots.get(netuid, client)
+
+            last_key = self._key("last", netuid)
+            previous = {
+                hotkey.decode("utf-8"): float(value)
+                for hotkey, value in (await self._redis.hgetall(last_key)).items()
+            }
+            changes = {
+                hotkey: dividend for hotkey, dividend in snapshot.dividends.items()
+                if previous.get(hotkey) != dividend
+            }
+            # Hotkeys that left the subnet map no longer earn dividends
+            changes.update({
+                hotkey: 0.0 for hotkey in previous.keys() - snapshot.dividends.keys()
+                if previous[hotkey] != 0.0
+            })
+
+            async with self._redis.pipeline(transaction=False) as pipe:
+                if changes:
+                    pipe.hset(last_key, mapping=changes)
+                pipe.set(self._key("block", netuid), snapshot.block)
+                if changes:
+                    pipe.publish(
+                        self._key("updates", netuid),
+                        json.dumps({"netuid": netuid, "block": snapshot.block, "changes": changes})
+                    )
+                await pipe.execute()
+        except Exception:
+            # Release the claim, otherwise no worker reads this epoch until the next one
+            await self._redis.delete(claim_key)
+            raise
+
+        logger.info(f"Published {len(changes)} dividend changes for netuid={netuid} at block {snapshot.block}")
+        return changes
+
+    @staticmethod
+    def _update(netuid: int, hotkey: str, dividend: float, block: Optional[int]) -> Dict[str, Any]:
+        return {"type": "update", "netuid": netuid, "hotkey": hotkey, "dividend": dividend, "block": block}
+
+    def handle(self, data: Any) -> int:
+        """
+        Forward one published change set to the local subscribers watching it.
+
+        Returns:
+            Number of messages queued
+        """
+        try:
+            payload = json.loads(data)
+            netuid, block, changes = payload["netuid"], payload["block"], payload["changes"]
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"Ignoring malformed dividend feed message: {data!r}")
+            return 0
+
+        queued = 0
+        for hotkey, dividend in changes.items():
+            for subscription in self._watchers.get((netuid, hotkey), ()):
+                subscription.push(self._update(netuid, hotkey, dividend, block))
+                queued += 1
+        return queued
+
+    def start(self) -> None:
+        """Start receiving published changes in a background task."""
+        self._task = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        """Receive published changes, resubscribing after errors."""
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.psubscribe(self._key("updates", "*"))
+                    logger.info(f"Listening for dividend changes on {self._key('updates', '*')}")
+                    async for message in pubsub.listen():
+                        if message.get("type") == "pmessage":
+                            self.handle(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Dividend feed listener error: {e}")
+                await asyncio.sleep(1)
+
+    async def stop(self) -> None:
+        """Stop receiving published changes."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
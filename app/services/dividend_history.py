@@ -0,0 +1,102 @@
+from typing import List, Optional, Set, Tuple
+import asyncpg
+from loguru import logger
+from app.db.models import DividendHistory
+from app.core.config import settings
+
+
+def asyncpg_dsn() -> str:
+    """The configured database URI without the SQLAlchemy driver suffix, as asyncpg expects."""
+    return str(settings.SQLALCHEMY_DATABASE_URI).replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+class DividendHistoryWriter:
+    """
+    Bulk-writes subnet dividend snapshots into the partitioned history table.
+    
+    The table itself is created by the alembic migrations; only the
+    partition of each block range is created here, as blocks arrive.
+    """
+    
+    TABLE = DividendHistory.__tablename__
+    STAGING_TABLE = f"{DividendHistory.__tablename__}_staging"
+    COLUMNS = ("netuid", "hotkey", "block", "value")
+    
+    def __init__(self, connection: asyncpg.Connection, partition_blocks: Optional[int] = None):
+        """
+        Initialize the writer.
+        
+        Args:
+            connection: The asyncpg connection to write with
+            partition_blocks: Blocks covered by each partition.
+                              If not provided, uses DIVIDEND_HISTORY_PARTITION_BLOCKS.
+        """
+        self._connection = connection
+        self._partition_blocks = partition_blocks or settings.DIVIDEND_HISTORY_PARTITION_BLOCKS
+        self._partitions: Set[int] = set()
+    
+    def partition_range(self, block: int) -> Tuple[int, int]:
+        """Get the [start, end) block range of the partition holding a block."""
+        start = block - block % self._partition_blocks
+        return start, start + self._partition_blocks
+    
+    async def ensure_partition(self, block: int) -> str:
+        """
+        Create the partition holding a block if it does not exist.
+        
+        Args:
+            block: The block about to be written
+            
+        Returns:
+            The partition table name
+        """
+        start, end = self.partition_range(block)
+        name = f"{self.TABLE}_{start}"
+        if start not in self._partitions:
+            await self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {self.TABLE} "
+                f"FOR VALUES FROM ({start}) TO ({end})"
+            )
+            self._partitions.add(start)
+        return name
+    
+    async def write(self, block: int, netuid: int, dividends: List[Tuple[str, float]]) -> int:
+        """
+        Write the dividends of a subnet at a block.
+        
+        Rows are streamed with COPY into a session-local staging table, then
+        moved into the history table in one statement that skips rows already
+        recorded, so re-ingesting a block is harmless.
+        
+        Args:
+            block: The block the dividends were read at
+            netuid: The subnet ID
+            dividends: (hotkey, dividend) pairs
+            
+        Returns:
+            Number of new rows written
+        """
+        if not dividends:
+            return 0
+        
+        await self.ensure_partition(block)
+        columns = ", ".join(self.COLUMNS)
+        async with self._connection.transaction():
+            await self._connection.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {self.STAGING_TABLE} "
+                f"(LIKE {self.TABLE}) ON COMMIT DELETE ROWS"
+            )
+            await self._connection.copy_records_to_table(
+                self.STAGING_TABLE,
+                records=[(netuid, hotkey, block, value) for hotkey, value in dividends],
+                columns=list(self.COLUMNS)
+            )
+            status = await self._connection.execute(
+                f"INSERT INTO {self.TABLE} ({columns}) SELECT {columns} FROM {self.STAGING_TABLE} "
+                f"ON CONFLICT DO NOTHING"
+            )
+        
+        # The status tag reads 'INSERT 0 <rows>'
+        written = int(status.split()[-1])
+        logger.debug(f"Wrote {written} dividends for netuid={netuid} at block {block}")
+        return written
@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, List, Literal, Tuple
+from loguru import logger
+from app.services.bittensor_pool import BittensorClientPool
+
+ExportFormat = Literal["ndjson", "csv"]
+
+
+class DividendsExportService:
+    """Streams the dividends of every hotkey in every subnet."""
+    
+    CSV_COLUMNS = ["block", "netuid", "hotkey", "dividend"]
+    MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+    
+    def __init__(self, pool: BittensorClientPool):
+        """
+        Initialize the export service.
+        
+        Args:
+            pool: Pool a client is checked out of for the whole export. The
+                  export checks out its own client rather than using the
+                  request's, since the response outlives the request
+                  dependencies. It should not be the pool serving
+                  requests, which a long export would starve.
+        """
+        self._pool = pool
+    
+    @staticmethod
+    def _format_ndjson(block: int, netuid: int, page: List[Tuple[str, float]]) -> str:
+        """Encode a page as one JSON object per line."""
+        return "".join(
+            json.dumps({"block": block, "netuid": netuid, "hotkey": hotkey, "dividend": dividend}) + "\n"
+            for hotkey, dividend in page
+        )
+    
+    @staticmethod
+    def _format_csv(block: int, netuid: int, page: List[Tuple[str, float]]) -> str:
+        """Encode a page as CSV rows."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerows((block, netuid, hotkey, dividend) for hotkey, dividend in page)
+        return buffer.getvalue()
+    
+    async def stream(self, export_format: ExportFormat = "ndjson") -> AsyncIterator[str]:
+        """
+        Stream every subnet's dividends, one chunk per storage page.
+        
+        Args:
+            export_format: 'ndjson' or 'csv'
+            
+        Yields:
+            Encoded chunks, starting with the header row for CSV
+        """
+        format_page = self._format_csv if export_format == "csv" else self._format_ndjson
+        if export_format == "csv":
+            yield ",".join(self.CSV_COLUMNS) + "\n"
+        
+        rows = 0
+        try:
+            async with self._pool.acquire() as client:
+                async for block, netuid, page in client.iter_network_dividends():
+                    rows += len(page)
+                    yield format_page(block, netuid, page)
+        except Exception as e:
+            # Headers are already sent, so the only signal left is a truncated body
+            logger.error(f"Dividends export aborted after {rows} rows: {e}")
+            raise
+        logger.info(f"Exported {rows} dividends as {export_format}")
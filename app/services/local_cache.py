@@ -0,0 +1,172 @@
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+import asyncio
+import json
+import time
+import uuid
+from redis.asyncio import Redis
+from loguru import logger
+from app.core.config import settings
+from app.core.metrics import CACHE_LOOKUPS
+
+
+class CacheStats:
+    """Hit and miss counters per cache tier, shared by every RedisCache."""
+
+    TIERS = ("l1", "redis")
+
+    def __init__(self):
+        """Initialize all counters to zero."""
+        self._counters: Dict[str, Dict[str, int]] = {
+            tier: {"hits": 0, "misses": 0} for tier in self.TIERS
+        }
+
+    def record(self, tier: str, hit: bool, count: int = 1) -> None:
+        """
+        Record lookups against a tier.
+
+        Args:
+            tier: 'l1' or 'redis'
+            hit: Whether the lookups were hits
+            count: Number of lookups to record
+        """
+        if not count:
+            return
+        self._counters[tier]["hits" if hit else "misses"] += count
+        CACHE_LOOKUPS.labels(tier, "hit" if hit else "miss").inc(count)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the counters of every tier.
+
+        Returns:
+            Dict mapping tier to its hits, misses and hit ratio
+        """
+        result = {}
+        for tier, counters in self._counters.items():
+            total = counters["hits"] + counters["misses"]
+            result[tier] = {
+                **counters,
+                "hit_ratio": counters["hits"] / total if total else 0.0,
+            }
+        return result
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache whose entries expire after a TTL.
+
+    Values are kept decoded and handed out as is, so callers must not mutate them.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Initialize the local cache.
+
+        Args:
+            max_size: Maximum entries held before the least recently used is evicted.
+                      If not provided, uses CACHE_L1_MAX_SIZE from settings.
+            ttl: Seconds an entry is served before it expires.
+                 If not provided, uses CACHE_L1_TTL_SECONDS from settings.
+        """
+        self._max_size = max_size or settings.CACHE_L1_MAX_SIZE
+        self._ttl = ttl if ttl is not None else settings.CACHE_L1_TTL_SECONDS
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # Identifies this process in invalidation messages so it skips its own
+        self.instance_id = uuid.uuid4().hex
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get an unexpired value, marking it most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        """Drop entries if present."""
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+
+class CacheInvalidationListener:
+    """Evicts local cache entries written or deleted by other API workers."""
+
+    def __init__(self, redis: Redis, local_cache: LocalCache, channel: Optional[str] = None):
+        """
+        Initialize the listener.
+
+        Args:
+            redis: Redis client used for the pub/sub subscription
+            local_cache: The local cache to evict from
+            channel: Pub/sub channel carrying invalidations.
+                     If not provided, uses CACHE_INVALIDATION_CHANNEL from settings.
+        """
+        self._redis = redis
+        self._local_cache = local_cache
+        self._channel = channel or settings.CACHE_INVALIDATION_CHANNEL
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start listening in a background task."""
+        self._task = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        """Subscribe and apply invalidations, resubscribing after errors."""
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self._channel)
+                    logger.info(f"Listening for cache invalidations on {self._channel}")
+                    async for message in pubsub.listen():
+                        if message.get("type") == "message":
+                            self.handle(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache invalidation listener error: {e}")
+                # Entries written while disconnected may be missed
+                self._local_cache.clear()
+                await asyncio.sleep(1)
+
+    def handle(self, data: Any) -> None:
+        """Apply one invalidation message unless this process sent it."""
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring malformed cache invalidation: {data!r}")
+            return
+
+        if payload.get("origin") == self._local_cache.instance_id:
+            return
+        self._local_cache.delete(payload.get("keys", []))
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
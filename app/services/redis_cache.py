@@ -1,23 +1,69 @@
-from typing import Optional, Any
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import json
+import uuid
 from redis.asyncio import Redis
+from redis.asyncio.lock import Lock
 from loguru import logger
+from app.services.cache_serializer import CacheSerializer, get_serializer, loads
+from app.services.local_cache import CacheStats, LocalCache
 from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import CACHE_OPERATION_SECONDS, observe_async
+
+# Per-request reads and writes, sampled by LOG_SAMPLE_RATES
+hot_path_logger = get_logger("redis_cache.hot_path")
 
 class RedisCache:
     """Service for handling Redis caching operations."""
     
-    def __init__(self, redis_client: Redis):
-        """Initialize the Redis cache service."""
+    def __init__(
+        self,
+        redis_client: Redis,
+        local_cache: Optional[LocalCache] = None,
+        stats: Optional[CacheStats] = None,
+        serializer: Optional[CacheSerializer] = None
+    ):
+        """
+        Initialize the Redis cache service.
+        
+        Args:
+            redis_client: The Redis client
+            local_cache: Optional in-process L1 tier checked before Redis.
+                         Writes and deletes are published on
+                         CACHE_INVALIDATION_CHANNEL so other workers evict
+                         their copies.
+            stats: Optional shared hit/miss counters per tier
+            serializer: Encoding of written values. Values in any format
+                        are read back.
+                        If not provided, uses CACHE_SERIALIZER from settings.
+        """
         self._redis = redis_client
         self._expiration_seconds = settings.CACHE_EXPIRATION_SECONDS
+        self._local = local_cache
+        self._stats = stats or CacheStats()
+        self._serializer = serializer or get_serializer()
     
     @staticmethod
     def _build_key(prefix: str, *args: Any) -> str:
         """Build a cache key from prefix and arguments."""
         return f"{prefix}:{':'.join(str(arg) for arg in args)}"
     
-    async def get(self, prefix: str, *args: Any) -> Optional[str]:
+    def lock(self, prefix: str, *args: Any, timeout: float) -> Lock:
+        """
+        Create a distributed lock shared by every process using this Redis.
+        
+        Args:
+            prefix: The key prefix (e.g., 'tao_dividends_lock')
+            *args: Key components to build the full key
+            timeout: Seconds after which the lock expires if never released
+            
+        Returns:
+            An unacquired redis lock
+        """
+        return self._redis.lock(self._build_key(prefix, *args), timeout=timeout)
+    
+    @observe_async(CACHE_OPERATION_SECONDS, "get")
+    async def get(self, prefix: str, *args: Any) -> Optional[Any]:
         """
         Get a value from cache.
         
@@ -26,20 +72,75 @@ class RedisCache:
             *args: Key components to build the full key
             
         Returns:
-            The cached value or None if not found
+            The decoded cached value or None if not found or unreadable
         """
         key = self._build_key(prefix, *args)
+        if self._local is not None:
+            local_value = self._local.get(key)
+            self._stats.record("l1", local_value is not None)
+            if local_value is not None:
+                return local_value
+        
         try:
             value = await self._redis.get(key)
+            self._stats.record("redis", bool(value))
             if value:
-                logger.debug(f"Cache hit for key: {key}")
-                return value.decode('utf-8')
-            logger.debug(f"Cache miss for key: {key}")
+                hot_path_logger.debug("Cache hit for key: {}", key)
+                decoded = loads(value)
+                if self._local is not None:
+                    self._local.set(key, decoded)
+                return decoded
+            hot_path_logger.debug("Cache miss for key: {}", key)
             return None
         except Exception as e:
             logger.error(f"Error getting from cache: {e}")
             return None
     
+    @observe_async(CACHE_OPERATION_SECONDS, "get_many")
+    async def get_many(self, prefix: str, keys: Sequence[Sequence[Any]]) -> List[Optional[Any]]:
+        """
+        Get several values from cache in a single MGET.
+        
+        Args:
+            prefix: The key prefix (e.g., 'tao_dividends')
+            keys: Key components of each entry, as passed to get()
+            
+        Returns:
+            The decoded cached values in request order, None for each miss
+        """
+        if not keys:
+            return []
+        
+        full_keys = [self._build_key(prefix, *args) for args in keys]
+        results: List[Optional[Any]] = [None] * len(full_keys)
+        if self._local is not None:
+            for index, key in enumerate(full_keys):
+                results[index] = self._local.get(key)
+            local_hits = sum(1 for value in results if value is not None)
+            self._stats.record("l1", True, local_hits)
+            self._stats.record("l1", False, len(full_keys) - local_hits)
+        
+        missing = [index for index, value in enumerate(results) if value is None]
+        if not missing:
+            return results
+        
+        try:
+            values = await self._redis.mget([full_keys[index] for index in missing])
+            hits = sum(1 for value in values if value)
+            self._stats.record("redis", True, hits)
+            self._stats.record("redis", False, len(missing) - hits)
+            hot_path_logger.debug("Cache mget for {} keys with prefix {}: {} hits", len(missing), prefix, hits)
+            for index, value in zip(missing, values):
+                if value:
+                    results[index] = loads(value)
+                    if self._local is not None:
+                        self._local.set(full_keys[index], results[index])
+            return results
+        except Exception as e:
+            logger.error(f"Error getting many from cache: {e}")
+            return results
+    
+    @observe_async(CACHE_OPERATION_SECONDS, "set")
     async def set(self, value: Any, prefix: str, *args: Any) -> bool:
         """
         Set a value in cache.
@@ -54,19 +155,52 @@ class RedisCache:
         """
         key = self._build_key(prefix, *args)
         try:
-            # Convert value to JSON string for storage
-            json_value = json.dumps(value)
             await self._redis.set(
                 key,
-                json_value,
+                self._serializer.dumps(value),
                 ex=self._expiration_seconds
             )
-            logger.debug(f"Cached value for key: {key}")
+            hot_path_logger.debug("Cached value for key: {}", key)
+            if self._local is not None:
+                self._local.set(key, value)
+                await self._publish_invalidation([key])
             return True
         except Exception as e:
             logger.error(f"Error setting cache: {e}")
             return False
             
+    @observe_async(CACHE_OPERATION_SECONDS, "set_many")
+    async def set_many(self, prefix: str, entries: Dict[Tuple[Any, ...], Any]) -> bool:
+        """
+        Set several values in cache in one pipelined round trip.
+        
+        Args:
+            prefix: The key prefix (e.g., 'tao_dividends')
+            entries: Mapping of key components to the value to cache
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not entries:
+            return True
+        
+        values = {self._build_key(prefix, *args): value for args, value in entries.items()}
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key, value in values.items():
+                    pipe.set(key, self._serializer.dumps(value), ex=self._expiration_seconds)
+                await pipe.execute()
+            hot_path_logger.debug("Cached {} values with prefix {}", len(entries), prefix)
+            if self._local is not None:
+                for key, value in values.items():
+                    self._local.set(key, value)
+                await self._publish_invalidation(list(values))
+            return True
+        except Exception as e:
+            logger.error(f"Error setting many in cache: {e}")
+            return False
+            
+    @observe_async(CACHE_OPERATION_SECONDS, "delete")
     async def delete(self, prefix: str, *args: Any) -> bool:
         """
         Delete a value from cache.
@@ -82,7 +216,202 @@ class RedisCache:
         try:
             await self._redis.delete(key)
             logger.debug(f"Deleted cache for key: {key}")
+            if self._local is not None:
+                self._local.delete([key])
+                await self._publish_invalidation([key])
             return True
         except Exception as e:
             logger.error(f"Error deleting from cache: {e}")
-            return False 
\ No newline at end of file
+            return False
+    
+    @staticmethod
+    def _field_key(key: str, field: str) -> str:
+        """Local cache key of a hash field, the same as its key in the per-entry layout."""
+        return f"{key}:{field}"
+    
+    @observe_async(CACHE_OPERATION_SECONDS, "get_fields")
+    async def get_fields(
+        self,
+        prefix: str,
+        requests: Dict[Tuple[Any, ...], Sequence[str]]
+    ) -> Dict[Tuple[Any, ...], List[Optional[Any]]]:
+        """
+        Get fields of several hashes, with one HMGET per hash in a single pipeline.
+        
+        Args:
+            prefix: The key prefix (e.g., 'tao_dividends')
+            requests: Mapping of each hash's key components to the fields to read
+            
+        Returns:
+            The decoded values of each hash's fields in request order, None for each miss
+        """
+        results: Dict[Tuple[Any, ...], List[Optional[Any]]] = {
+            args: [None] * len(fields) for args, fields in requests.items()
+        }
+        missing: Dict[Tuple[Any, ...], List[int]] = {}
+        for args, fields in requests.items():
+            key = self._build_key(prefix, *args)
+            for index, field in enumerate(fields):
+                if self._local is not None:
+                    results[args][index] = self._local.get(self._field_key(key, field))
+                if results[args][index] is None:
+                    missing.setdefault(args, []).append(index)
+        if self._local is not None:
+            requested = sum(len(fields) for fields in requests.values())
+            local_misses = sum(len(indexes) for indexes in missing.values())
+            self._stats.record("l1", True, requested - local_misses)
+            self._stats.record("l1", False, local_misses)
+        if not missing:
+            return results
+        
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for args, indexes in missing.items():
+                    pipe.hmget(self._build_key(prefix, *args), [requests[args][index] for index in indexes])
+                replies = await pipe.execute()
+            
+            hits = 0
+            for (args, indexes), values in zip(missing.items(), replies):
+                key = self._build_key(prefix, *args)
+                for index, value in zip(indexes, values):
+                    if value:
+                        hits += 1
+                        results[args][index] = loads(value)
+                        if self._local is not None:
+                            self._local.set(self._field_key(key, requests[args][index]), results[args][index])
+            misses = sum(len(indexes) for indexes in missing.values())
+            self._stats.record("redis", True, hits)
+            self._stats.record("redis", False, misses - hits)
+            hot_path_logger.debug(
+                "Cache hmget for {} fields of {} hashes with prefix {}: {} hits", misses, len(missing), prefix, hits
+            )
+            return results
+        except Exception as e:
+            logger.error(f"Error getting fields from cache: {e}")
+            return results
+    
+    @observe_async(CACHE_OPERATION_SECONDS, "get_all_fields")
+    async def get_all_fields(self, prefix: str, *args: Any) -> Dict[str, Any]:
+        """
+        Get every field of a hash with HGETALL.
+        
+        Whole-hash reads bypass the local cache.
+        
+        Args:
+            prefix: The key prefix (e.g., 'subnet_dividends')
+            *args: Key components to build the full key
+            
+        Returns:
+            Dict mapping each field to its decoded value, empty if the hash is not cached
+        """
+        key = self._build_key(prefix, *args)
+        try:
+            values = await self._redis.hgetall(key)
+            self._stats.record("redis", bool(values))
+            return {
+                (field.decode("utf-8") if isinstance(field, bytes) else field): loads(value)
+                for field, value in values.items()
+            }
+        except Exception as e:
+            logger.error(f"Error getting hash from cache: {e}")
+            return {}
+    
+    @observe_async(CACHE_OPERATION_SECONDS, "set_fields")
+    async def set_fields(self, prefix: str, entries: Dict[Tuple[Any, ...], Dict[str, Any]]) -> bool:
+        """
+        Set fields of several hashes in one pipelined round trip.
+        
+        A hash created by these writes expires CACHE_EXPIRATION_SECONDS
+        later. Writes to an existing hash leave its TTL as is, so partial
+        updates never keep older fields alive past the hard TTL.
+        
+        Args:
+            prefix: The key prefix (e.g., 'tao_dividends')
+            entries: Mapping of each hash's key components to the fields to set
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        entries = {args: fields for args, fields in entries.items() if fields}
+        if not entries:
+            return True
+        
+        keys = {args: self._build_key(prefix, *args) for args in entries}
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for args, fields in entries.items():
+                    pipe.hset(keys[args], mapping={
+                        field: self._serializer.dumps(value) for field, value in fields.items()
+                    })
+                    pipe.expire(keys[args], self._expiration_seconds, nx=True)
+                await pipe.execute()
+            hot_path_logger.debug("Cached fields of {} hashes with prefix {}", len(entries), prefix)
+            if self._local is not None:
+                field_keys = []
+                for args, fields in entries.items():
+                    for field, value in fields.items():
+                        field_keys.append(self._field_key(keys[args], field))
+                        self._local.set(field_keys[-1], value)
+                await self._publish_invalidation(field_keys)
+            return True
+        except Exception as e:
+            logger.error(f"Error setting fields in cache: {e}")
+            return False
+    
+    @observe_async(CACHE_OPERATION_SECONDS, "replace_hash")
+    async def replace_hash(self, prefix: str, key_args: Sequence[Any], fields: Dict[str, Any]) -> bool:
+        """
+        Replace a whole hash atomically.
+        
+        The fields are written to a temporary key which is then RENAMEd over
+        the hash in the same MULTI, so readers see either the old or the new
+        hash and never a partly written one. The hash gets one TTL of
+        CACHE_EXPIRATION_SECONDS. An empty fields dict deletes the hash.
+        Local copies of the old and new fields are evicted, including
+        fields the new hash dropped.
+        
+        Args:
+            prefix: The key prefix (e.g., 'subnet_dividends')
+            key_args: Key components to build the full key
+            fields: Every field of the new hash
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        key = self._build_key(prefix, *key_args)
+        staging_key = f"{key}:staging:{uuid.uuid4().hex}"
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                # Read in the same MULTI, so these are exactly the fields replaced
+                pipe.hkeys(key)
+                if fields:
+                    pipe.hset(staging_key, mapping={
+                        field: self._serializer.dumps(value) for field, value in fields.items()
+                    })
+                    pipe.expire(staging_key, self._expiration_seconds)
+                    pipe.rename(staging_key, key)
+                else:
+                    pipe.delete(key)
+                old_fields = (await pipe.execute())[0]
+            logger.debug(f"Replaced hash {key} with {len(fields)} fields")
+            if self._local is not None:
+                dropped = {
+                    field.decode("utf-8") if isinstance(field, bytes) else field for field in old_fields
+                } - fields.keys()
+                field_keys = [self._field_key(key, field) for field in [*fields, *dropped]]
+                self._local.delete(field_keys)
+                await self._publish_invalidation(field_keys)
+            return True
+        except Exception as e:
+            logger.error(f"Error replacing hash in cache: {e}")
+            return False
+    
+    async def _publish_invalidation(self, keys: List[str]) -> None:
+        """Tell other API workers to evict keys from their local cache."""
+        try:
+            await self._redis.publish(
+                settings.CACHE_INVALIDATION_CHANNEL,
+                json.dumps({"origin": self._local.instance_id, "keys": keys})
+            )
+        except Exception as e:
+            logger.error(f"Error publishing cache invalidation: {e}")
@@ -0,0 +1,72 @@
+from typing import Any, Dict, Optional
+import asyncio
+import time
+from redis.asyncio import BlockingConnectionPool
+from redis.asyncio.connection import Connection
+from loguru import logger
+from app.core.config import settings
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """Blocking Redis connection pool that records checkout wait times."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._acquisitions = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    async def get_connection(self, *args: Any, **kwargs: Any) -> Connection:
+        """Get a connection from the pool, recording how long the caller waited."""
+        started_at = time.monotonic()
+        connection = await super().get_connection(*args, **kwargs)
+        wait = time.monotonic() - started_at
+        self._acquisitions += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+        return connection
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics for monitoring.
+
+        Returns:
+            Dict with the connection limit, in-use and idle connection counts
+            and average/max checkout wait in seconds
+        """
+        return {
+            "max_connections": self.max_connections,
+            "in_use": len(self._in_use_connections),
+            "idle": len(self._available_connections),
+            "acquisitions": self._acquisitions,
+            "avg_wait_seconds": self._total_wait / self._acquisitions if self._acquisitions else 0.0,
+            "max_wait_seconds": self._max_wait,
+        }
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for in-use connections to be released, then disconnect them all.
+
+        Args:
+            timeout: Seconds to wait for in-flight commands before forcing
+                     the disconnect. If not provided, uses
+                     REDIS_POOL_DRAIN_TIMEOUT_SECONDS from settings.
+        """
+        drain_timeout = timeout if timeout is not None else settings.REDIS_POOL_DRAIN_TIMEOUT_SECONDS
+        deadline = time.monotonic() + drain_timeout
+        while self._in_use_connections and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+        if self._in_use_connections:
+            logger.warning(f"Disconnecting {len(self._in_use_connections)} Redis connections still in use")
+        await self.disconnect()
+        logger.info("Drained Redis connection pool")
+
+
+def create_redis_pool() -> InstrumentedConnectionPool:
+    """Create the shared Redis connection pool from settings."""
+    return InstrumentedConnectionPool.from_url(
+        str(settings.REDIS_URI),
+        max_connections=settings.REDIS_POOL_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+    )
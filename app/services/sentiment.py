@@ -0,0 +1,111 @@
+from typing import Any, List, Optional, Protocol
+import re
+import httpx
+from loguru import logger
+from app.core.config import settings
+
+SENTIMENT_PROMPT = (
+    "Rate the overall sentiment of the following tweets about a Bittensor subnet "
+    "on a scale from -100 (very negative) to 100 (very positive). "
+    "Answer with the number only.\n\n{tweets}"
+)
+
+
+class TweetSource(Protocol):
+    """Finds recent tweets matching a query."""
+
+    async def search(self, query: str, count: int) -> List[str]:
+        """Get the text of up to count tweets matching query."""
+        ...
+
+
+class SentimentScorer(Protocol):
+    """Scores the combined sentiment of a set of texts."""
+
+    async def score(self, texts: List[str]) -> float:
+        """Get one sentiment score between -100 and 100 for all texts."""
+        ...
+
+
+class DaturaTweetSource:
+    """Tweet search backed by the Datura Twitter API."""
+
+    def __init__(self, http: httpx.AsyncClient, api_key: Optional[str] = None, url: Optional[str] = None):
+        """
+        Initialize the tweet source.
+
+        Args:
+            http: Pooled HTTP client the requests are sent with
+            api_key: Datura API key.
+                     If not provided, uses DATURA_API_KEY from settings.
+            url: Search endpoint, replaceable by a local stub service.
+                 If not provided, uses DATURA_API_URL from settings.
+        """
+        self._http = http
+        self._api_key = api_key or settings.DATURA_API_KEY
+        self._url = url or settings.DATURA_API_URL
+
+    async def search(self, query: str, count: int) -> List[str]:
+        response = await self._http.post(
+            self._url,
+            json={"query": query, "count": count},
+            headers={"Authorization": self._api_key},
+        )
+        response.raise_for_status()
+        payload: Any = response.json()
+        tweets = payload.get("data", []) if isinstance(payload, dict) else payload
+        texts = [tweet["text"] for tweet in tweets if isinstance(tweet, dict) and tweet.get("text")]
+        logger.info(f"Found {len(texts)} tweets for '{query}'")
+        return texts[:count]
+
+
+class ChutesSentimentScorer:
+    """Sentiment scoring backed by an LLM served by Chutes."""
+
+    def __init__(
+        self,
+        http: httpx.AsyncClient,
+        api_key: Optional[str] = None,
+        url: Optional[str] = None,
+        model: Optional[str] = None,
+    ):
+        """
+        Initialize the scorer.
+
+        Args:
+            http: Pooled HTTP client the requests are sent with
+            api_key: Chutes API key.
+                     If not provided, uses CHUTES_API_KEY from settings.
+            url: Chat completions endpoint, replaceable by a local stub service.
+                 If not provided, uses CHUTES_API_URL from settings.
+            model: Model asked for the score.
+                   If not provided, uses CHUTES_MODEL from settings.
+        """
+        self._http = http
+        self._api_key = api_key or settings.CHUTES_API_KEY
+        self._url = url or settings.CHUTES_API_URL
+        self._model = model or settings.CHUTES_MODEL
+
+    async def score(self, texts: List[str]) -> float:
+        """
+        Score all texts with a single completion request.
+
+        Raises:
+            ValueError: If the reply does not contain a number
+        """
+        prompt = SENTIMENT_PROMPT.format(tweets="\n---\n".join(texts))
+        response = await self._http.post(
+            self._url,
+            json={
+                "model": self._model,
+                "messages": [{"role": "user", "content": prompt}],
+                "stream": False,
+            },
+            headers={"Authorization": f"Bearer {self._api_key}"},
+        )
+        response.raise_for_status()
+        content = response.json()["choices"][0]["message"]["content"]
+        match = re.search(r"-?\d+(?:\.\d+)?", content)
+        if not match:
+            raise ValueError(f"No sentiment score in model reply: {content!r}")
+        return max(-100.0, min(100.0, float(match.group())))
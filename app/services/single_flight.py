@@ -0,0 +1,52 @@
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+import asyncio
+from loguru import logger
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Deduplicates concurrent in-process calls that share a key."""
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of keys currently being fetched."""
+        return len(self._in_flight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        The first caller starts fn as a task; callers arriving while it is
+        running await the same task instead of starting their own. The task
+        is shielded, so a cancelled caller does not abort the fetch for the
+        others.
+
+        Args:
+            key: Identifies calls that may share a result
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            The result of the shared call
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            logger.debug(f"Joining in-flight call for key: {key}")
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """Remove a finished call so the next caller starts a fresh one."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
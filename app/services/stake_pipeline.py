@@ -0,0 +1,328 @@
+from typing import Any, Callable, Dict, List, Optional, Protocol
+import asyncio
+import uuid
+from redis.asyncio import Redis
+from loguru import logger
+from app.services.bittensor_client import RAO_PER_TAO
+from app.services.sentiment import SentimentScorer, TweetSource
+from app.core.config import settings
+
+# Called with a netuid and the seconds to wait before its batch runs
+Dispatch = Callable[[int, float], Any]
+# Called with a netuid, the id of the submission task and the seconds to wait before it runs
+SubmissionDispatch = Callable[[int, str, float], Any]
+
+
+class StakeSubmitter(Protocol):
+    """Submits stake changes of one subnet."""
+
+    async def submit_stake(self, netuid: int, amounts: Dict[str, float]) -> str:
+        """
+        Stake positive and unstake negative TAO amounts per hotkey.
+
+        Returns:
+            The extrinsic hash, or the id of the task that will submit it
+        """
+        ...
+
+
+class StakeJobQueue:
+    """
+    Debounces sentiment and stake jobs per subnet.
+
+    Requests add their hotkey to the subnet's pending set in Redis. Only the
+    first request of a window schedules the batch; the batch runs after the
+    debounce delay and takes every hotkey queued by then, on any API worker.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        dispatch: Dispatch,
+        debounce: Optional[float] = None,
+        prefix: Optional[str] = None,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            redis: Redis client holding the pending jobs
+            dispatch: Blocking callable that schedules a subnet's batch
+            debounce: Seconds jobs are collected before their batch runs.
+                      If not provided, uses STAKE_PIPELINE_DEBOUNCE_SECONDS.
+            prefix: Prefix of the queue's Redis keys.
+                    If not provided, uses STAKE_PIPELINE_PREFIX.
+        """
+        self._redis = redis
+        self._dispatch = dispatch
+        self._debounce = debounce if debounce is not None else settings.STAKE_PIPELINE_DEBOUNCE_SECONDS
+        self._prefix = prefix or settings.STAKE_PIPELINE_PREFIX
+
+    def _key(self, *parts: Any) -> str:
+        """Build a Redis key under the queue prefix."""
+        return ":".join(str(part) for part in (self._prefix, *parts))
+
+    async def enqueue(self, netuid: int, hotkey: str) -> bool:
+        """
+        Queue a stake job, scheduling the subnet's batch if none is pending.
+
+        Args:
+            netuid: The subnet ID
+            hotkey: The hotkey to stake to
+
+        Returns:
+            True if the job is part of a scheduled batch, False if the batch
+            could not be scheduled
+        """
+        pending_key = self._key("pending", netuid)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.sadd(pending_key, hotkey)
+            pipe.expire(pending_key, settings.STAKE_PIPELINE_JOB_TTL_SECONDS)
+            pipe.set(self._key("scheduled", netuid), 1, nx=True, ex=settings.STAKE_PIPELINE_JOB_TTL_SECONDS)
+            _, _, scheduled = await pipe.execute()
+
+        if not scheduled:
+            return True
+
+        try:
+            # Publishing to the broker blocks, so it runs off the event loop
+            await asyncio.to_thread(self._dispatch, netuid, self._debounce)
+        except Exception as e:
+            logger.error(f"Failed to schedule stake pipeline for netuid={netuid}: {e}")
+            # Let the next request schedule the batch instead
+            await self._redis.delete(self._key("scheduled", netuid))
+            return False
+
+        logger.info(f"Scheduled stake pipeline for netuid={netuid} in {self._debounce}s")
+        return True
+
+    async def take(self, netuid: int) -> List[str]:
+        """
+        Take every pending hotkey of a subnet.
+
+        The pending set and the schedule marker are removed together, so a job
+        queued afterwards schedules a new batch rather than being lost.
+
+        Returns:
+            The queued hotkeys, sorted
+        """
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.smembers(self._key("pending", netuid))
+            pipe.delete(self._key("pending", netuid), self._key("scheduled", netuid))
+            members, _ = await pipe.execute()
+        return sorted(
+            member.decode("utf-8") if isinstance(member, bytes) else member
+            for member in members
+        )
+
+
+class StakeSubmissionQueue:
+    """
+    Coalesces stake changes into one net extrinsic per subnet and window.
+
+    Amounts are summed per (netuid, hotkey) in a Redis hash, in RAO so that
+    stakes and unstakes cancel exactly. The first change of a window
+    schedules a submission task under a task id kept in a dedup key; later
+    changes of the window join it. The task takes the net amounts when it
+    runs and returns the extrinsic hash as its result. Changes that fail
+    before reaching the chain are retried with backoff a limited number of
+    times.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        dispatch: SubmissionDispatch,
+        window: Optional[float] = None,
+        prefix: Optional[str] = None,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            redis: Redis client holding the pending amounts
+            dispatch: Blocking callable that schedules a subnet's submission task
+            window: Seconds changes are coalesced before they are submitted.
+                    If not provided, uses STAKE_SUBMIT_WINDOW_SECONDS.
+            prefix: Prefix of the queue's Redis keys.
+                    If not provided, uses STAKE_SUBMIT_PREFIX.
+        """
+        self._redis = redis
+        self._dispatch = dispatch
+        self._window = window if window is not None else settings.STAKE_SUBMIT_WINDOW_SECONDS
+        self._prefix = prefix or settings.STAKE_SUBMIT_PREFIX
+
+    def _key(self, *parts: Any) -> str:
+        """Build a Redis key under the queue prefix."""
+        return ":".join(str(part) for part in (self._prefix, *parts))
+
+    async def submit_stake(self, netuid: int, amounts: Dict[str, float]) -> str:
+        """
+        Add stake changes to the subnet's pending submission.
+
+        Args:
+            netuid: The subnet ID
+            amounts: Dict mapping hotkey to TAO amount; positive amounts are
+                     staked and negative amounts are unstaked
+
+        Returns:
+            Id of the submission task; its result holds the extrinsic hash
+
+        Raises:
+            Exception: If a new submission task could not be scheduled
+        """
+        return await self._add(netuid, amounts, self._window)
+
+    async def retry(self, netuid: int, amounts: Dict[str, float]) -> Optional[str]:
+        """
+        Return stake changes that failed before reaching the chain to the subnet's pending submission.
+
+        Each consecutive retry of a subnet waits twice as long as the one
+        before it, starting at twice the window. After
+        STAKE_SUBMIT_MAX_RETRIES retries the changes are dropped.
+
+        Returns:
+            Id of the submission task the changes joined, or None if they were dropped
+
+        Raises:
+            Exception: If a new submission task could not be scheduled
+        """
+        attempts_key = self._key("attempts", netuid)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.incr(attempts_key)
+            pipe.expire(attempts_key, settings.STAKE_PIPELINE_JOB_TTL_SECONDS)
+            attempts, _ = await pipe.execute()
+
+        if attempts > settings.STAKE_SUBMIT_MAX_RETRIES:
+            await self._redis.delete(attempts_key)
+            logger.error(f"Dropping stake changes for netuid={netuid} after {attempts - 1} retries: {amounts}")
+            return None
+        return await self._add(netuid, amounts, self._window * 2 ** attempts)
+
+    async def clear_retries(self, netuid: int) -> None:
+        """Reset the retry count of a subnet after a submission went through."""
+        await self._redis.delete(self._key("attempts", netuid))
+
+    async def _add(self, netuid: int, amounts: Dict[str, float], countdown: float) -> str:
+        """Add stake changes to the pending submission, scheduling it after countdown seconds if it is new."""
+        amounts_key = self._key("amounts", netuid)
+        scheduled_key = self._key("scheduled", netuid)
+        task_id = uuid.uuid4().hex
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for hotkey, amount in amounts.items():
+                pipe.hincrby(amounts_key, hotkey, round(amount * RAO_PER_TAO))
+            pipe.expire(amounts_key, settings.STAKE_PIPELINE_JOB_TTL_SECONDS)
+            pipe.set(scheduled_key, task_id, nx=True, ex=settings.STAKE_PIPELINE_JOB_TTL_SECONDS)
+            pipe.get(scheduled_key)
+            *_, scheduled, current = await pipe.execute()
+
+        if not scheduled:
+            return current.decode("utf-8") if isinstance(current, bytes) else current
+
+        try:
+            await asyncio.to_thread(self._dispatch, netuid, task_id, countdown)
+        except Exception as e:
+            logger.error(f"Failed to schedule stake submission for netuid={netuid}: {e}")
+            # The amounts stay pending for the next change to schedule
+            await self._redis.delete(scheduled_key)
+            raise
+
+        logger.info(f"Scheduled stake submission {task_id} for netuid={netuid} in {countdown}s")
+        return task_id
+
+    async def take(self, netuid: int) -> Dict[str, float]:
+        """
+        Take the net pending amounts of a subnet.
+
+        The amounts and the dedup key are removed together, so a change added
+        afterwards schedules a new submission rather than being lost.
+
+        Returns:
+            Dict mapping hotkey to net TAO amount, without hotkeys netting to zero
+        """
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hgetall(self._key("amounts", netuid))
+            pipe.delete(self._key("amounts", netuid), self._key("scheduled", netuid))
+            pending, _ = await pipe.execute()
+        return {
+            (hotkey.decode("utf-8") if isinstance(hotkey, bytes) else hotkey): int(rao) / RAO_PER_TAO
+            for hotkey, rao in pending.items()
+            if int(rao)
+        }
+
+
+class StakePipeline:
+    """Stakes to or unstakes from hotkeys of a subnet depending on its Twitter sentiment."""
+
+    def __init__(
+        self,
+        tweets: TweetSource,
+        scorer: SentimentScorer,
+        submitter: StakeSubmitter,
+        tao_per_point: Optional[float] = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            tweets: Source of tweets about a subnet
+            scorer: Scores the sentiment of the tweets
+            submitter: Submits the resulting stake changes
+            tao_per_point: TAO staked per hotkey per point of sentiment.
+                           If not provided, uses STAKE_TAO_PER_SENTIMENT_POINT.
+        """
+        self._tweets = tweets
+        self._scorer = scorer
+        self._submitter = submitter
+        self._tao_per_point = tao_per_point or settings.STAKE_TAO_PER_SENTIMENT_POINT
+
+    async def run(self, netuid: int, hotkeys: List[str]) -> Dict[str, Any]:
+        """
+        Run one batch of a subnet.
+
+        The subnet's tweets are searched and scored once for the whole batch,
+        and every hotkey's stake change is handed to the submitter at once. Nothing
+        is submitted when no tweets are found or the sentiment is neutral.
+
+        Args:
+            netuid: The subnet ID
+            hotkeys: The hotkeys to stake to or unstake from
+
+        Returns:
+            Dict with the netuid, hotkeys, tweet count, sentiment, TAO amount
+            per hotkey and the submitter's reference to the stake change
+            (None when nothing was submitted)
+        """
+        result: Dict[str, Any] = {
+            "netuid": netuid,
+            "hotkeys": hotkeys,
+            "tweets": 0,
+            "sentiment": None,
+            "amount": 0.0,
+            "submission": None,
+        }
+        if not hotkeys:
+            return result
+
+        query = settings.SENTIMENT_QUERY_TEMPLATE.format(netuid=netuid)
+        texts = await self._tweets.search(query, settings.SENTIMENT_TWEET_COUNT)
+        result["tweets"] = len(texts)
+        if not texts:
+            logger.info(f"No tweets for netuid={netuid}, skipping stake of {len(hotkeys)} hotkeys")
+            return result
+
+        sentiment = await self._scorer.score(texts)
+        amount = sentiment * self._tao_per_point
+        result.update(sentiment=sentiment, amount=amount)
+        if not amount:
+            logger.info(f"Neutral sentiment for netuid={netuid}, skipping stake of {len(hotkeys)} hotkeys")
+            return result
+
+        result["submission"] = await self._submitter.submit_stake(
+            netuid, {hotkey: amount for hotkey in hotkeys}
+        )
+        logger.info(
+            f"Sentiment {sentiment} for netuid={netuid}: "
+            f"{'staked' if amount > 0 else 'unstaked'} {abs(amount)} TAO on {len(hotkeys)} hotkeys"
+        )
+        return result
@@ -0,0 +1,254 @@
+import base64
+import binascii
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+from loguru import logger
+from app.services.bittensor_client import BittensorClient
+from app.services.bittensor_pool import BittensorClientPool, checkout_client
+from app.services.block_watcher import BlockWatcher
+from app.services.redis_cache import RedisCache
+from app.services.single_flight import SingleFlight
+from app.services.subnet_snapshot import SubnetSnapshot, SubnetSnapshotStore
+from app.services.tao_dividends import TaoDividendsService
+from app.api.v1.schemas.subnets import (
+    HotkeyDividend,
+    SortOrder,
+    SubnetDividendsResponse,
+    SubnetDividendsSort,
+)
+from app.core.config import settings
+
+SortKey = Tuple
+
+
+class SubnetDividendsService:
+    """Service for reading the dividends of every hotkey in a subnet."""
+    
+    CACHE_PREFIX = "subnet_dividends"
+    
+    def __init__(
+        self,
+        bittensor_client: Optional[BittensorClient],
+        cache: RedisCache,
+        snapshots: Optional[SubnetSnapshotStore] = None,
+        single_flight: Optional[SingleFlight] = None,
+        block_watcher: Optional[BlockWatcher] = None,
+        pool: Optional[BittensorClientPool] = None
+    ):
+        """
+        Initialize the subnet dividends service.
+        
+        Args:
+            bittensor_client: The Bittensor client instance, None with a pool
+            cache: The Redis cache service, holding one blob per subnet or,
+                   with the hash layout, the subnet hash shared with
+                   TaoDividendsService
+            snapshots: Optional shared store of per-subnet snapshots, checked
+                       before Redis and filled on a chain fetch
+            single_flight: Optional shared SingleFlight so concurrent misses
+                           for the same subnet share one chain fetch
+            block_watcher: Optional watcher of subnet epochs. When provided,
+                           a cached subnet stays valid until its next epoch;
+                           otherwise it expires after CACHE_SOFT_TTL_SECONDS.
+            pool: Optional pool the chain fetch checks a client out of,
+                  instead of using bittensor_client, so the fetch shared by
+                  concurrent misses holds a client of its own.
+        """
+        self._client = bittensor_client
+        self._pool = pool
+        self._cache = cache
+        self._snapshots = snapshots
+        self._single_flight = single_flight or SingleFlight()
+        self._block_watcher = block_watcher
+    
+    async def get_subnet(self, netuid: int) -> Tuple[int, Dict[str, float], bool]:
+        """
+        Get the dividends of every hotkey in a subnet.
+        
+        Looks in the in-process snapshot store, then the cached subnet blob,
+        and only reads the chain when both miss.
+        
+        Args:
+            netuid: The subnet ID
+            
+        Returns:
+            Tuple of (block number, dict mapping hotkey to dividend, whether
+            the chain was not touched)
+            
+        Raises:
+            Exception: If the blockchain query fails
+        """
+        if self._snapshots:
+            snapshot = self._snapshots.peek(netuid)
+            if snapshot:
+                return snapshot.block, snapshot.dividends, True
+        
+        try:
+            data = await self._cached_subnet(netuid)
+            if data:
+                if not self._is_stale(netuid, data):
+                    logger.info(f"Cache hit for subnet dividends of netuid={netuid}")
+                    return data["block"], data["dividends"], True
+        except Exception as cache_error:
+            logger.error(f"Cache error: {cache_error}")
+        
+        block, dividends = await self._single_flight.do(
+            (self.CACHE_PREFIX, netuid),
+            lambda: self._fetch_and_cache(netuid)
+        )
+        return block, dividends, False
+    
+    async def _cached_subnet(self, netuid: int) -> Optional[dict]:
+        """
+        Read a cached subnet in the configured CACHE_LAYOUT as a blob dict.
+        
+        With the hash layout, a subnet hash without a block was only
+        written hotkey by hotkey and may be missing some, so it is a miss.
+        """
+        if settings.CACHE_LAYOUT != "hash":
+            return await self._cache.get(self.CACHE_PREFIX, netuid)
+        
+        fields = await self._cache.get_all_fields(TaoDividendsService.CACHE_PREFIX, netuid)
+        block = fields.pop(TaoDividendsService.BLOCK_FIELD, None)
+        if block is None:
+            return None
+        return {
+            "netuid": netuid,
+            "block": block,
+            "cached_at": fields.pop(TaoDividendsService.CACHED_AT_FIELD, 0.0),
+            "dividends": {hotkey: entry["dividend"] for hotkey, entry in fields.items()},
+        }
+    
+    def _is_stale(self, netuid: int, data: dict) -> bool:
+        """Whether a cached subnet blob predates the subnet's last epoch or the soft TTL."""
+        if self._block_watcher:
+            outdated = self._block_watcher.is_outdated(netuid, data.get("block"))
+            if outdated is not None:
+                return outdated
+        return time.time() - data.get("cached_at", 0.0) >= settings.CACHE_SOFT_TTL_SECONDS
+    
+    async def _fetch_and_cache(self, netuid: int) -> Tuple[int, Dict[str, float]]:
+        """Read a subnet from the chain and cache it."""
+        async with checkout_client(self._pool, self._client) as client:
+            if self._snapshots:
+                snapshot = await self._snapshots.get(netuid, client)
+                block, dividends = snapshot.block, snapshot.dividends
+            else:
+                block, dividends = await client.get_subnet_dividends(netuid)
+        
+        try:
+            await self.prime(netuid, block, dividends)
+        except Exception as cache_error:
+            logger.error(f"Failed to cache subnet dividends: {cache_error}")
+        
+        return block, dividends
+    
+    async def prime(self, netuid: int, block: int, dividends: Dict[str, float]) -> None:
+        """
+        Cache a subnet read from the chain, as one blob with the key layout.
+        
+        With the hash layout the subnet hash shared with TaoDividendsService,
+        holding each hotkey's entry and the block it was read at, is
+        replaced atomically.
+        
+        Args:
+            netuid: The subnet ID
+            block: The block the dividends were read at
+            dividends: Dict mapping hotkey to dividend
+        """
+        if settings.CACHE_LAYOUT == "hash":
+            snapshot = SubnetSnapshot(netuid=netuid, block=block, dividends=dividends)
+            await self._cache.replace_hash(
+                TaoDividendsService.CACHE_PREFIX,
+                (netuid,),
+                TaoDividendsService.subnet_hash_fields(snapshot)
+            )
+            return
+        
+        await self._cache.set(
+            {"netuid": netuid, "block": block, "dividends": dividends, "cached_at": time.time()},
+            self.CACHE_PREFIX,
+            netuid
+        )
+    
+    @staticmethod
+    def encode_cursor(key: SortKey) -> str:
+        """Encode the sort key of the last item of a page as an opaque cursor."""
+        return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> SortKey:
+        """
+        Decode a cursor produced by encode_cursor.
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            return tuple(json.loads(base64.urlsafe_b64decode(cursor.encode())))
+        except (binascii.Error, TypeError, ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+    
+    @staticmethod
+    def _sort_key(sort_by: SubnetDividendsSort, hotkey: str, dividend: float) -> SortKey:
+        """Key ordering items by the sort field, with the hotkey breaking ties."""
+        return (dividend, hotkey) if sort_by == "dividend" else (hotkey,)
+    
+    async def get_page(
+        self,
+        netuid: int,
+        sort_by: SubnetDividendsSort = "dividend",
+        order: SortOrder = "desc",
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> SubnetDividendsResponse:
+        """
+        Get one page of a subnet's dividends.
+        
+        The cursor holds the sort key of the last item returned, so pages
+        stay consistent when the subnet is refreshed between requests. The
+        first page sorted by dividend descending is the subnet's top-N.
+        
+        Args:
+            netuid: The subnet ID
+            sort_by: Field to sort by, 'dividend' or 'hotkey'
+            order: 'asc' or 'desc'
+            limit: Maximum items in the page
+            cursor: Cursor from the previous page, None for the first page
+            
+        Returns:
+            SubnetDividendsResponse with the page and the next cursor
+            
+        Raises:
+            ValueError: If the cursor is malformed
+            Exception: If the blockchain query fails
+        """
+        after = self.decode_cursor(cursor) if cursor else None
+        block, dividends, cached = await self.get_subnet(netuid)
+        
+        reverse = order == "desc"
+        keyed = sorted(
+            ((self._sort_key(sort_by, hotkey, dividend), hotkey, dividend) for hotkey, dividend in dividends.items()),
+            key=lambda item: item[0],
+            reverse=reverse
+        )
+        if after is not None:
+            try:
+                keyed = [item for item in keyed if (item[0] < after if reverse else item[0] > after)]
+            except TypeError as e:
+                # The cursor was issued for a different sort field
+                raise ValueError(f"Invalid cursor: {cursor}") from e
+        
+        page = keyed[:limit]
+        items: List[HotkeyDividend] = [HotkeyDividend(hotkey=hotkey, dividend=dividend) for _, hotkey, dividend in page]
+        next_cursor = self.encode_cursor(page[-1][0]) if len(keyed) > limit else None
+        
+        return SubnetDividendsResponse(
+            netuid=netuid,
+            block=block,
+            total=len(dividends),
+            cached=cached,
+            items=items,
+            next_cursor=next_cursor
+        )
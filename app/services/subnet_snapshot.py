@@ -0,0 +1,98 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+import asyncio
+import time
+from loguru import logger
+from app.services.bittensor_client import BittensorClient
+from app.core.config import settings
+
+
+@dataclass
+class SubnetSnapshot:
+    """Dividends of every hotkey in a subnet, indexed by hotkey, at one block."""
+
+    netuid: int
+    block: int
+    dividends: Dict[str, float]
+    fetched_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was fetched from the chain."""
+        return time.monotonic() - self.fetched_at
+
+    def get(self, hotkey: str) -> float:
+        """Get the dividend for a hotkey, 0.0 if it has none in this subnet."""
+        return self.dividends.get(hotkey, 0.0)
+
+
+class SubnetSnapshotStore:
+    """Application-scoped store of per-subnet dividend snapshots."""
+
+    def __init__(self, ttl: Optional[float] = None):
+        """
+        Initialize the snapshot store.
+
+        Args:
+            ttl: Seconds a snapshot is served before it is refetched.
+                 If not provided, uses SUBNET_SNAPSHOT_TTL_SECONDS from settings.
+        """
+        self._ttl = ttl if ttl is not None else settings.SUBNET_SNAPSHOT_TTL_SECONDS
+        self._snapshots: Dict[int, SubnetSnapshot] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    def peek(self, netuid: int) -> Optional[SubnetSnapshot]:
+        """
+        Get the snapshot of a subnet without touching the chain.
+
+        Args:
+            netuid: The subnet ID
+
+        Returns:
+            The snapshot if one is held and still within its TTL, None otherwise
+        """
+        snapshot = self._snapshots.get(netuid)
+        if snapshot is None or snapshot.age >= self._ttl:
+            return None
+        return snapshot
+
+    async def get(self, netuid: int, client: BittensorClient) -> SubnetSnapshot:
+        """
+        Get the snapshot of a subnet, fetching it from the chain when expired.
+
+        Concurrent callers for the same subnet share a single fetch.
+
+        Args:
+            netuid: The subnet ID
+            client: A connected Bittensor client used on a miss
+
+        Returns:
+            A snapshot no older than the store TTL
+        """
+        snapshot = self.peek(netuid)
+        if snapshot:
+            return snapshot
+
+        lock = self._locks.setdefault(netuid, asyncio.Lock())
+        async with lock:
+            snapshot = self.peek(netuid)
+            if snapshot:
+                return snapshot
+
+            block, dividends = await client.get_subnet_dividends(netuid)
+            snapshot = SubnetSnapshot(netuid=netuid, block=block, dividends=dividends)
+            self._snapshots[netuid] = snapshot
+            logger.debug(f"Stored snapshot for netuid={netuid} at block {block} with {len(dividends)} hotkeys")
+            return snapshot
+
+    def invalidate(self, netuid: Optional[int] = None) -> None:
+        """
+        Drop held snapshots so the next lookup refetches them.
+
+        Args:
+            netuid: The subnet to drop. If not provided, drops every subnet.
+        """
+        if netuid is None:
+            self._snapshots.clear()
+            return
+        self._snapshots.pop(netuid, None)
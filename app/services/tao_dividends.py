@@ -1,25 +1,284 @@
-import json
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import orjson
 from loguru import logger
 from app.services.bittensor_client import BittensorClient
+from app.services.bittensor_pool import BittensorClientPool, checkout_client
+from app.services.block_watcher import BlockWatcher
+from app.services.cache_refresher import CacheRefresher
+from app.services.subnet_snapshot import SubnetSnapshot, SubnetSnapshotStore
 from app.services.redis_cache import RedisCache
+from app.services.single_flight import SingleFlight
 from app.api.v1.schemas.tao import TaoDividendsResponse
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.responses import encode_model
+
+# Per-request cache lookups, sampled by LOG_SAMPLE_RATES
+hot_path_logger = get_logger("tao_dividends.hot_path")
 
 
 class TaoDividendsService:
     """Service for handling Tao dividends operations."""
     
     CACHE_PREFIX = "tao_dividends"
+    LOCK_PREFIX = "tao_dividends_lock"
+    # Metadata fields of a subnet hash, set only when the whole subnet is
+    # cached; hotkeys never start with an underscore
+    BLOCK_FIELD = "_block"
+    CACHED_AT_FIELD = "_cached_at"
     
-    def __init__(self, bittensor_client: BittensorClient, cache: RedisCache):
+    def __init__(
+        self,
+        bittensor_client: Optional[BittensorClient],
+        cache: RedisCache,
+        snapshots: Optional[SubnetSnapshotStore] = None,
+        single_flight: Optional[SingleFlight] = None,
+        refresher: Optional[CacheRefresher] = None,
+        block_watcher: Optional[BlockWatcher] = None,
+        pool: Optional[BittensorClientPool] = None
+    ):
         """
         Initialize the TaoDividends service.
         
         Args:
-            bittensor_client: The Bittensor client instance
+            bittensor_client: The Bittensor client instance, None with a pool
             cache: The Redis cache service
+            snapshots: Optional shared store of per-subnet snapshots, used
+                       when many hotkeys of a subnet are requested at once
+                       or a fresh snapshot is already held.
+            single_flight: Optional shared SingleFlight so concurrent misses
+                           for the same key share one chain fetch
+            refresher: Optional background refresher. When provided, entries
+                       past CACHE_SOFT_TTL_SECONDS are served stale while
+                       being refreshed, and hot entries are refreshed ahead
+                       of expiry. Without it, stale entries count as misses.
+            block_watcher: Optional watcher of subnet epochs. When provided,
+                           entries are stamped with the chain head they were
+                           read at and only go stale once their subnet runs
+                           a new epoch; the soft TTL applies only to entries
+                           whose block is unknown.
+            pool: Optional pool every chain read checks a client out of,
+                  instead of using bittensor_client. A fetch shared by
+                  concurrent misses then runs with a client of its own,
+                  which no cancelled caller can return to the pool.
         """
         self._client = bittensor_client
+        self._pool = pool
         self._cache = cache
+        self._snapshots = snapshots
+        self._single_flight = single_flight or SingleFlight()
+        self._refresher = refresher
+        self._block_watcher = block_watcher
+    
+    async def fetch_dividends(
+        self,
+        netuid: int,
+        hotkeys: List[str]
+    ) -> Tuple[Dict[str, float], Optional[SubnetSnapshot]]:
+        """
+        Fetch dividends for hotkeys of one subnet from the chain.
+        
+        A fresh subnet snapshot is used when one is held. Otherwise the
+        whole subnet map is fetched only when at least
+        SUBNET_SNAPSHOT_MIN_HOTKEYS hotkeys are requested; smaller requests
+        use keyed point lookups.
+        
+        Args:
+            netuid: The subnet ID
+            hotkeys: The hotkeys to look up
+            
+        Returns:
+            Tuple of (dict mapping hotkey to dividend, snapshot used or None)
+        """
+        snapshot = self._snapshots.peek(netuid) if self._snapshots else None
+        if snapshot:
+            return {hotkey: snapshot.get(hotkey) for hotkey in hotkeys}, snapshot
+        
+        async with checkout_client(self._pool, self._client) as client:
+            if self._snapshots and len(hotkeys) >= settings.SUBNET_SNAPSHOT_MIN_HOTKEYS:
+                snapshot = await self._snapshots.get(netuid, client)
+                return {hotkey: snapshot.get(hotkey) for hotkey in hotkeys}, snapshot
+            
+            if len(hotkeys) == 1:
+                dividend = await client.get_tao_dividends(netuid, hotkeys[0])
+                return {hotkeys[0]: dividend}, None
+            
+            return await client.get_tao_dividends_multi(netuid, hotkeys), None
+    
+    async def _cache_get(self, netuid: int, hotkey: str) -> Optional[dict]:
+        """Read a cached entry in the configured CACHE_LAYOUT."""
+        if settings.CACHE_LAYOUT == "hash":
+            values = await self._cache.get_fields(self.CACHE_PREFIX, {(netuid,): [hotkey]})
+            return values[(netuid,)][0]
+        return await self._cache.get(self.CACHE_PREFIX, netuid, hotkey)
+    
+    async def _cache_get_many(self, pairs: List[Tuple[int, str]]) -> List[Optional[dict]]:
+        """Read cached entries in the configured CACHE_LAYOUT, one HMGET per subnet with the hash layout."""
+        if settings.CACHE_LAYOUT != "hash":
+            return await self._cache.get_many(self.CACHE_PREFIX, pairs)
+        
+        requests: Dict[Tuple[int, ...], List[str]] = {}
+        for netuid, hotkey in pairs:
+            requests.setdefault((netuid,), []).append(hotkey)
+        values = await self._cache.get_fields(self.CACHE_PREFIX, requests)
+        # Each subnet's values come back in the order its pairs were requested
+        remaining = {args: iter(subnet_values) for args, subnet_values in values.items()}
+        return [next(remaining[(netuid,)]) for netuid, _ in pairs]
+    
+    async def _cache_set(self, netuid: int, hotkey: str, payload: dict) -> None:
+        """Write a cached entry in the configured CACHE_LAYOUT."""
+        if settings.CACHE_LAYOUT == "hash":
+            await self._cache.set_fields(self.CACHE_PREFIX, {(netuid,): {hotkey: payload}})
+        else:
+            await self._cache.set(payload, self.CACHE_PREFIX, netuid, hotkey)
+    
+    async def _cache_set_many(self, entries: Dict[Tuple[int, str], dict]) -> None:
+        """Write cached entries in the configured CACHE_LAYOUT."""
+        if settings.CACHE_LAYOUT != "hash":
+            await self._cache.set_many(self.CACHE_PREFIX, entries)
+            return
+        
+        by_netuid: Dict[Tuple[int, ...], Dict[str, dict]] = {}
+        for (netuid, hotkey), payload in entries.items():
+            by_netuid.setdefault((netuid,), {})[hotkey] = payload
+        await self._cache.set_fields(self.CACHE_PREFIX, by_netuid)
+    
+    @staticmethod
+    def _response_from_cache(netuid: int, hotkey: str, data: dict, stale: bool = False) -> TaoDividendsResponse:
+        """Build a response from a cached payload."""
+        return TaoDividendsResponse(
+            netuid=netuid,
+            hotkey=hotkey,
+            dividend=data["dividend"],
+            cached=True,
+            stake_tx_triggered=data["stake_tx_triggered"],
+            block=data.get("block"),
+            snapshot_age_seconds=data.get("snapshot_age_seconds"),
+            stale=stale
+        )
+    
+    @staticmethod
+    def _cache_payload(response: TaoDividendsResponse, computed_at_block: Optional[int] = None) -> dict:
+        """
+        Build the cached payload of a response, stamped with its write time and read block.
+        
+        The netuid and hotkey are already part of the key, and cached and
+        stale are decided when the entry is served, so none of them is stored.
+        """
+        return {
+            **response.model_dump(exclude={"netuid", "hotkey", "cached", "stale"}),
+            "cached_at": time.time(),
+            "computed_at_block": computed_at_block
+        }
+    
+    @staticmethod
+    def _body_from_cache(netuid: int, hotkey: str, data: dict, stale: bool = False) -> bytes:
+        """Encode the response to a cached payload with orjson, without building the response model."""
+        return orjson.dumps({
+            "netuid": netuid,
+            "hotkey": hotkey,
+            "dividend": float(data["dividend"]),
+            "cached": True,
+            "stake_tx_triggered": data["stake_tx_triggered"],
+            "block": data.get("block"),
+            "snapshot_age_seconds": data.get("snapshot_age_seconds"),
+            "stale": stale
+        })
+    
+    def _computed_at_block(self, snapshot: Optional[SubnetSnapshot], head: Optional[int]) -> Optional[int]:
+        """Block a fetched value was read at: the snapshot block, else the head seen before the fetch."""
+        return snapshot.block if snapshot else head
+    
+    @property
+    def _head(self) -> Optional[int]:
+        """Latest chain head seen by the block watcher, if any."""
+        return self._block_watcher.latest_block if self._block_watcher else None
+    
+    def _serve_cached(self, netuid: int, hotkey: str, data: dict) -> Optional[TaoDividendsResponse]:
+        """
+        Serve a cache hit as decided by _check_cached.
+        
+        Returns:
+            The response, or None if the entry is stale and there is no
+            refresher to revalidate it in the background
+        """
+        stale = self._check_cached(netuid, hotkey, data)
+        return None if stale is None else self._response_from_cache(netuid, hotkey, data, stale=stale)
+    
+    def _check_cached(self, netuid: int, hotkey: str, data: dict) -> Optional[bool]:
+        """
+        Decide how a cache hit is served according to its block or, failing that, the soft TTL.
+        
+        With a block watcher, entries read before their subnet's last epoch
+        are stale and all others are fresh. Entries whose block is unknown
+        go stale after CACHE_SOFT_TTL_SECONDS. Stale entries are returned
+        flagged as such while a background refresh runs. Hot entries (at
+        least CACHE_HOT_KEY_MIN_HITS reads in the window) without a known
+        block are refreshed once they pass CACHE_REFRESH_AHEAD_RATIO of the
+        soft TTL, before going stale.
+        
+        Returns:
+            Whether the entry is served stale, or None if it is stale and
+            there is no refresher to revalidate it in the background
+        """
+        cached_at = data.get("cached_at")
+        age = time.time() - cached_at if cached_at is not None else 0.0
+        outdated = (
+            self._block_watcher.is_outdated(netuid, data.get("computed_at_block"))
+            if self._block_watcher else None
+        )
+        is_stale = outdated if outdated is not None else age >= settings.CACHE_SOFT_TTL_SECONDS
+        
+        if not self._refresher:
+            return None if is_stale else False
+        
+        hits = self._refresher.record_access((netuid, hotkey))
+        is_due_ahead = (
+            outdated is None
+            and hits >= settings.CACHE_HOT_KEY_MIN_HITS
+            and age >= settings.CACHE_SOFT_TTL_SECONDS * settings.CACHE_REFRESH_AHEAD_RATIO
+        )
+        if is_stale or is_due_ahead:
+            self._schedule_refresh(netuid, hotkey)
+        return is_stale
+    
+    def _schedule_refresh(self, netuid: int, hotkey: str) -> None:
+        """Refresh an entry in the background with a client from the pool."""
+        async def refresh(client: BittensorClient) -> TaoDividendsResponse:
+            service = TaoDividendsService(
+                client,
+                self._cache,
+                self._snapshots,
+                self._single_flight,
+                block_watcher=self._block_watcher
+            )
+            return await self._single_flight.do(
+                (self.CACHE_PREFIX, netuid, hotkey),
+                lambda: service._refresh(netuid, hotkey)
+            )
+        
+        if self._refresher.schedule((netuid, hotkey), refresh):
+            hot_path_logger.debug("Scheduled background refresh for netuid={}, hotkey={}", netuid, hotkey)
+    
+    @staticmethod
+    def _response_from_chain(
+        netuid: int,
+        hotkey: str,
+        dividend: float,
+        snapshot: Optional[SubnetSnapshot]
+    ) -> TaoDividendsResponse:
+        """Build a response for a dividend just read from the chain."""
+        return TaoDividendsResponse(
+            netuid=netuid,
+            hotkey=hotkey,
+            dividend=dividend,
+            cached=False,
+            stake_tx_triggered=False,
+            block=snapshot.block if snapshot else None,
+            snapshot_age_seconds=snapshot.age if snapshot else None
+        )
     
     async def get_dividends(self, netuid: int, hotkey: str) -> TaoDividendsResponse:
         """
@@ -38,49 +297,237 @@ class TaoDividendsService:
         try:
             # Try to get from cache first
             try:
-                logger.info(f"Getting dividends from cache for netuid={netuid}, hotkey={hotkey}")
-                cached_value = await self._cache.get(self.CACHE_PREFIX, netuid, hotkey)
-                if cached_value:
-                    logger.info("Cache hit")
-                    # Parse cached JSON and return response
-                    data = json.loads(cached_value)
-                    return TaoDividendsResponse(
-                        netuid=data["netuid"],
-                        hotkey=data["hotkey"],
-                        dividend=data["dividend"],
-                        cached=True,
-                        stake_tx_triggered=data["stake_tx_triggered"]
-                    )
+                hot_path_logger.debug("Getting dividends from cache for netuid={}, hotkey={}", netuid, hotkey)
+                cached_value = await self._cache_get(netuid, hotkey)
+                response = self._serve_cached(netuid, hotkey, cached_value) if cached_value else None
+                if response:
+                    hot_path_logger.debug("Cache hit for netuid={}, hotkey={}", netuid, hotkey)
+                    return response
             except Exception as cache_error:
                 logger.error(f"Cache error: {cache_error}")
                 # Continue with blockchain query on cache error
             
-            # Get from blockchain
-            dividend = await self._client.get_tao_dividends(netuid, hotkey)
-            
-            # Create response
-            response = TaoDividendsResponse(
-                netuid=netuid,
-                hotkey=hotkey,
-                dividend=dividend,
-                cached=False,
-                stake_tx_triggered=False
+            # Get from blockchain, sharing the fetch with concurrent misses
+            return await self._single_flight.do(
+                (self.CACHE_PREFIX, netuid, hotkey),
+                lambda: self._refresh(netuid, hotkey)
             )
             
-            # Try to cache the response
+        except Exception as e:
+            logger.error(f"Failed to get Tao dividends: {e}")
+            raise
+    
+    async def get_dividends_body(self, netuid: int, hotkey: str) -> bytes:
+        """
+        Get the encoded JSON body of a Tao dividends response.
+        
+        Cache hits are encoded with orjson straight from the cached entry,
+        without building a response model. Misses are fetched and their
+        response model is encoded.
+        
+        Args:
+            netuid: The subnet ID
+            hotkey: The hotkey (account ID or public key)
+            
+        Returns:
+            The response body
+            
+        Raises:
+            Exception: If the blockchain query fails
+        """
+        try:
             try:
-                await self._cache.set(
-                    response.model_dump(),
-                    self.CACHE_PREFIX,
-                    netuid,
-                    hotkey
-                )
+                data = await self._cache_get(netuid, hotkey)
+                stale = self._check_cached(netuid, hotkey, data) if data else None
+                if stale is not None:
+                    return self._body_from_cache(netuid, hotkey, data, stale=stale)
             except Exception as cache_error:
-                logger.error(f"Failed to cache response: {cache_error}")
-                # Continue without caching
+                logger.error(f"Cache error: {cache_error}")
             
-            return response
+            response = await self._single_flight.do(
+                (self.CACHE_PREFIX, netuid, hotkey),
+                lambda: self._refresh(netuid, hotkey)
+            )
+            return encode_model(response)
             
         except Exception as e:
             logger.error(f"Failed to get Tao dividends: {e}")
-            raise 
\ No newline at end of file
+            raise
+    
+    async def _refresh(self, netuid: int, hotkey: str) -> TaoDividendsResponse:
+        """
+        Refresh a cache entry from the chain.
+        
+        With CACHE_LOCK_ENABLED, a Redis lock makes a single API worker
+        refresh the key; the others wait for its result to land in the
+        cache. An entry already cached when the wait started is served
+        flagged stale if no newer one lands in time, and the key is only
+        fetched again if there is none at all.
+        """
+        requested_at = time.time()
+        if not settings.CACHE_LOCK_ENABLED:
+            return await self._fetch_and_cache(netuid, hotkey)
+        
+        lock = self._cache.lock(self.LOCK_PREFIX, netuid, hotkey, timeout=settings.CACHE_LOCK_TIMEOUT_SECONDS)
+        try:
+            acquired = await lock.acquire(blocking=False)
+        except Exception as lock_error:
+            logger.error(f"Cache lock error: {lock_error}")
+            return await self._fetch_and_cache(netuid, hotkey)
+        
+        if acquired:
+            try:
+                return await self._fetch_and_cache(netuid, hotkey)
+            finally:
+                try:
+                    await lock.release()
+                except Exception as lock_error:
+                    logger.warning(f"Failed to release cache lock: {lock_error}")
+        
+        logger.debug(f"Waiting for another worker to refresh netuid={netuid}, hotkey={hotkey}")
+        stale_value = None
+        deadline = time.monotonic() + settings.CACHE_LOCK_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(settings.CACHE_LOCK_POLL_INTERVAL_SECONDS)
+            cached_value = await self._cache_get(netuid, hotkey)
+            if not cached_value:
+                continue
+            if self._is_refreshed(netuid, cached_value, requested_at):
+                return self._response_from_cache(netuid, hotkey, cached_value)
+            stale_value = cached_value
+        
+        logger.warning(f"Timed out waiting for refresh of netuid={netuid}, hotkey={hotkey}")
+        if stale_value:
+            return self._response_from_cache(netuid, hotkey, stale_value, stale=True)
+        return await self._fetch_and_cache(netuid, hotkey)
+    
+    def _is_refreshed(self, netuid: int, data: dict, requested_at: float) -> bool:
+        """
+        Whether a cached entry is the result of a refresh requested at requested_at.
+        
+        An entry read at or after its subnet's last epoch is current. Otherwise
+        it counts only if it was written after the refresh was requested, so the
+        entry that caused the refresh is not taken for its result.
+        """
+        if self._block_watcher and self._block_watcher.is_outdated(netuid, data.get("computed_at_block")) is False:
+            return True
+        return data.get("cached_at", requested_at) >= requested_at
+    
+    async def _fetch_and_cache(self, netuid: int, hotkey: str) -> TaoDividendsResponse:
+        """Fetch a dividend from the chain and cache the response."""
+        head = self._head
+        dividends, snapshot = await self.fetch_dividends(netuid, [hotkey])
+        
+        # Create response
+        response = self._response_from_chain(netuid, hotkey, dividends[hotkey], snapshot)
+        
+        # Try to cache the response
+        try:
+            await self._cache_set(netuid, hotkey, self._cache_payload(response, self._computed_at_block(snapshot, head)))
+        except Exception as cache_error:
+            logger.error(f"Failed to cache response: {cache_error}")
+            # Continue without caching
+        
+        return response
+    
+    @classmethod
+    def subnet_hash_fields(cls, snapshot: SubnetSnapshot) -> Dict[str, Any]:
+        """
+        Build the fields of a subnet's hash in the hash CACHE_LAYOUT.
+        
+        Each hotkey maps to its cached entry, and BLOCK_FIELD and
+        CACHED_AT_FIELD record when the subnet was read. Hashes that only
+        hold hotkeys written one by one lack them, which tells readers of
+        the whole subnet that the hash is incomplete.
+        """
+        fields: Dict[str, Any] = {
+            hotkey: cls._cache_payload(
+                cls._response_from_chain(snapshot.netuid, hotkey, dividend, snapshot),
+                snapshot.block
+            )
+            for hotkey, dividend in snapshot.dividends.items()
+        }
+        fields[cls.BLOCK_FIELD] = snapshot.block
+        fields[cls.CACHED_AT_FIELD] = time.time()
+        return fields
+    
+    async def prime_subnet(self, snapshot: SubnetSnapshot) -> int:
+        """
+        Cache the dividend of every hotkey in a subnet snapshot.
+        
+        Used by the prefetch task so API requests are answered from the cache.
+        With the hash layout the subnet's hash, which also serves the subnet
+        dividends endpoint, is replaced as a whole.
+        
+        Args:
+            snapshot: The subnet read from the chain
+            
+        Returns:
+            Number of entries written
+        """
+        if settings.CACHE_LAYOUT == "hash":
+            await self._cache.replace_hash(self.CACHE_PREFIX, (snapshot.netuid,), self.subnet_hash_fields(snapshot))
+            return len(snapshot.dividends)
+        
+        entries = {
+            (snapshot.netuid, hotkey): self._cache_payload(
+                self._response_from_chain(snapshot.netuid, hotkey, dividend, snapshot),
+                snapshot.block
+            )
+            for hotkey, dividend in snapshot.dividends.items()
+        }
+        await self._cache.set_many(self.CACHE_PREFIX, entries)
+        return len(entries)
+    
+    async def get_dividends_batch(self, pairs: List[Tuple[int, str]]) -> List[TaoDividendsResponse]:
+        """
+        Get Tao dividends for many (netuid, hotkey) pairs.
+        
+        Cache hits are resolved with a single MGET. Misses are grouped by
+        subnet so each subnet is read from the chain at most once, and the
+        fresh results are written back in one pipeline.
+        
+        Args:
+            pairs: The (netuid, hotkey) pairs to look up
+            
+        Returns:
+            One TaoDividendsResponse per pair, in request order
+            
+        Raises:
+            Exception: If a blockchain query fails
+        """
+        unique_pairs = list(dict.fromkeys(pairs))
+        responses: Dict[Tuple[int, str], TaoDividendsResponse] = {}
+        
+        try:
+            cached_values = await self._cache_get_many(unique_pairs)
+            misses_by_netuid: Dict[int, List[str]] = {}
+            for pair, cached_value in zip(unique_pairs, cached_values):
+                response = self._serve_cached(pair[0], pair[1], cached_value) if cached_value else None
+                if response:
+                    responses[pair] = response
+                else:
+                    misses_by_netuid.setdefault(pair[0], []).append(pair[1])
+            
+            logger.info(
+                f"Batch of {len(unique_pairs)} dividends: {len(responses)} cache hits, "
+                f"misses across {len(misses_by_netuid)} subnets"
+            )
+            
+            fresh: Dict[Tuple[int, str], dict] = {}
+            for netuid, hotkeys in misses_by_netuid.items():
+                head = self._head
+                dividends, snapshot = await self.fetch_dividends(netuid, hotkeys)
+                computed_at_block = self._computed_at_block(snapshot, head)
+                for hotkey in hotkeys:
+                    response = self._response_from_chain(netuid, hotkey, dividends[hotkey], snapshot)
+                    responses[(netuid, hotkey)] = response
+                    fresh[(netuid, hotkey)] = self._cache_payload(response, computed_at_block)
+            
+            await self._cache_set_many(fresh)
+            
+            return [responses[pair] for pair in pairs]
+            
+        except Exception as e:
+            logger.error(f"Failed to get Tao dividends batch: {e}")
+            raise
\ No newline at end of file
@@ -1,7 +1,22 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Dict, Optional, TypeVar
+import httpx
 from celery import Celery
+from celery.signals import task_postrun, task_prerun, worker_init, worker_process_init, worker_process_shutdown
+from loguru import logger
+from prometheus_client import start_http_server
 
 from app.core.config import settings
 from app.core.logging import configure_logging
+from app.core.metrics import CELERY_TASK_SECONDS, mark_process_dead, metrics_registry
+from app.services.bittensor_client import BittensorClient
+from app.services.bittensor_pool import BittensorClientPool
+from app.services.chain_executor import ChainExecutor
+
+T = TypeVar("T")
 
 # Configure logging
 configure_logging()
@@ -11,7 +26,7 @@ celery = Celery(
     "worker",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
-    include=[],  # Add task modules here as they're created
+    include=["app.tasks.dividend_history", "app.tasks.prefetch", "app.tasks.stake"],  # Add task modules here as they're created
 )
 
 # Set up Celery configuration
@@ -21,12 +36,143 @@ celery.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
-    worker_concurrency=2,
+    worker_concurrency=settings.CELERY_WORKER_CONCURRENCY,
+    worker_prefetch_multiplier=settings.CELERY_WORKER_PREFETCH_MULTIPLIER,
     task_acks_late=True,
     task_reject_on_worker_lost=True,
     task_track_started=True,
+    task_routes={"submit_stake_batch": {"queue": settings.STAKE_SUBMIT_QUEUE}},
+    beat_schedule={
+        "prefetch-network-dividends": {
+            "task": "prefetch_network_dividends",
+            "schedule": settings.PREFETCH_INTERVAL_SECONDS,
+            # A run that could not start before the next one is skipped
+            "options": {"expires": settings.PREFETCH_INTERVAL_SECONDS},
+        },
+        "ingest-dividend-history": {
+            "task": "ingest_dividend_history",
+            "schedule": settings.DIVIDEND_HISTORY_INTERVAL_SECONDS,
+            "options": {"expires": settings.DIVIDEND_HISTORY_INTERVAL_SECONDS},
+        },
+    },
 )
 
+# Per worker process state: one event loop, one long-lived chain connection
+# and one HTTP connection pool reused by every task the process runs
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_executor: Optional[ChainExecutor] = None
+_worker_pool: Optional[BittensorClientPool] = None
+_worker_http: Optional[httpx.AsyncClient] = None
+# Start times of the tasks running in this process, by task id
+_task_started_at: Dict[str, float] = {}
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """Run a coroutine on this worker process's event loop."""
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+    return _worker_loop.run_until_complete(coro)
+
+
+async def _start_worker_pool() -> BittensorClientPool:
+    """Create and connect the worker's client pool if it is not running yet."""
+    global _worker_executor, _worker_pool
+    if _worker_pool is None:
+        _worker_executor = _worker_executor or ChainExecutor()
+        pool = BittensorClientPool(size=1, executor=_worker_executor)
+        await pool.start()
+        _worker_pool = pool
+    return _worker_pool
+
+
+@asynccontextmanager
+async def worker_client() -> AsyncIterator[BittensorClient]:
+    """
+    Use the worker process's persistent Bittensor client.
+    
+    The client is connected once per process and health checked on reuse;
+    a dead connection is re-established before it is handed out.
+    
+    Yields:
+        A connected BittensorClient
+    """
+    pool = await _start_worker_pool()
+    async with pool.acquire() as client:
+        yield client
+
+
+def worker_http_client() -> httpx.AsyncClient:
+    """
+    Get the worker process's pooled HTTP client for external APIs.
+    
+    Connections are kept alive across tasks; the client is created on first
+    use and must only be used from the process's event loop.
+    """
+    global _worker_http
+    if _worker_http is None:
+        _worker_http = httpx.AsyncClient(
+            timeout=settings.SENTIMENT_HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.SENTIMENT_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SENTIMENT_HTTP_MAX_CONNECTIONS,
+            ),
+        )
+    return _worker_http
+
+
+@worker_init.connect
+def start_metrics_server(**kwargs) -> None:
+    """Serve the worker's Prometheus metrics on CELERY_METRICS_PORT when configured."""
+    if settings.CELERY_METRICS_PORT:
+        # Prefork children are only visible with PROMETHEUS_MULTIPROC_DIR set
+        start_http_server(settings.CELERY_METRICS_PORT, registry=metrics_registry())
+        logger.info(f"Serving Celery metrics on port {settings.CELERY_METRICS_PORT}")
+
+
+@task_prerun.connect
+def record_task_start(task_id: str, **kwargs) -> None:
+    """Remember when a task started running."""
+    _task_started_at[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def record_task_duration(task_id: str, task, state: Optional[str] = None, **kwargs) -> None:
+    """Observe how long a task ran, labelled with its final state."""
+    started_at = _task_started_at.pop(task_id, None)
+    if started_at is not None:
+        CELERY_TASK_SECONDS.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started_at)
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs) -> None:
+    """Connect the worker process's Bittensor client before it takes tasks."""
+    try:
+        run_async(_start_worker_pool())
+        logger.info("Connected worker Bittensor client")
+    except Exception as e:
+        # The pool reconnects on first checkout
+        logger.error(f"Failed to connect worker Bittensor client: {e}")
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs) -> None:
+    """Close the worker process's Bittensor client, HTTP client and event loop."""
+    global _worker_loop, _worker_executor, _worker_pool, _worker_http
+    if _worker_http is not None:
+        run_async(_worker_http.aclose())
+        _worker_http = None
+    if _worker_pool is not None:
+        run_async(_worker_pool.close())
+        _worker_pool = None
+    if _worker_executor is not None:
+        _worker_executor.shutdown()
+        _worker_executor = None
+    if _worker_loop is not None:
+        _worker_loop.close()
+        _worker_loop = None
+    mark_process_dead(os.getpid())
+
 
 @celery.task(name="test_celery")
 def test_celery() -> str:
@@ -0,0 +1,35 @@
+import asyncpg
+from loguru import logger
+from app.services.dividend_history import DividendHistoryWriter, asyncpg_dsn
+from app.tasks.celery_worker import celery, run_async, worker_client
+
+
+async def ingest_network_dividends() -> int:
+    """
+    Record the dividends of every subnet at the current chain head.
+    
+    Subnets are read page by page and each page is written with COPY as it
+    arrives, so memory stays flat regardless of network size.
+    
+    Returns:
+        Number of new history rows
+    """
+    connection = await asyncpg.connect(asyncpg_dsn())
+    try:
+        writer = DividendHistoryWriter(connection)
+        
+        written = 0
+        async with worker_client() as client:
+            async for block, netuid, page in client.iter_network_dividends():
+                written += await writer.write(block, netuid, page)
+        
+        logger.info(f"Ingested {written} dividend history rows")
+        return written
+    finally:
+        await connection.close()
+
+
+@celery.task(name="ingest_dividend_history")
+def ingest_dividend_history() -> int:
+    """Celery task recording every subnet's dividends at the current block."""
+    return run_async(ingest_network_dividends())
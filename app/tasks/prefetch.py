@@ -0,0 +1,93 @@
+import json
+import time
+from typing import Any, Dict, List, Tuple
+from celery import chord
+from redis import Redis as SyncRedis
+from redis.asyncio import Redis
+from loguru import logger
+from app.services.redis_cache import RedisCache
+from app.services.subnet_dividends import SubnetDividendsService
+from app.services.subnet_snapshot import SubnetSnapshot
+from app.services.tao_dividends import TaoDividendsService
+from app.tasks.celery_worker import celery, run_async, worker_client
+from app.core.config import settings
+
+
+async def list_subnets() -> Tuple[int, List[int]]:
+    """Get the chain head and every registered subnet."""
+    async with worker_client() as client:
+        return await client.get_subnet_netuids()
+
+
+async def prefetch_subnet_dividends(netuid: int) -> Dict[str, Any]:
+    """
+    Read a subnet from the chain and write it into the API caches.
+    
+    Every hotkey entry is written in one pipeline, followed by the subnet
+    blob served by the subnet dividends endpoint. With the hash layout both
+    endpoints share one subnet hash, which is written once. Entries carry
+    the block they were read at.
+    
+    Returns:
+        Dict with the netuid, block and number of hotkeys written
+    """
+    redis = Redis.from_url(str(settings.REDIS_URI))
+    try:
+        async with worker_client() as client:
+            block, dividends = await client.get_subnet_dividends(netuid)
+            cache = RedisCache(redis)
+            snapshot = SubnetSnapshot(netuid=netuid, block=block, dividends=dividends)
+            await TaoDividendsService(client, cache).prime_subnet(snapshot)
+            if settings.CACHE_LAYOUT != "hash":
+                await SubnetDividendsService(client, cache).prime(netuid, block, dividends)
+        return {"netuid": netuid, "block": block, "hotkeys": len(dividends)}
+    finally:
+        await redis.aclose()
+
+
+@celery.task(name="prefetch_network_dividends")
+def prefetch_network_dividends() -> int:
+    """
+    Fan out one prefetch task per subnet, then record the run.
+    
+    Scheduled by beat every PREFETCH_INTERVAL_SECONDS.
+    
+    Returns:
+        Number of subnets dispatched
+    """
+    block, netuids = run_async(list_subnets())
+    chord(prefetch_subnet.s(netuid) for netuid in netuids)(record_prefetch.s(block))
+    logger.info(f"Dispatched dividend prefetch of {len(netuids)} subnets at block {block}")
+    return len(netuids)
+
+
+@celery.task(name="prefetch_subnet")
+def prefetch_subnet(netuid: int) -> Dict[str, Any]:
+    """
+    Prefetch one subnet into the caches.
+    
+    Failures are returned rather than raised so one bad subnet does not
+    stop the run from being recorded.
+    """
+    try:
+        return run_async(prefetch_subnet_dividends(netuid))
+    except Exception as e:
+        logger.error(f"Failed to prefetch dividends for netuid={netuid}: {e}")
+        return {"netuid": netuid, "error": str(e)}
+
+
+@celery.task(name="record_prefetch")
+def record_prefetch(results: List[Dict[str, Any]], block: int) -> Dict[str, Any]:
+    """Store a summary of a finished prefetch run under PREFETCH_STATUS_KEY."""
+    succeeded = [result for result in results if "error" not in result]
+    summary = {
+        "block": block,
+        "subnets": len(succeeded),
+        "failed": [result["netuid"] for result in results if "error" in result],
+        "hotkeys": sum(result["hotkeys"] for result in succeeded),
+        "finished_at": time.time(),
+    }
+    with SyncRedis.from_url(str(settings.REDIS_URI)) as redis:
+        redis.set(settings.PREFETCH_STATUS_KEY, json.dumps(summary))
+    logger.info(f"Prefetched {summary['hotkeys']} dividends across {summary['subnets']} subnets at block {block}")
+    return summary
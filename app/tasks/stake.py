@@ -0,0 +1,115 @@
+from typing import Any, Dict
+from redis.asyncio import Redis
+from loguru import logger
+from app.services.bittensor_client import ExtrinsicNotSubmittedError
+from app.services.sentiment import ChutesSentimentScorer, DaturaTweetSource
+from app.services.stake_pipeline import StakeJobQueue, StakePipeline, StakeSubmissionQueue
+from app.tasks.celery_worker import celery, run_async, worker_client, worker_http_client
+from app.core.config import settings
+
+
+def schedule_stake_pipeline(netuid: int, countdown: float) -> None:
+    """Schedule the stake pipeline batch of a subnet to run after countdown seconds."""
+    run_stake_pipeline.apply_async(args=[netuid], countdown=countdown)
+
+
+def schedule_stake_submission(netuid: int, task_id: str, countdown: float) -> None:
+    """Schedule the net stake submission of a subnet under task_id to run after countdown seconds."""
+    submit_stake_batch.apply_async(args=[netuid], task_id=task_id, countdown=countdown)
+
+
+async def run_subnet_stake_pipeline(netuid: int) -> Dict[str, Any]:
+    """
+    Take the pending stake jobs of a subnet and run them as one batch.
+
+    The resulting stake changes are added to the subnet's coalesced
+    submission rather than submitted directly.
+
+    Returns:
+        The pipeline result of the batch
+    """
+    redis = Redis.from_url(str(settings.REDIS_URI))
+    try:
+        hotkeys = await StakeJobQueue(redis, schedule_stake_pipeline).take(netuid)
+        http = worker_http_client()
+        submissions = StakeSubmissionQueue(redis, schedule_stake_submission)
+        pipeline = StakePipeline(DaturaTweetSource(http), ChutesSentimentScorer(http), submissions)
+        return await pipeline.run(netuid, hotkeys)
+    finally:
+        await redis.aclose()
+
+
+async def submit_subnet_stake(netuid: int) -> Dict[str, Any]:
+    """
+    Take the net stake changes of a subnet and submit them as one extrinsic.
+
+    The extrinsic is not waited on; the client's tracked nonce lets the
+    next submission follow before this one is included. Changes that fail
+    before the extrinsic is handed to the node are returned to the queue
+    with backoff, up to STAKE_SUBMIT_MAX_RETRIES times. Changes whose
+    extrinsic may already be broadcast, like on a timeout after submission,
+    are never re-queued, since submitting them again could stake twice.
+    Invalid amounts or a missing wallet fail on every attempt and are
+    dropped.
+
+    Returns:
+        Dict with the netuid, the net TAO amount per hotkey and the extrinsic
+        hash (None when every change cancelled out)
+    """
+    redis = Redis.from_url(str(settings.REDIS_URI))
+    try:
+        submissions = StakeSubmissionQueue(redis, schedule_stake_submission)
+        amounts = await submissions.take(netuid)
+        result: Dict[str, Any] = {"netuid": netuid, "amounts": amounts, "extrinsic_hash": None}
+        if not amounts:
+            logger.info(f"Stake changes for netuid={netuid} cancelled out, nothing to submit")
+            return result
+
+        submitting = False
+        try:
+            async with worker_client() as client:
+                submitting = True
+                result["extrinsic_hash"] = await client.submit_stake(netuid, amounts)
+        except ValueError as e:
+            logger.error(f"Dropping stake changes for netuid={netuid}: {e}")
+            raise
+        except Exception as e:
+            if submitting and not isinstance(e, ExtrinsicNotSubmittedError):
+                logger.error(f"Stake extrinsic for netuid={netuid} may have been broadcast, not retrying: {e}")
+            else:
+                await submissions.retry(netuid, amounts)
+            raise
+        await submissions.clear_retries(netuid)
+        return result
+    finally:
+        await redis.aclose()
+
+
+@celery.task(name="run_stake_pipeline")
+def run_stake_pipeline(netuid: int) -> Dict[str, Any]:
+    """
+    Run the debounced sentiment and stake batch of a subnet.
+
+    Scheduled by StakeJobQueue when the first job of a window is queued.
+    """
+    try:
+        return run_async(run_subnet_stake_pipeline(netuid))
+    except Exception as e:
+        logger.error(f"Stake pipeline failed for netuid={netuid}: {e}")
+        raise
+
+
+@celery.task(name="submit_stake_batch")
+def submit_stake_batch(netuid: int) -> Dict[str, Any]:
+    """
+    Submit the stake changes of a subnet netted over one window.
+
+    Scheduled by StakeSubmissionQueue under the id it hands out, so the
+    extrinsic hash can be read from this task's result. Routed to
+    STAKE_SUBMIT_QUEUE.
+    """
+    try:
+        return run_async(submit_subnet_stake(netuid))
+    except Exception as e:
+        logger.error(f"Stake submission failed for netuid={netuid}: {e}")
+        raise
@@ -0,0 +1,155 @@
+"""
+Microbenchmarks of the request hot path, run with pytest-benchmark:
+
+    pytest benchmarks/bench_micro.py --benchmark-autosave
+    pytest benchmarks/bench_micro.py --benchmark-compare --benchmark-compare-fail=mean:10%
+
+Coroutines are run to completion on a private event loop per call, so
+their timings include one loop iteration.
+"""
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import MagicMock, patch
+import httpx
+import pytest
+from loguru import logger
+from benchmarks.fake_substrate import FakeChain, FakeSubstrateServer
+from app.main import app
+from app.core.config import settings
+from app.core.dependencies import get_stake_job_queue, get_tao_dividends_service
+from app.core.logging import TEXT_FORMAT, JsonSink, SamplingFilter
+from app.services.bittensor_client import BittensorClient
+from app.services.cache_serializer import SERIALIZERS, loads
+from app.services.local_cache import LocalCache
+from app.services.redis_cache import RedisCache
+from app.services.tao_dividends import TaoDividendsService
+
+HOTKEY = FakeChain.hotkey(1, 0)
+CACHED_VALUE = {
+    "dividend": 123456789.0,
+    "stake_tx_triggered": False,
+    "block": 4_000_000,
+    "snapshot_age_seconds": None,
+    "cached_at": time.time(),
+    "computed_at_block": 4_000_000,
+}
+
+
+@pytest.mark.parametrize("name", sorted(SERIALIZERS))
+def bench_cache_serializer_dumps(benchmark, name: str):
+    benchmark.extra_info["bytes"] = len(SERIALIZERS[name].dumps(CACHED_VALUE))
+
+    benchmark(SERIALIZERS[name].dumps, CACHED_VALUE)
+
+
+@pytest.mark.parametrize("name", sorted(SERIALIZERS))
+def bench_cache_serializer_loads(benchmark, name: str):
+    encoded = SERIALIZERS[name].dumps(CACHED_VALUE)
+
+    assert benchmark(loads, encoded) == CACHED_VALUE
+
+
+def bench_local_cache_get(benchmark):
+    local_cache = LocalCache(max_size=10_000, ttl=60)
+    local_cache.set(f"tao_dividends:1:{HOTKEY}", CACHED_VALUE)
+
+    assert benchmark(local_cache.get, f"tao_dividends:1:{HOTKEY}") == CACHED_VALUE
+
+
+def bench_redis_cache_l1_hit(benchmark, loop: asyncio.AbstractEventLoop):
+    local_cache = LocalCache(max_size=10_000, ttl=60)
+    cache = RedisCache(MagicMock(), local_cache=local_cache)
+    local_cache.set(f"tao_dividends:1:{HOTKEY}", CACHED_VALUE)
+
+    result = benchmark(lambda: loop.run_until_complete(cache.get("tao_dividends", 1, HOTKEY)))
+
+    assert result == CACHED_VALUE
+
+
+def bench_response_from_cache(benchmark):
+    response = benchmark(TaoDividendsService._response_from_cache, 1, HOTKEY, CACHED_VALUE)
+
+    assert response.cached is True
+
+
+def bench_serve_cached(benchmark):
+    service = TaoDividendsService(MagicMock(), MagicMock())
+
+    response = benchmark(service._serve_cached, 1, HOTKEY, CACHED_VALUE)
+
+    assert response is not None
+
+
+@pytest.mark.parametrize("fast", [False, True], ids=["model", "orjson"])
+def bench_tao_dividends_endpoint_hit(benchmark, loop: asyncio.AbstractEventLoop, fast: bool):
+    local_cache = LocalCache(max_size=10_000, ttl=60)
+    local_cache.set(f"tao_dividends:1:{HOTKEY}", CACHED_VALUE)
+    service = TaoDividendsService(MagicMock(), RedisCache(MagicMock(), local_cache=local_cache))
+    app.dependency_overrides[get_tao_dividends_service] = lambda: service
+    app.dependency_overrides[get_stake_job_queue] = lambda: None
+    http = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://bench",
+        headers={"Authorization": f"Bearer {settings.API_TOKEN}"},
+    )
+    params = {"netuid": 1, "hotkey": HOTKEY}
+    try:
+        with patch.object(settings, "FAST_RESPONSES_ENABLED", fast):
+            response = benchmark(lambda: loop.run_until_complete(http.get("/api/v1/tao_dividends", params=params)))
+    finally:
+        loop.run_until_complete(http.aclose())
+        app.dependency_overrides.pop(get_tao_dividends_service, None)
+        app.dependency_overrides.pop(get_stake_job_queue, None)
+    
+    assert response.status_code == 200
+    assert response.json()["dividend"] == CACHED_VALUE["dividend"]
+
+
+@pytest.mark.parametrize("sink", ["off", "text_sync", "json_enqueued", "json_enqueued_sampled"])
+def bench_get_dividends_logging(benchmark, loop: asyncio.AbstractEventLoop, sink: str):
+    local_cache = LocalCache(max_size=10_000, ttl=60)
+    local_cache.set(f"tao_dividends:1:{HOTKEY}", CACHED_VALUE)
+    service = TaoDividendsService(MagicMock(), RedisCache(MagicMock(), local_cache=local_cache))
+    devnull = open(os.devnull, "w")
+    logger.remove()
+    if sink == "text_sync":
+        logger.add(devnull, level="DEBUG", format=TEXT_FORMAT)
+    elif sink == "json_enqueued":
+        logger.add(JsonSink(devnull), level="DEBUG", format="{message}", enqueue=True)
+    elif sink == "json_enqueued_sampled":
+        logger.add(
+            JsonSink(devnull), level="DEBUG", format="{message}", enqueue=True,
+            filter=SamplingFilter(settings.LOG_SAMPLE_RATES),
+        )
+    try:
+        response = benchmark(lambda: loop.run_until_complete(service.get_dividends(1, HOTKEY)))
+    finally:
+        logger.remove()
+        logger.add(sys.stderr)
+        devnull.close()
+    
+    assert response.cached is True
+
+
+def bench_get_tao_dividends(benchmark, fake_substrate: FakeSubstrateServer, loop: asyncio.AbstractEventLoop):
+    client = BittensorClient(network="test")
+    loop.run_until_complete(client.connect())
+    try:
+        dividend = benchmark(lambda: loop.run_until_complete(client.get_tao_dividends(1, HOTKEY)))
+    finally:
+        loop.run_until_complete(client.close())
+
+    assert dividend == fake_substrate.chain.dividends(1)[HOTKEY]
+
+
+def bench_get_subnet_dividends(benchmark, fake_substrate: FakeSubstrateServer, loop: asyncio.AbstractEventLoop):
+    client = BittensorClient(network="test")
+    loop.run_until_complete(client.connect())
+    try:
+        _, dividends = benchmark(lambda: loop.run_until_complete(client.get_subnet_dividends(1)))
+    finally:
+        loop.run_until_complete(client.close())
+
+    assert len(dividends) == fake_substrate.chain.hotkeys_per_subnet
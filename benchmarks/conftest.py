@@ -0,0 +1,29 @@
+import asyncio
+from typing import Iterator
+from unittest.mock import patch
+import pytest
+from benchmarks.fake_substrate import FakeChain, FakeSubstrateInterface, FakeSubstrateServer
+from app.core.config import settings
+
+
+@pytest.fixture(scope="session")
+def fake_node() -> Iterator[FakeSubstrateServer]:
+    """Fake substrate node serving 4 subnets of 1024 hotkeys without added latency."""
+    with FakeSubstrateServer(FakeChain(subnets=4, hotkeys_per_subnet=1024)) as node:
+        yield node
+
+
+@pytest.fixture
+def fake_substrate(fake_node: FakeSubstrateServer) -> Iterator[FakeSubstrateServer]:
+    """Point BittensorClient's test network at the fake node."""
+    with patch("app.services.bittensor_client.SubstrateInterface", FakeSubstrateInterface), \
+            patch.object(settings, "bittensor_test_endpoint", fake_node.url):
+        yield fake_node
+
+
+@pytest.fixture
+def loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """Event loop the benchmarked coroutines are run on."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
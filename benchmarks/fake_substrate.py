@@ -0,0 +1,337 @@
+"""
+Local stand-in for a Subtensor node, used by the benchmarks.
+
+A real node can only be read through SubstrateInterface after decoding its
+SCALE-encoded runtime metadata. The stand-in skips that step. It serves
+values that are already decoded over a JSON-RPC websocket, and
+FakeSubstrateInterface speaks that protocol with the subset of the
+SubstrateInterface API that BittensorClient uses. Every read is a real
+websocket round trip with a configurable delay, and every map is paged,
+so connection handling, executor queueing, paging and decoding all cost
+about what they cost against a node.
+
+Run it standalone with `python -m benchmarks.fake_substrate --port 9944`.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import random
+import threading
+import time
+from websockets.asyncio.server import ServerConnection, serve
+from websockets.sync.client import connect
+
+DEFAULT_PAGE_SIZE = 100
+
+
+class FakeChain:
+    """Deterministic synthetic chain state: subnets, hotkeys, dividends and epochs."""
+
+    def __init__(
+        self,
+        subnets: int = 8,
+        hotkeys_per_subnet: int = 256,
+        block_time: float = 12.0,
+        tempo: int = 360,
+        start_block: int = 4_000_000,
+        seed: int = 0,
+    ):
+        """
+        Initialize the chain.
+
+        Args:
+            subnets: Number of registered subnets, with netuids 1 to subnets
+            hotkeys_per_subnet: Entries in each subnet's TaoDividendsPerSubnet map
+            block_time: Seconds between blocks
+            tempo: Blocks between two epochs of a subnet
+            start_block: Block number when the chain is created
+            seed: Seed of the synthetic dividends
+        """
+        self.netuids = list(range(1, subnets + 1))
+        self.hotkeys_per_subnet = hotkeys_per_subnet
+        self._block_time = block_time
+        self._tempo = tempo
+        self._start_block = start_block
+        self._started_at = time.monotonic()
+        self._seed = seed
+        self._dividends: Dict[int, Dict[str, int]] = {}
+
+    @staticmethod
+    def hotkey(netuid: int, index: int) -> str:
+        """Synthetic 48 character hotkey of a subnet's index-th neuron."""
+        return "5" + hashlib.sha256(f"{netuid}:{index}".encode()).hexdigest()[:47]
+
+    @property
+    def block(self) -> int:
+        """Current chain head."""
+        return self._start_block + int((time.monotonic() - self._started_at) / self._block_time)
+
+    def dividends(self, netuid: int) -> Dict[str, int]:
+        """TaoDividendsPerSubnet map of a subnet, empty for unknown subnets."""
+        if netuid not in self.netuids:
+            return {}
+        if netuid not in self._dividends:
+            rng = random.Random(self._seed * 1_000_003 + netuid)
+            self._dividends[netuid] = {
+                self.hotkey(netuid, index): rng.randrange(0, 10**12)
+                for index in range(self.hotkeys_per_subnet)
+            }
+        return self._dividends[netuid]
+
+    def epoch_block(self, netuid: int, block: int) -> int:
+        """Block at which a subnet last ran its epoch, staggered by netuid."""
+        return block - (block + netuid) % self._tempo
+
+    def storage(self, storage_function: str, params: Sequence[Any]) -> Any:
+        """Read one storage entry, None if it does not exist."""
+        if storage_function == "Events":
+            return []
+        if storage_function == "TaoDividendsPerSubnet":
+            return self.dividends(int(params[0])).get(params[1])
+        raise ValueError(f"Unsupported storage function: {storage_function}")
+
+    def storage_map(self, storage_function: str, params: Sequence[Any], block: int) -> List[Tuple[Any, Any]]:
+        """Read every entry of a storage map, ordered by key."""
+        if storage_function == "TaoDividendsPerSubnet":
+            return sorted(self.dividends(int(params[0])).items())
+        if storage_function == "NetworksAdded":
+            return [(netuid, True) for netuid in self.netuids]
+        if storage_function == "LastMechansimStepBlock":
+            return [(netuid, self.epoch_block(netuid, block)) for netuid in self.netuids]
+        raise ValueError(f"Unsupported storage function: {storage_function}")
+
+
+def block_hash(block: int) -> str:
+    """Hash of a block; the stand-in encodes the number in it."""
+    return f"0x{block:064x}"
+
+
+class FakeSubstrateServer:
+    """JSON-RPC websocket server answering reads of a FakeChain."""
+
+    def __init__(self, chain: FakeChain, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        """
+        Initialize the server.
+
+        Args:
+            chain: The chain state served
+            host: Interface to listen on
+            port: Port to listen on, 0 to pick a free one
+            latency: Seconds every request is delayed by before it is answered
+        """
+        self.chain = chain
+        self._host = host
+        self._port = port
+        self._latency = latency
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped: Optional[asyncio.Event] = None
+
+    @property
+    def url(self) -> str:
+        """Websocket URL clients connect to."""
+        return f"ws://{self._host}:{self._port}"
+
+    def _dispatch(self, method: str, params: List[Any]) -> Any:
+        """Answer one JSON-RPC call."""
+        if method == "system_health":
+            return {"peers": 1, "isSyncing": False, "shouldHavePeers": True}
+        if method == "chain_getHead":
+            return block_hash(self.chain.block)
+        if method == "chain_getHeader":
+            return {"number": hex(int(params[0], 16))}
+        if method == "fake_getStorage":
+            storage_function, storage_params = params
+            return self.chain.storage(storage_function, storage_params)
+        if method == "fake_getStorageMulti":
+            return [self.chain.storage(storage_function, storage_params) for storage_function, storage_params in params]
+        if method == "fake_getMapPage":
+            storage_function, storage_params, at, count, start_key = params
+            entries = self.chain.storage_map(storage_function, storage_params, int(at, 16))
+            start = 0
+            if start_key is not None:
+                start = next((index + 1 for index, (key, _) in enumerate(entries) if key == start_key), len(entries))
+            return entries[start:start + count]
+        raise ValueError(f"Method not found: {method}")
+
+    async def _handle(self, connection: ServerConnection) -> None:
+        """Answer the requests of one connection in order, like a node does."""
+        async for message in connection:
+            request = json.loads(message)
+            if self._latency:
+                await asyncio.sleep(self._latency)
+            try:
+                response = {"jsonrpc": "2.0", "id": request["id"], "result": self._dispatch(request["method"], request["params"])}
+            except Exception as e:
+                response = {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32601, "message": str(e)}}
+            await connection.send(json.dumps(response))
+
+    async def serve_forever(self, ready: Optional[threading.Event] = None) -> None:
+        """Serve until stop() is called."""
+        self._stopped = asyncio.Event()
+        async with serve(self._handle, self._host, self._port, max_size=None) as server:
+            self._port = server.sockets[0].getsockname()[1]
+            if ready:
+                ready.set()
+            await self._stopped.wait()
+
+    def start(self) -> "FakeSubstrateServer":
+        """Serve from a background thread, returning once the port is open."""
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_until_complete,
+            args=(self.serve_forever(ready),),
+            name="fake-substrate",
+            daemon=True,
+        )
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        """Stop a server started with start()."""
+        if self._loop and self._stopped:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "FakeSubstrateServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+class FakeScaleValue:
+    """Decoded storage value, exposed as .value like a SCALE object."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+class FakeQueryMapResult:
+    """Storage map entries, loaded one page per round trip as they are iterated."""
+
+    def __init__(
+        self,
+        substrate: "FakeSubstrateInterface",
+        storage_function: str,
+        params: List[Any],
+        at: str,
+        page_size: int,
+        max_results: Optional[int],
+        start_key: Optional[Any],
+    ):
+        self._substrate = substrate
+        self._storage_function = storage_function
+        self._params = params
+        self._at = at
+        self._page_size = page_size
+        self._max_results = max_results
+        self.last_key = start_key
+
+    def __iter__(self) -> Iterator[Tuple[Any, FakeScaleValue]]:
+        returned = 0
+        while self._max_results is None or returned < self._max_results:
+            count = self._page_size
+            if self._max_results is not None:
+                count = min(count, self._max_results - returned)
+            page = self._substrate.rpc_request(
+                "fake_getMapPage",
+                [self._storage_function, self._params, self._at, count, self.last_key]
+            )["result"]
+            for key, value in page:
+                self.last_key = key
+                returned += 1
+                yield key, FakeScaleValue(value)
+            if len(page) < count:
+                return
+
+
+class FakeSubstrateInterface:
+    """Client of FakeSubstrateServer with the SubstrateInterface methods BittensorClient uses."""
+
+    def __init__(self, url: str, ss58_format: Optional[int] = None, **kwargs: Any):
+        self.url = url
+        self.ss58_format = ss58_format
+        self._ids = itertools.count()
+        self._websocket = connect(url, max_size=None)
+
+    def rpc_request(self, method: str, params: List[Any]) -> Dict[str, Any]:
+        """Send one JSON-RPC call and wait for its answer."""
+        request_id = next(self._ids)
+        self._websocket.send(json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}))
+        response = json.loads(self._websocket.recv())
+        if "error" in response:
+            raise RuntimeError(response["error"]["message"])
+        return response
+
+    def get_chain_head(self) -> str:
+        return self.rpc_request("chain_getHead", [])["result"]
+
+    def get_block_number(self, block_hash: str) -> int:
+        return int(self.rpc_request("chain_getHeader", [block_hash])["result"]["number"], 16)
+
+    def query(
+        self,
+        module: str,
+        storage_function: str,
+        params: Optional[List[Any]] = None,
+        block_hash: Optional[str] = None,
+    ) -> FakeScaleValue:
+        return FakeScaleValue(self.rpc_request("fake_getStorage", [storage_function, params or []])["result"])
+
+    def query_map(
+        self,
+        module: str,
+        storage_function: str,
+        params: Optional[List[Any]] = None,
+        block_hash: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_results: Optional[int] = None,
+        start_key: Optional[Any] = None,
+    ) -> FakeQueryMapResult:
+        return FakeQueryMapResult(
+            self, storage_function, params or [], block_hash or self.get_chain_head(),
+            page_size, max_results, start_key
+        )
+
+    def create_storage_key(self, pallet: str, storage_function: str, params: List[Any]) -> Tuple[str, List[Any]]:
+        return storage_function, params
+
+    def query_multi(self, storage_keys: List[Tuple[str, List[Any]]]) -> List[Tuple[Any, FakeScaleValue]]:
+        values = self.rpc_request("fake_getStorageMulti", [list(key) for key in storage_keys])["result"]
+        return [(key, FakeScaleValue(value)) for key, value in zip(storage_keys, values)]
+
+    def close(self) -> None:
+        self._websocket.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a synthetic Subtensor chain over JSON-RPC")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9944)
+    parser.add_argument("--subnets", type=int, default=8)
+    parser.add_argument("--hotkeys", type=int, default=256, help="Hotkeys per subnet")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every request")
+    args = parser.parse_args()
+
+    server = FakeSubstrateServer(
+        FakeChain(subnets=args.subnets, hotkeys_per_subnet=args.hotkeys),
+        host=args.host,
+        port=args.port,
+        latency=args.latency_ms / 1000,
+    )
+    print(f"Serving {args.subnets} subnets of {args.hotkeys} hotkeys on {server.url}")
+    asyncio.run(server.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
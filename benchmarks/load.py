@@ -0,0 +1,275 @@
+"""
+Load generator for GET /tao_dividends.
+
+Starts the fake substrate stand-in and the API against it, then drives the
+API with concurrent requests in three cache scenarios:
+
+- cold: every request is for a pair that is not cached, after the cache is cleared
+- warm: every request is for a pair cached beforehand
+- mixed: --hit-ratio of the requests are for cached pairs, the rest are not
+
+Requests per second and p50/p95/p99 latency are reported per scenario.
+With --baseline, the run fails when a scenario's RPS drops or its p99
+grows by more than --tolerance against an earlier --json report.
+
+Needs a Redis server at --redis (only the API's cache keys are cleared):
+
+    python -m benchmarks.load --requests 2000 --concurrency 64 --latency-ms 5
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import httpx
+from redis.asyncio import Redis
+from benchmarks.fake_substrate import FakeChain, FakeSubstrateServer
+
+# Cache key patterns of TaoDividendsService and SubnetDividendsService
+CACHE_PATTERNS = ("tao_dividends:*", "subnet_dividends:*")
+DIVIDENDS_PATH = "/api/v1/tao_dividends"
+
+Pair = Tuple[int, str]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values, 0.0 when empty."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class ScenarioResult:
+    """Throughput and latency of one scenario."""
+
+    name: str
+    requests: int
+    errors: int
+    seconds: float
+    latencies: List[float] = field(default_factory=list, repr=False)
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """Report of the scenario, with latencies in milliseconds."""
+        ordered = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rps": round(self.rps, 1),
+            "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+        }
+
+
+def chain_pairs(chain: FakeChain) -> List[Pair]:
+    """Every (netuid, hotkey) pair of the chain, interleaved across subnets."""
+    return [
+        (netuid, chain.hotkey(netuid, index))
+        for index in range(chain.hotkeys_per_subnet)
+        for netuid in chain.netuids
+    ]
+
+
+async def drive(http: httpx.AsyncClient, name: str, pairs: List[Pair], concurrency: int) -> ScenarioResult:
+    """Request every pair once, with at most concurrency requests in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def request(pair: Pair) -> None:
+        nonlocal errors
+        netuid, hotkey = pair
+        async with semaphore:
+            started_at = time.perf_counter()
+            try:
+                response = await http.get(DIVIDENDS_PATH, params={"netuid": netuid, "hotkey": hotkey})
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started_at)
+            errors += not ok
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(request(pair) for pair in pairs))
+    return ScenarioResult(name, len(pairs), errors, time.perf_counter() - started_at, latencies)
+
+
+async def clear_cache(redis: Redis) -> int:
+    """Delete the API's cached dividends, leaving other keys in the database alone."""
+    deleted = 0
+    for pattern in CACHE_PATTERNS:
+        keys = [key async for key in redis.scan_iter(match=pattern, count=1000)]
+        for start in range(0, len(keys), 1000):
+            deleted += await redis.delete(*keys[start:start + 1000])
+    return deleted
+
+
+async def run_scenarios(
+    base_url: str,
+    token: str,
+    redis_url: str,
+    chain: FakeChain,
+    requests: int,
+    concurrency: int,
+    hit_ratio: float,
+    seed: int,
+) -> List[ScenarioResult]:
+    """
+    Run the cold, warm and mixed scenarios in that order.
+
+    Each scenario uses pairs no earlier scenario requested as its misses, so
+    neither Redis nor the API's in-process cache can serve them.
+    """
+    pairs = chain_pairs(chain)
+    random.Random(seed).shuffle(pairs)
+    misses_needed = requests + round(requests * (1 - hit_ratio))
+    if misses_needed > len(pairs):
+        raise SystemExit(
+            f"The chain has {len(pairs)} pairs but the scenarios need {misses_needed} distinct misses; "
+            f"raise --subnets or --hotkeys"
+        )
+    cold_pairs, mixed_misses = pairs[:requests], pairs[requests:misses_needed]
+
+    redis = Redis.from_url(redis_url)
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as http:
+            await clear_cache(redis)
+            cold = await drive(http, "cold", cold_pairs, concurrency)
+
+            # The cold scenario cached its pairs; reuse them as the hits
+            rng = random.Random(seed + 1)
+            warm = await drive(http, "warm", [rng.choice(cold_pairs) for _ in range(requests)], concurrency)
+
+            hits = [rng.choice(cold_pairs) for _ in range(requests - len(mixed_misses))]
+            mixed_pairs = hits + mixed_misses
+            rng.shuffle(mixed_pairs)
+            mixed = await drive(http, "mixed", mixed_pairs, concurrency)
+    finally:
+        await redis.aclose()
+    return [cold, warm, mixed]
+
+
+def wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    """Wait for the API to answer, failing early if it exits."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"The API exited with code {process.returncode} during startup")
+        try:
+            if httpx.get(f"{base_url}/metrics", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"The API did not start within {timeout}s")
+
+
+def compare(results: List[ScenarioResult], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """Describe every scenario that regressed against the baseline by more than tolerance."""
+    regressions = []
+    for result in results:
+        before = baseline.get(result.name)
+        if not before:
+            continue
+        now = result.summary()
+        if now["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{result.name}: {now['rps']} rps, baseline {before['rps']}")
+        if now["p99_ms"] > before["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{result.name}: p99 {now['p99_ms']}ms, baseline {before['p99_ms']}ms")
+    return regressions
+
+
+def run_config(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run parameters recorded in the report, without the token."""
+    return {key: value for key, value in vars(args).items() if key not in ("token", "json", "baseline")}
+
+
+def print_table(results: List[ScenarioResult]) -> None:
+    print(f"{'scenario':<10}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for result in results:
+        row = result.summary()
+        print(
+            f"{result.name:<10}{row['requests']:>10}{row['errors']:>8}{row['rps']:>10}"
+            f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test GET /tao_dividends against a fake substrate node")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--hit-ratio", type=float, default=0.8, help="Share of cached pairs in the mixed scenario")
+    parser.add_argument("--subnets", type=int, default=16)
+    parser.add_argument("--hotkeys", type=int, default=256, help="Hotkeys per subnet")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Delay the fake node adds to every RPC")
+    parser.add_argument("--redis", default=os.environ.get("REDIS_URI", "redis://localhost:6379/0"))
+    parser.add_argument("--port", type=int, default=8765, help="Port the API is started on")
+    parser.add_argument("--url", help="Benchmark an already running API instead of starting one")
+    parser.add_argument("--token", default=os.environ.get("API_TOKEN", "test-api-token"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the report to this file")
+    parser.add_argument("--baseline", help="Earlier --json report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed regression against the baseline")
+    args = parser.parse_args()
+
+    chain = FakeChain(subnets=args.subnets, hotkeys_per_subnet=args.hotkeys)
+    with FakeSubstrateServer(chain, latency=args.latency_ms / 1000) as node:
+        api = None
+        base_url = args.url
+        if not base_url:
+            base_url = f"http://127.0.0.1:{args.port}"
+            env = dict(
+                os.environ,
+                BITTENSOR_NETWORK="test",
+                bittensor_test_endpoint=node.url,
+                REDIS_URI=args.redis,
+                API_TOKEN=args.token,
+                LOG_LEVEL="WARNING",
+            )
+            api = subprocess.Popen(
+                [sys.executable, "-m", "benchmarks.serve", "--port", str(args.port)],
+                env=env,
+            )
+        try:
+            if api:
+                wait_until_ready(base_url, api)
+            results = asyncio.run(run_scenarios(
+                base_url, args.token, args.redis, chain,
+                args.requests, args.concurrency, args.hit_ratio, args.seed
+            ))
+        finally:
+            if api:
+                api.terminate()
+                api.wait(timeout=30)
+
+    print_table(results)
+    report = {result.name: result.summary() for result in results}
+    report["config"] = run_config(args)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
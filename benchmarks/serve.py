@@ -0,0 +1,26 @@
+"""
+Run the API against the fake substrate stand-in.
+
+The stand-in's client replaces SubstrateInterface in this process only,
+so the API runs as a single uvicorn worker. Point it at a stand-in with
+BITTENSOR_NETWORK=test and bittensor_test_endpoint=ws://host:port.
+"""
+from unittest.mock import patch
+import argparse
+import uvicorn
+from benchmarks.fake_substrate import FakeSubstrateInterface
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the API against a fake substrate node")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args()
+
+    with patch("app.services.bittensor_client.SubstrateInterface", FakeSubstrateInterface):
+        uvicorn.run("app.main:app", host=args.host, port=args.port, log_level=args.log_level)
+
+
+if __name__ == "__main__":
+    main()
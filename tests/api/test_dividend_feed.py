@@ -0,0 +1,73 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from app.main import app
+from app.core.config import settings
+from app.core.dependencies import get_dividend_feed
+from app.services.dividend_feed import DividendFeed
+
+client = TestClient(app)
+
+VALID_HOTKEY = "5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v"
+VALID_NETUID = 1
+FEED_ENDPOINT = "/api/v1/tao_dividends/feed"
+
+
+@pytest.fixture(autouse=True)
+def feed():
+    """Serve the feed from Redis state already published for the subnet."""
+    redis = AsyncMock()
+    redis.get.return_value = b"4200000"
+    redis.hmget.return_value = [b"1000.0"]
+    dividend_feed = DividendFeed(redis, MagicMock(), MagicMock())
+    app.dependency_overrides[get_dividend_feed] = lambda: dividend_feed
+    yield dividend_feed
+    app.dependency_overrides.pop(get_dividend_feed, None)
+
+
+def test_feed_unauthorized():
+    """Test that connections without a valid token are refused."""
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect(FEED_ENDPOINT) as websocket:
+            websocket.receive_json()
+
+
+def test_feed_subscribe(feed):
+    """Test subscribing pushes the current value, then acknowledges."""
+    with client.websocket_connect(f"{FEED_ENDPOINT}?token={settings.API_TOKEN}") as websocket:
+        websocket.send_json({"action": "subscribe", "items": [{"netuid": VALID_NETUID, "hotkey": VALID_HOTKEY}]})
+
+        assert websocket.receive_json() == {
+            "type": "update",
+            "netuid": VALID_NETUID,
+            "hotkey": VALID_HOTKEY,
+            "dividend": 1000.0,
+            "block": 4200000,
+        }
+        assert websocket.receive_json() == {"type": "subscribed", "watching": 1}
+
+        websocket.send_json({"action": "unsubscribe", "items": [{"netuid": VALID_NETUID, "hotkey": VALID_HOTKEY}]})
+        assert websocket.receive_json() == {"type": "unsubscribed", "watching": 0}
+
+
+def test_feed_invalid_message():
+    """Test that malformed requests are answered with an error message."""
+    with client.websocket_connect(
+        FEED_ENDPOINT,
+        headers={"Authorization": f"Bearer {settings.API_TOKEN}"}
+    ) as websocket:
+        websocket.send_json({"action": "watch", "items": []})
+        assert websocket.receive_json()["type"] == "error"
+
+
+def test_feed_subscribe_survives_failed_read(feed):
+    """Test that a subnet read failing during subscribe is reported without closing the socket."""
+    feed._redis.get.return_value = None
+    feed._redis.set.return_value = True
+    feed._pool.acquire.side_effect = RuntimeError("chain unavailable")
+    with client.websocket_connect(f"{FEED_ENDPOINT}?token={settings.API_TOKEN}") as websocket:
+        websocket.send_json({"action": "subscribe", "items": [{"netuid": VALID_NETUID, "hotkey": VALID_HOTKEY}]})
+
+        assert websocket.receive_json()["type"] == "error"
+        assert websocket.receive_json() == {"type": "subscribed", "watching": 1}
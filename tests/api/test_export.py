@@ -0,0 +1,69 @@
+import pytest
+from unittest.mock import MagicMock
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.core.dependencies import get_dividends_export_service
+
+client = TestClient(app)
+
+EXPORT_ENDPOINT = "/api/v1/export/dividends"
+
+
+class FakeExportService:
+    """Export service streaming fixed chunks."""
+
+    async def stream(self, export_format):
+        yield f"{export_format}-1\n"
+        yield f"{export_format}-2\n"
+
+
+@pytest.fixture(autouse=True)
+def mock_export_service():
+    """Replace the export service with one that needs no chain."""
+    app.dependency_overrides[get_dividends_export_service] = lambda: FakeExportService()
+    yield
+    app.dependency_overrides.pop(get_dividends_export_service, None)
+
+
+def test_export_dividends_unauthorized():
+    """Test export endpoint without authentication."""
+    response = client.get(EXPORT_ENDPOINT)
+    assert response.status_code == 401
+
+
+@pytest.mark.parametrize("export_format,media_type", [
+    ("ndjson", "application/x-ndjson"),
+    ("csv", "text/csv"),
+])
+def test_export_dividends(export_format, media_type):
+    """Test that the export streams the service chunks with the right media type."""
+    response = client.get(
+        EXPORT_ENDPOINT,
+        params={"format": export_format},
+        headers={"Authorization": f"Bearer {settings.API_TOKEN}"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(media_type)
+    assert response.text == f"{export_format}-1\n{export_format}-2\n"
+
+
+def test_export_dividends_invalid_format():
+    """Test that unknown formats are rejected."""
+    response = client.get(
+        EXPORT_ENDPOINT,
+        params={"format": "xml"},
+        headers={"Authorization": f"Bearer {settings.API_TOKEN}"}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_uses_its_own_pool():
+    """Test that exports check clients out of their own pool, not the one serving requests."""
+    request = MagicMock()
+
+    service = await get_dividends_export_service(request)
+
+    assert service._pool is request.app.state.export_pool
+    assert service._pool is not request.app.state.bittensor_pool
@@ -0,0 +1,52 @@
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from app.main import app
+from app.core.metrics import metrics_registry
+
+client = TestClient(app)
+
+METRICS_ENDPOINT = "/metrics"
+
+
+def request_count(route: str, status: str) -> float:
+    """Get the number of observed requests of a route and status."""
+    return REGISTRY.get_sample_value(
+        "tao_watch_http_request_duration_seconds_count",
+        {"method": "GET", "route": route, "status": status}
+    ) or 0.0
+
+
+def test_metrics_exposed_without_authentication():
+    """Test that metrics are served in the Prometheus text format."""
+    response = client.get(METRICS_ENDPOINT)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "tao_watch_cache_lookups_total" in response.text
+    assert "tao_watch_chain_executor_queued" in response.text
+
+
+def test_request_latency_labelled_by_route_template():
+    """Test that requests are observed under their route template, not their path."""
+    before = request_count("/api/v1/subnets/{netuid}/dividends", "401")
+
+    client.get("/api/v1/subnets/7/dividends")
+
+    assert request_count("/api/v1/subnets/{netuid}/dividends", "401") == before + 1
+
+
+def test_unmatched_requests_share_one_label():
+    """Test that unknown paths do not create a series each."""
+    before = request_count("unmatched", "404")
+
+    client.get("/no/such/path")
+
+    assert request_count("unmatched", "404") == before + 1
+
+
+def test_multiprocess_registry(monkeypatch, tmp_path):
+    """Test that multiprocess mode aggregates from PROMETHEUS_MULTIPROC_DIR."""
+    assert metrics_registry() is REGISTRY
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    assert metrics_registry() is not REGISTRY
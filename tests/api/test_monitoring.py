@@ -0,0 +1,104 @@
+import pytest
+from unittest.mock import MagicMock
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.services.local_cache import CacheStats, LocalCache
+
+client = TestClient(app)
+
+MONITORING_POOLS_ENDPOINT = "/api/v1/monitoring/pools"
+MONITORING_CACHE_ENDPOINT = "/api/v1/monitoring/cache"
+REDIS_STATS = {
+    "max_connections": 50,
+    "in_use": 1,
+    "idle": 3,
+    "acquisitions": 10,
+    "avg_wait_seconds": 0.001,
+    "max_wait_seconds": 0.01,
+}
+DATABASE_STATS = {
+    "size": 10,
+    "max_overflow": 20,
+    "checked_in": 2,
+    "checked_out": 1,
+    "overflow": 0,
+}
+BITTENSOR_STATS = {"size": 4, "available": 3, "in_use": 1}
+EXECUTOR_STATS = {
+    "max_workers": 8,
+    "queued": 0,
+    "running": 1,
+    "calls": 12,
+    "timeouts": 0,
+    "avg_queue_wait_seconds": 0.0,
+    "max_queue_wait_seconds": 0.002,
+}
+
+
+@pytest.fixture
+def mock_pools():
+    """Attach mock pools to the application state."""
+    app.state.db_engine = MagicMock()
+    app.state.db_engine.pool.size.return_value = DATABASE_STATS["size"]
+    app.state.db_engine.pool.checkedin.return_value = DATABASE_STATS["checked_in"]
+    app.state.db_engine.pool.checkedout.return_value = DATABASE_STATS["checked_out"]
+    app.state.db_engine.pool.overflow.return_value = DATABASE_STATS["overflow"]
+    app.state.redis_pool = MagicMock(stats=MagicMock(return_value=REDIS_STATS))
+    app.state.bittensor_pool = MagicMock(stats=MagicMock(return_value=BITTENSOR_STATS))
+    app.state.chain_executor = MagicMock(stats=MagicMock(return_value=EXECUTOR_STATS))
+    yield
+    del app.state.db_engine
+    del app.state.redis_pool
+    del app.state.bittensor_pool
+    del app.state.chain_executor
+
+
+def test_get_pool_stats_unauthorized():
+    """Test pool statistics endpoint without authentication."""
+    response = client.get(MONITORING_POOLS_ENDPOINT)
+    assert response.status_code == 401
+
+
+def test_get_pool_stats(mock_pools):
+    """Test pool statistics endpoint with valid authentication."""
+    response = client.get(
+        MONITORING_POOLS_ENDPOINT,
+        headers={"Authorization": f"Bearer {settings.API_TOKEN}"}
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["database"] == DATABASE_STATS
+    assert data["redis"] == REDIS_STATS
+    assert data["bittensor"] == BITTENSOR_STATS
+    assert data["chain_executor"] == EXECUTOR_STATS
+
+
+@pytest.fixture
+def cache_state():
+    """Attach a local cache and cache counters to the application state."""
+    app.state.local_cache = LocalCache(max_size=10, ttl=60)
+    app.state.local_cache.set("key", "value")
+    app.state.cache_stats = CacheStats()
+    app.state.cache_stats.record("l1", True, 3)
+    app.state.cache_stats.record("l1", False)
+    app.state.cache_stats.record("redis", False)
+    yield
+    del app.state.local_cache
+    del app.state.cache_stats
+
+
+def test_get_cache_stats(cache_state):
+    """Test cache statistics endpoint with valid authentication."""
+    response = client.get(
+        MONITORING_CACHE_ENDPOINT,
+        headers={"Authorization": f"Bearer {settings.API_TOKEN}"}
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["l1_enabled"] is True
+    assert data["l1_size"] == 1
+    assert data["l1"] == {"hits": 3, "misses": 1, "hit_ratio": 0.75}
+    assert data["redis"] == {"hits": 0, "misses": 1, "hit_ratio": 0.0}
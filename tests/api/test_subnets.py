@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import AsyncMock
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.core.dependencies import get_subnet_dividends_service
+from app.services.subnet_dividends import SubnetDividendsService
+
+client = TestClient(app)
+
+VALID_NETUID = 1
+MOCK_BLOCK = 4200000
+SUBNET_DIVIDENDS_ENDPOINT = f"/api/v1/subnets/{VALID_NETUID}/dividends"
+
+
+@pytest.fixture(autouse=True)
+def mock_service():
+    """Serve the endpoint from a SubnetDividendsService on a mock chain and cache."""
+    bittensor_client = AsyncMock()
+    bittensor_client.get_subnet_dividends.return_value = (MOCK_BLOCK, {"5A": 1.0, "5B": 2.0, "5C": 3.0})
+    cache = AsyncMock()
+    cache.get.return_value = None
+    service = SubnetDividendsService(bittensor_client, cache)
+    app.dependency_overrides[get_subnet_dividends_service] = lambda: service
+    yield service
+    app.dependency_overrides.pop(get_subnet_dividends_service, None)
+
+
+def auth_headers():
+    return {"Authorization": f"Bearer {settings.API_TOKEN}"}
+
+
+def test_get_subnet_dividends_unauthorized():
+    """Test subnet dividends endpoint without authentication."""
+    response = client.get(SUBNET_DIVIDENDS_ENDPOINT)
+    assert response.status_code == 401
+
+
+def test_get_subnet_dividends_paginated():
+    """Test paging through a subnet with the returned cursor."""
+    response = client.get(SUBNET_DIVIDENDS_ENDPOINT, params={"limit": 2}, headers=auth_headers())
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["netuid"] == VALID_NETUID
+    assert data["block"] == MOCK_BLOCK
+    assert data["total"] == 3
+    assert [item["hotkey"] for item in data["items"]] == ["5C", "5B"]
+
+    response = client.get(
+        SUBNET_DIVIDENDS_ENDPOINT,
+        params={"limit": 2, "cursor": data["next_cursor"]},
+        headers=auth_headers()
+    )
+    data = response.json()
+    assert [item["hotkey"] for item in data["items"]] == ["5A"]
+    assert data["next_cursor"] is None
+
+
+def test_get_subnet_dividends_invalid_params():
+    """Test that bad sort fields, limits and cursors are rejected."""
+    assert client.get(SUBNET_DIVIDENDS_ENDPOINT, params={"sort_by": "stake"}, headers=auth_headers()).status_code == 422
+    assert client.get(SUBNET_DIVIDENDS_ENDPOINT, params={"limit": 0}, headers=auth_headers()).status_code == 422
+    assert client.get(SUBNET_DIVIDENDS_ENDPOINT, params={"cursor": "bad"}, headers=auth_headers()).status_code == 400
@@ -1,10 +1,25 @@
+import time
 import pytest
+from contextlib import asynccontextmanager
 from typing import Any, Dict, Optional
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi.testclient import TestClient
 from app.main import app
 from app.core.config import settings
+from app.core.dependencies import (
+    get_bittensor_pool,
+    get_block_watcher,
+    get_cache_refresher,
+    get_redis_cache,
+    get_single_flight,
+    get_stake_job_queue,
+    get_subnet_snapshots,
+)
+from app.services.cache_refresher import CacheRefresher
 from app.services.redis_cache import RedisCache
+from app.services.single_flight import SingleFlight
+from app.services.stake_pipeline import StakeJobQueue
+from app.services.subnet_snapshot import SubnetSnapshotStore
 
 client = TestClient(app)
 
@@ -13,23 +28,53 @@ VALID_HOTKEY = "5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v"
 VALID_NETUID = 1
 MOCK_DIVIDEND = 1000000.0
 TAO_DIVIDENDS_ENDPOINT = "/api/v1/tao_dividends"
+TAO_DIVIDENDS_BATCH_ENDPOINT = "/api/v1/tao_dividends/batch"
 
 @pytest.fixture
 def mock_bittensor_client():
-    """Mock the BittensorClient for testing."""
-    with patch("app.core.dependencies.BittensorClient") as mock:
-        mock_instance = AsyncMock()
-        mock_instance.get_tao_dividends.return_value = MOCK_DIVIDEND
-        mock.return_value = mock_instance
+    """Mock the pooled BittensorClient for testing."""
+    mock_instance = AsyncMock()
+    mock_instance.get_tao_dividends.return_value = MOCK_DIVIDEND
+    pool = MagicMock()
+
+    @asynccontextmanager
+    async def acquire():
         yield mock_instance
 
-@pytest.fixture
+    pool.acquire = acquire
+    snapshots = SubnetSnapshotStore()
+    app.dependency_overrides[get_bittensor_pool] = lambda: pool
+    single_flight = SingleFlight()
+    refresher = CacheRefresher(MagicMock())
+    app.dependency_overrides[get_subnet_snapshots] = lambda: snapshots
+    app.dependency_overrides[get_single_flight] = lambda: single_flight
+    app.dependency_overrides[get_cache_refresher] = lambda: refresher
+    app.dependency_overrides[get_block_watcher] = lambda: None
+    yield mock_instance
+    app.dependency_overrides.pop(get_bittensor_pool, None)
+    app.dependency_overrides.pop(get_subnet_snapshots, None)
+    app.dependency_overrides.pop(get_single_flight, None)
+    app.dependency_overrides.pop(get_cache_refresher, None)
+    app.dependency_overrides.pop(get_block_watcher, None)
+
+@pytest.fixture(autouse=True)
 def mock_redis_cache():
     """Create a mock Redis cache that always misses."""
     cache = AsyncMock(spec=RedisCache)
     cache.get.return_value = None
     cache.set.return_value = True
-    return cache
+    app.dependency_overrides[get_redis_cache] = lambda: cache
+    yield cache
+    app.dependency_overrides.pop(get_redis_cache, None)
+
+@pytest.fixture(autouse=True)
+def mock_stake_queue():
+    """Create a mock stake job queue that accepts every job."""
+    queue = AsyncMock(spec=StakeJobQueue)
+    queue.enqueue.return_value = True
+    app.dependency_overrides[get_stake_job_queue] = lambda: queue
+    yield queue
+    app.dependency_overrides.pop(get_stake_job_queue, None)
 
 def test_get_tao_dividends_unauthorized():
     """Test tao dividends endpoint without authentication."""
@@ -54,6 +99,56 @@ def test_get_tao_dividends_success(mock_bittensor_client, mock_redis_cache):
     )
 
 
+def test_get_tao_dividends_trade_enqueues_stake_job(mock_bittensor_client, mock_stake_queue):
+    """Test that trade=true queues a stake job and reports it."""
+    response = client.get(
+        TAO_DIVIDENDS_ENDPOINT,
+        params={"netuid": VALID_NETUID, "hotkey": VALID_HOTKEY, "trade": "true"},
+        headers={"Authorization": f"Bearer {settings.API_TOKEN}"}
+    )
+    assert response.status_code == 200
+    assert response.json()["stake_tx_triggered"] is True
+    mock_stake_queue.enqueue.assert_called_once_with(VALID_NETUID, VALID_HOTKEY)
+
+
+def test_get_tao_dividends_without_trade_skips_stake(mock_bittensor_client, mock_stake_queue):
+    """Test that no stake job is queued unless trade is requested."""
+    response = make_tao_dividends_request(token=settings.API_TOKEN)
+    assert response.status_code == 200
+    assert response.json()["stake_tx_triggered"] is False
+    mock_stake_queue.enqueue.assert_not_called()
+
+
+def test_get_tao_dividends_fast_path_encodes_cached_entry(mock_bittensor_client, mock_redis_cache):
+    """Test that a fresh cache hit is encoded straight from the cached entry."""
+    mock_redis_cache.get.return_value = {
+        "dividend": 1.0,
+        "stake_tx_triggered": False,
+        "block": None,
+        "snapshot_age_seconds": None,
+        "cached_at": time.time(),
+        "computed_at_block": None,
+    }
+    
+    response = make_tao_dividends_request(token=settings.API_TOKEN)
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["dividend"] == 1.0
+    assert (response.json()["cached"], response.json()["stale"]) == (True, False)
+    mock_bittensor_client.get_tao_dividends.assert_not_called()
+
+
+def test_get_tao_dividends_fast_responses_disabled(mock_bittensor_client, mock_redis_cache):
+    """Test that responses are built from the model when FAST_RESPONSES_ENABLED is off."""
+    with patch.object(settings, "FAST_RESPONSES_ENABLED", False):
+        response = make_tao_dividends_request(token=settings.API_TOKEN)
+    
+    assert response.status_code == 200
+    assert_valid_tao_response(response.json())
+    assert "body" not in mock_redis_cache.set.call_args.args[0]
+
+
 def test_get_tao_dividends_invalid_netuid(mock_bittensor_client):
     """Test tao dividends endpoint with invalid netuid."""
     response = make_tao_dividends_request(
@@ -74,6 +169,47 @@ def test_get_tao_dividends_invalid_hotkey(mock_bittensor_client):
     mock_bittensor_client.get_tao_dividends.assert_not_called()
 
 
+def test_get_tao_dividends_batch_unauthorized():
+    """Test batch tao dividends endpoint without authentication."""
+    response = client.post(
+        TAO_DIVIDENDS_BATCH_ENDPOINT,
+        json={"items": [{"netuid": VALID_NETUID, "hotkey": VALID_HOTKEY}]}
+    )
+    assert response.status_code == 401
+
+
+def test_get_tao_dividends_batch_success(mock_bittensor_client, mock_redis_cache):
+    """Test batch tao dividends endpoint with valid authentication."""
+    mock_redis_cache.get_many.return_value = [None]
+    
+    response = client.post(
+        TAO_DIVIDENDS_BATCH_ENDPOINT,
+        json={"items": [{"netuid": VALID_NETUID, "hotkey": VALID_HOTKEY}]},
+        headers={"Authorization": f"Bearer {settings.API_TOKEN}"}
+    )
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert len(data) == 1
+    assert_valid_tao_response(data[0])
+    mock_bittensor_client.get_tao_dividends.assert_called_once_with(
+        VALID_NETUID,
+        VALID_HOTKEY
+    )
+    mock_redis_cache.set_many.assert_called_once()
+
+
+def test_get_tao_dividends_batch_empty(mock_bittensor_client):
+    """Test batch tao dividends endpoint with no items."""
+    response = client.post(
+        TAO_DIVIDENDS_BATCH_ENDPOINT,
+        json={"items": []},
+        headers={"Authorization": f"Bearer {settings.API_TOKEN}"}
+    )
+    assert response.status_code == 422
+    mock_bittensor_client.get_tao_dividends.assert_not_called()
+
+
 def assert_valid_tao_response(data: Dict[str, Any]) -> None:
     """
     Helper function to assert the structure and content of a tao dividends response.
@@ -0,0 +1,92 @@
+import pytest
+import pytest_asyncio
+import httpx
+from unittest.mock import patch
+from benchmarks.fake_substrate import FakeChain, FakeSubstrateInterface, FakeSubstrateServer
+from benchmarks.load import ScenarioResult, chain_pairs, compare, drive, percentile
+from app.services.bittensor_client import BittensorClient
+from app.core.config import settings
+
+
+@pytest.fixture(scope="module")
+def fake_node():
+    with FakeSubstrateServer(FakeChain(subnets=2, hotkeys_per_subnet=250)) as node:
+        yield node
+
+
+@pytest_asyncio.fixture
+async def client(fake_node):
+    """BittensorClient connected to the fake node."""
+    with patch("app.services.bittensor_client.SubstrateInterface", FakeSubstrateInterface), \
+            patch.object(settings, "bittensor_test_endpoint", fake_node.url):
+        client = BittensorClient(network="test")
+        await client.connect()
+    yield client
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_reads_fake_node(client, fake_node):
+    """BittensorClient reads single entries, batches and whole paged maps from the fake node."""
+    dividends = fake_node.chain.dividends(1)
+    hotkey = FakeChain.hotkey(1, 7)
+
+    assert await client.get_tao_dividends(1, hotkey) == dividends[hotkey]
+    assert await client.get_tao_dividends_multi(1, [hotkey, "unknown"]) == {hotkey: dividends[hotkey], "unknown": 0.0}
+    _, subnet = await client.get_subnet_dividends(1)
+    assert subnet == {key: float(value) for key, value in dividends.items()}
+    _, epochs = await client.get_subnet_epoch_blocks()
+    assert sorted(epochs) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_client_pages_network_dividends(client):
+    """Network iteration resumes each page from the last key of the previous one."""
+    pages = [(netuid, len(page)) async for _, netuid, page in client.iter_network_dividends(page_size=100)]
+
+    assert pages == [(1, 100), (1, 100), (1, 50), (2, 100), (2, 100), (2, 50)]
+
+
+def test_percentile():
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([0.5], 95) == 0.5
+    assert percentile([], 50) == 0.0
+
+
+def test_chain_pairs_are_distinct():
+    chain = FakeChain(subnets=3, hotkeys_per_subnet=10)
+
+    pairs = chain_pairs(chain)
+
+    assert len(set(pairs)) == 30
+    assert [netuid for netuid, _ in pairs[:3]] == [1, 2, 3]
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    result = ScenarioResult("warm", 100, 0, 1.0, [0.01] * 100)
+    baseline = {
+        "warm": {"rps": 120.0, "p99_ms": 9.5},
+        "cold": {"rps": 1.0, "p99_ms": 1.0},
+    }
+
+    regressions = compare([result], baseline, tolerance=0.1)
+
+    assert regressions == ["warm: 100.0 rps, baseline 120.0"]
+    assert compare([result], baseline, tolerance=0.5) == []
+
+
+@pytest.mark.asyncio
+async def test_drive_counts_errors():
+    """Requests answered with anything but 200 count as errors."""
+    def respond(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200 if request.url.params["netuid"] == "1" else 503)
+
+    async with httpx.AsyncClient(base_url="http://api", transport=httpx.MockTransport(respond)) as http:
+        result = await drive(http, "mixed", [(1, "a"), (2, "b"), (1, "c")], concurrency=2)
+
+    assert (result.name, result.requests, result.errors) == ("mixed", 3, 1)
+    assert len(result.latencies) == 3
+    assert result.rps > 0
@@ -0,0 +1,33 @@
+import pytest
+from app.core.config import settings
+from app.db.session import create_db_engine, create_sessionmaker, db_pool_stats
+
+
+@pytest.mark.asyncio
+async def test_create_db_engine_uses_settings():
+    """Test that the engine pool is sized from settings without connecting."""
+    engine = create_db_engine()
+    try:
+        assert engine.dialect.name == "postgresql"
+        assert engine.pool.size() == settings.DB_POOL_SIZE
+        assert engine.pool._recycle == settings.DB_POOL_RECYCLE_SECONDS
+        assert db_pool_stats(engine) == {
+            "size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "checked_in": 0,
+            "checked_out": 0,
+            "overflow": -settings.DB_POOL_SIZE,
+        }
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_sessionmaker_keeps_objects_loaded_after_commit():
+    """Test that sessions do not expire objects on commit."""
+    engine = create_db_engine()
+    try:
+        sessionmaker = create_sessionmaker(engine)
+        assert sessionmaker.kw["expire_on_commit"] is False
+    finally:
+        await engine.dispose()
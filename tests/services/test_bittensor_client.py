@@ -1,6 +1,9 @@
+import asyncio
+import threading
 import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
-from app.services.bittensor_client import BittensorClient
+from app.services.bittensor_client import BittensorClient, ExtrinsicNotSubmittedError
+from app.services.chain_executor import ChainExecutor
 from app.core.config import settings
 
 MOCK_NETWORK = "test"
@@ -37,8 +40,9 @@ async def client():
         
         client = BittensorClient(network=MOCK_NETWORK)
         await client.connect()
-        yield client
-        await client.close()
+    # Leave the patch before yielding so a suspended fixture cannot leak it
+    yield client
+    await client.close()
 
 
 @pytest.mark.asyncio
@@ -74,22 +78,21 @@ async def test_get_tao_dividends(client):
     """Test getting Tao dividends."""
     async for c in client:
         mock_substrate = c._substrate
-        mock_substrate.query_map = MagicMock()
+        mock_substrate.query = MagicMock()
         
         # Create a mock query result that matches the expected format
-        mock_key = MOCK_HOTKEY  # Use the SS58 address directly
         mock_value = MagicMock()
         mock_value.value = 1000
         
-        mock_substrate.query_map.return_value = [(mock_key, mock_value)]
+        mock_substrate.query.return_value = mock_value
         
         result = await c.get_tao_dividends(MOCK_NETUID, MOCK_HOTKEY)
         assert result == 1000.0  # Note: now returning float
         
-        mock_substrate.query_map.assert_called_once_with(
+        mock_substrate.query.assert_called_once_with(
             module="SubtensorModule",
             storage_function="TaoDividendsPerSubnet",
-            params=[MOCK_NETUID]
+            params=[MOCK_NETUID, MOCK_HOTKEY]
         )
         break
 
@@ -121,23 +124,22 @@ async def test_get_tao_dividends_with_string_netuid(client):
     """Test getting Tao dividends with string netuid."""
     async for c in client:
         mock_substrate = c._substrate
-        mock_substrate.query_map = MagicMock()
+        mock_substrate.query = MagicMock()
         
         # Create a mock query result
-        mock_key = MOCK_HOTKEY  # Use the SS58 address directly
         mock_value = MagicMock()
         mock_value.value = "1000"  # String value from substrate
         
-        mock_substrate.query_map.return_value = [(mock_key, mock_value)]
+        mock_substrate.query.return_value = mock_value
         
         # Test with string netuid
         result = await c.get_tao_dividends("1", MOCK_HOTKEY)
         assert result == 1000.0
         
-        mock_substrate.query_map.assert_called_once_with(
+        mock_substrate.query.assert_called_once_with(
             module="SubtensorModule",
             storage_function="TaoDividendsPerSubnet",
-            params=[1]  # Should be converted to int
+            params=[1, MOCK_HOTKEY]  # Should be converted to int
         )
         break
 
@@ -156,17 +158,339 @@ async def test_get_tao_dividends_not_found(client):
     """Test getting Tao dividends when the hotkey is not found."""
     async for c in client:
         mock_substrate = c._substrate
-        mock_substrate.query_map = MagicMock()
+        mock_substrate.query = MagicMock()
         
         # Return empty result
-        mock_substrate.query_map.return_value = []
+        mock_substrate.query.return_value = None
         
         result = await c.get_tao_dividends(MOCK_NETUID, MOCK_HOTKEY)
         assert result == 0.0  # Should return 0 when not found
         
+        mock_substrate.query.assert_called_once_with(
+            module="SubtensorModule",
+            storage_function="TaoDividendsPerSubnet",
+            params=[MOCK_NETUID, MOCK_HOTKEY]
+        )
+        break 
+
+@pytest.mark.asyncio
+async def test_get_subnet_dividends(client):
+    """Test getting the dividends of a whole subnet at the chain head."""
+    async for c in client:
+        mock_substrate = c._substrate
+        mock_substrate.get_chain_head = MagicMock(return_value="0xhead")
+        mock_substrate.get_block_number = MagicMock(return_value=4200000)
+        mock_substrate.query_map = MagicMock()
+        
+        other_value = MagicMock()
+        other_value.value = 7
+        mock_value = MagicMock()
+        mock_value.value = 1000
+        
+        mock_substrate.query_map.return_value = [("5Other...", other_value), (MOCK_HOTKEY, mock_value)]
+        
+        block, dividends = await c.get_subnet_dividends(MOCK_NETUID)
+        assert block == 4200000
+        assert dividends == {"5Other...": 7.0, MOCK_HOTKEY: 1000.0}
+        
         mock_substrate.query_map.assert_called_once_with(
             module="SubtensorModule",
             storage_function="TaoDividendsPerSubnet",
-            params=[MOCK_NETUID]
+            params=[MOCK_NETUID],
+            block_hash="0xhead"
+        )
+        break
+
+
+@pytest.mark.asyncio
+async def test_get_subnet_dividends_not_connected():
+    """Test getting subnet dividends when not connected."""
+    client = BittensorClient(network=MOCK_NETWORK)
+    with pytest.raises(RuntimeError, match="Not connected to Bittensor network"):
+        await client.get_subnet_dividends(MOCK_NETUID)
+
+
+@pytest.mark.asyncio
+async def test_get_tao_dividends_multi(client):
+    """Test getting Tao dividends for several hotkeys with query_multi."""
+    async for c in client:
+        mock_substrate = c._substrate
+        mock_substrate.create_storage_key = MagicMock(side_effect=lambda pallet, storage, params: tuple(params))
+        
+        mock_value = MagicMock()
+        mock_value.value = 1000
+        empty_value = MagicMock()
+        empty_value.value = None
+        
+        mock_substrate.query_multi = MagicMock(return_value=[
+            ((MOCK_NETUID, MOCK_HOTKEY), mock_value),
+            ((MOCK_NETUID, "5Other..."), empty_value),
+        ])
+        
+        result = await c.get_tao_dividends_multi(MOCK_NETUID, [MOCK_HOTKEY, "5Other..."])
+        assert result == {MOCK_HOTKEY: 1000.0, "5Other...": 0.0}
+        
+        mock_substrate.query_multi.assert_called_once_with([
+            (MOCK_NETUID, MOCK_HOTKEY),
+            (MOCK_NETUID, "5Other..."),
+        ])
+        break
+
+
+@pytest.mark.asyncio
+async def test_get_tao_dividends_multi_empty(client):
+    """Test that no RPC is made for an empty hotkey list."""
+    async for c in client:
+        mock_substrate = c._substrate
+        mock_substrate.query_multi = MagicMock()
+        
+        result = await c.get_tao_dividends_multi(MOCK_NETUID, [])
+        assert result == {}
+        mock_substrate.query_multi.assert_not_called()
+        break
+
+
+@pytest.mark.asyncio
+async def test_get_tao_dividends_timeout_drops_connection(client):
+    """Test that a timed out chain call drops the connection for reconnect."""
+    async for c in client:
+        c._executor = AsyncMock()
+        c._executor.run.side_effect = TimeoutError("Chain call query timed out after 30s")
+        
+        with pytest.raises(TimeoutError):
+            await c.get_tao_dividends(MOCK_NETUID, MOCK_HOTKEY)
+        
+        assert not c.is_connected
+        break
+
+
+@pytest.mark.asyncio
+async def test_get_subnet_epoch_blocks(client):
+    """Test getting the last epoch block of every subnet at the chain head."""
+    async for c in client:
+        mock_substrate = c._substrate
+        mock_substrate.get_chain_head = MagicMock(return_value="0xhead")
+        mock_substrate.get_block_number = MagicMock(return_value=4200000)
+        
+        epoch_block = MagicMock()
+        epoch_block.value = 4199990
+        mock_substrate.query_map = MagicMock(return_value=[(MOCK_NETUID, epoch_block)])
+        
+        block, epochs = await c.get_subnet_epoch_blocks()
+        assert block == 4200000
+        assert epochs == {MOCK_NETUID: 4199990}
+        
+        mock_substrate.query_map.assert_called_once_with(
+            module="SubtensorModule",
+            storage_function="LastMechansimStepBlock",
+            block_hash="0xhead"
+        )
+        break
+
+
+@pytest.mark.asyncio
+async def test_iter_network_dividends(client):
+    """Test iterating every subnet page by page at one block."""
+    async for c in client:
+        mock_substrate = c._substrate
+        mock_substrate.get_chain_head = MagicMock(return_value="0xhead")
+        mock_substrate.get_block_number = MagicMock(return_value=4200000)
+        
+        def make_value(value):
+            mock_value = MagicMock()
+            mock_value.value = value
+            return mock_value
+        
+        def make_result(entries, last_key):
+            result = MagicMock()
+            result.__iter__.return_value = iter(entries)
+            result.last_key = last_key
+            return result
+        
+        pages = {
+            (1, None): make_result([("5A", make_value(1)), ("5B", make_value(2))], "key_b"),
+            (1, "key_b"): make_result([("5C", make_value(3))], "key_c"),
+            (2, None): make_result([], None),
+        }
+        
+        def query_map(module, storage_function, params=None, block_hash=None, **kwargs):
+            assert block_hash == "0xhead"
+            if storage_function == "NetworksAdded":
+                return make_result([(2, make_value(True)), (1, make_value(True)), (3, make_value(False))], None)
+            return pages[(params[0], kwargs["start_key"])]
+        
+        mock_substrate.query_map = MagicMock(side_effect=query_map)
+        
+        result = [page async for page in c.iter_network_dividends(page_size=2)]
+        
+        assert result == [
+            (4200000, 1, [("5A", 1.0), ("5B", 2.0)]),
+            (4200000, 1, [("5C", 3.0)]),
+        ]
+        assert mock_substrate.query_map.call_count == 4
+        break
+
+
+@pytest.mark.asyncio
+async def test_get_subnet_netuids(client):
+    """Test listing the registered subnets at the chain head."""
+    async for c in client:
+        mock_substrate = c._substrate
+        mock_substrate.get_chain_head = MagicMock(return_value="0xhead")
+        mock_substrate.get_block_number = MagicMock(return_value=4200000)
+        
+        def make_value(value):
+            mock_value = MagicMock()
+            mock_value.value = value
+            return mock_value
+        
+        mock_substrate.query_map = MagicMock(return_value=[
+            (3, make_value(True)), (1, make_value(True)), (2, make_value(False))
+        ])
+        
+        assert await c.get_subnet_netuids() == (4200000, [1, 3])
+        break
+
+
+
+@pytest.mark.asyncio
+async def test_submit_stake_batches_calls(client, mock_settings):
+    """Test that stake and unstake amounts are submitted as one signed batch."""
+    mock_settings.BITTENSOR_WALLET_SEED = "0x" + "11" * 32
+    async for c in client:
+        mock_substrate = c._substrate
+        mock_substrate.compose_call = MagicMock(side_effect=lambda **kwargs: kwargs)
+        receipt = MagicMock(is_success=True, extrinsic_hash="0xhash")
+        mock_substrate.submit_extrinsic = MagicMock(return_value=receipt)
+        
+        with patch("app.services.bittensor_client.Keypair") as keypair:
+            extrinsic_hash = await c.submit_stake(MOCK_NETUID, {"5A": 0.5, "5B": -0.25, "5C": 0.0})
+        
+        assert extrinsic_hash == "0xhash"
+        keypair.create_from_seed.assert_called_once()
+        batch = mock_substrate.create_signed_extrinsic.call_args.kwargs["call"]
+        assert batch["call_function"] == "batch_all"
+        calls = batch["call_params"]["calls"]
+        assert [call["call_function"] for call in calls] == ["add_stake", "remove_stake"]
+        assert calls[0]["call_params"]["amount_staked"] == 500_000_000
+        assert calls[1]["call_params"]["amount_unstaked"] == 250_000_000
+        mock_substrate.submit_extrinsic.assert_called_once()
+        break
+
+
+@pytest.mark.asyncio
+async def test_submit_stake_raises_on_failed_extrinsic(client, mock_settings):
+    """Test that a failed extrinsic is raised."""
+    mock_settings.BITTENSOR_WALLET_SEED = "0x" + "11" * 32
+    async for c in client:
+        c._substrate.submit_extrinsic = MagicMock(
+            return_value=MagicMock(is_success=False, error_message="NotEnoughBalance")
         )
-        break 
\ No newline at end of file
+        
+        with patch("app.services.bittensor_client.Keypair"):
+            with pytest.raises(RuntimeError):
+                await c.submit_stake(MOCK_NETUID, {"5A": 0.5}, wait_for_inclusion=True)
+        assert c._next_nonce is None
+        break
+
+
+@pytest.mark.asyncio
+async def test_submit_stake_tracks_nonce(client, mock_settings):
+    """Test that the nonce is read once and then incremented locally."""
+    mock_settings.BITTENSOR_WALLET_SEED = "0x" + "11" * 32
+    async for c in client:
+        mock_substrate = c._substrate
+        mock_substrate.get_account_nonce = MagicMock(return_value=7)
+        mock_substrate.submit_extrinsic = MagicMock(return_value=MagicMock(extrinsic_hash="0xhash"))
+        
+        with patch("app.services.bittensor_client.Keypair"):
+            await c.submit_stake(MOCK_NETUID, {"5A": 0.5})
+            await c.submit_stake(MOCK_NETUID, {"5A": -0.5})
+        
+        mock_substrate.get_account_nonce.assert_called_once()
+        nonces = [call.kwargs["nonce"] for call in mock_substrate.create_signed_extrinsic.call_args_list]
+        assert nonces == [7, 8]
+        assert mock_substrate.submit_extrinsic.call_args.kwargs["wait_for_inclusion"] is False
+        
+        # A failed submission makes the next one read the nonce again
+        mock_substrate.submit_extrinsic.side_effect = Exception("Transaction is outdated")
+        with patch("app.services.bittensor_client.Keypair"):
+            with pytest.raises(Exception):
+                await c.submit_stake(MOCK_NETUID, {"5A": 0.5})
+        assert c._next_nonce is None
+        break
+
+
+async def connect_with_timeout(timeout: float) -> BittensorClient:
+    """Connect a client whose chain calls time out after timeout seconds."""
+    with patch("app.services.bittensor_client.SubstrateInterface"):
+        c = BittensorClient(network=MOCK_NETWORK, executor=ChainExecutor(max_workers=2, timeout=timeout))
+        await c.connect()
+    return c
+
+
+@pytest.mark.asyncio
+async def test_submit_stake_timeout_before_submission_is_abandoned(mock_settings):
+    """Test that a submission timing out before it reaches the node never submits afterwards."""
+    mock_settings.BITTENSOR_WALLET_SEED = "0x" + "11" * 32
+    c = await connect_with_timeout(0.05)
+    mock_substrate = c._substrate
+    release = threading.Event()
+    mock_substrate.get_account_nonce = MagicMock(side_effect=lambda address: release.wait(5) and 7)
+    
+    with patch("app.services.bittensor_client.Keypair"):
+        with pytest.raises(ExtrinsicNotSubmittedError):
+            await c.submit_stake(MOCK_NETUID, {"5A": 0.5})
+        release.set()
+        await asyncio.sleep(0.1)
+    
+    mock_substrate.submit_extrinsic.assert_not_called()
+    assert c._next_nonce is None
+    await c.close()
+
+
+@pytest.mark.asyncio
+async def test_submit_stake_timeout_after_submission_keeps_nonce_reset(mock_settings):
+    """Test that a submission finishing after its caller timed out does not set the tracked nonce."""
+    mock_settings.BITTENSOR_WALLET_SEED = "0x" + "11" * 32
+    c = await connect_with_timeout(0.05)
+    mock_substrate = c._substrate
+    mock_substrate.get_account_nonce = MagicMock(return_value=7)
+    release = threading.Event()
+    mock_substrate.submit_extrinsic = MagicMock(
+        side_effect=lambda extrinsic, wait_for_inclusion: release.wait(5) and MagicMock(extrinsic_hash="0xhash")
+    )
+    
+    with patch("app.services.bittensor_client.Keypair"):
+        with pytest.raises(TimeoutError):
+            await c.submit_stake(MOCK_NETUID, {"5A": 0.5})
+        release.set()
+        await asyncio.sleep(0.1)
+    
+    mock_substrate.submit_extrinsic.assert_called_once()
+    assert c._next_nonce is None
+    await c.close()
+
+
+@pytest.mark.asyncio
+async def test_submit_stake_error_before_submission(client, mock_settings):
+    """Test that errors before the extrinsic is submitted are marked safe to retry."""
+    mock_settings.BITTENSOR_WALLET_SEED = "0x" + "11" * 32
+    async for c in client:
+        c._substrate.get_account_nonce = MagicMock(side_effect=ConnectionError("closed"))
+        
+        with patch("app.services.bittensor_client.Keypair"):
+            with pytest.raises(ExtrinsicNotSubmittedError):
+                await c.submit_stake(MOCK_NETUID, {"5A": 0.5})
+        c._substrate.submit_extrinsic.assert_not_called()
+        break
+
+
+@pytest.mark.asyncio
+async def test_submit_stake_requires_wallet(client, mock_settings):
+    """Test that staking without a configured wallet is rejected."""
+    mock_settings.BITTENSOR_WALLET_SEED = ""
+    async for c in client:
+        with pytest.raises(ValueError):
+            await c.submit_stake(MOCK_NETUID, {"5A": 0.5})
+        break
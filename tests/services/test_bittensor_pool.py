@@ -0,0 +1,118 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.services.bittensor_client import BittensorClient
+from app.services.bittensor_pool import BittensorClientPool
+
+MOCK_NETWORK = "test"
+POOL_SIZE = 2
+
+
+def make_mock_client(*args, **kwargs) -> AsyncMock:
+    """Create a mock BittensorClient whose connect/close toggle is_connected."""
+    client = AsyncMock(spec=BittensorClient)
+    client.is_connected = False
+
+    async def connect():
+        client.is_connected = True
+
+    async def close():
+        client.is_connected = False
+
+    client.connect.side_effect = connect
+    client.close.side_effect = close
+    client.health_check.return_value = True
+    return client
+
+
+@pytest.fixture
+def mock_client_cls():
+    """Patch BittensorClient in the pool module with mock clients."""
+    with patch("app.services.bittensor_pool.BittensorClient", side_effect=make_mock_client) as mock:
+        yield mock
+
+
+@pytest.fixture
+async def pool(mock_client_cls):
+    """Create a started BittensorClientPool."""
+    pool = BittensorClientPool(size=POOL_SIZE, network=MOCK_NETWORK, health_check_interval=30)
+    await pool.start()
+    yield pool
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_start_connects_all_clients(mock_client_cls):
+    """Test that starting the pool connects every client once."""
+    pool = BittensorClientPool(size=POOL_SIZE, network=MOCK_NETWORK)
+    await pool.start()
+
+    assert pool.size == POOL_SIZE
+    assert pool.available == POOL_SIZE
+    assert mock_client_cls.call_count == POOL_SIZE
+    for client in pool._clients:
+        client.connect.assert_awaited_once()
+
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_acquire_checks_out_and_checks_in(pool):
+    """Test that a client is unavailable while checked out."""
+    async for p in pool:
+        async with p.acquire() as client:
+            assert client.is_connected
+            assert p.available == POOL_SIZE - 1
+        assert p.available == POOL_SIZE
+        break
+
+
+@pytest.mark.asyncio
+async def test_acquire_reuses_connection(pool):
+    """Test that checkouts do not open new connections."""
+    async for p in pool:
+        for _ in range(5):
+            async with p.acquire():
+                pass
+        for client in p._clients:
+            client.connect.assert_awaited_once()
+            client.health_check.assert_not_called()
+        break
+
+
+@pytest.mark.asyncio
+async def test_acquire_reconnects_dead_client(mock_client_cls):
+    """Test that a client failing its health check is reconnected."""
+    pool = BittensorClientPool(size=1, network=MOCK_NETWORK, health_check_interval=0)
+    await pool.start()
+
+    pool._clients[0].health_check.return_value = False
+    async with pool.acquire() as client:
+        assert client.is_connected
+
+    client.close.assert_awaited()
+    assert client.connect.await_count == 2
+
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_acquire_returns_client_on_error(pool):
+    """Test that a client is checked back in when the caller raises."""
+    async for p in pool:
+        with pytest.raises(ValueError):
+            async with p.acquire():
+                raise ValueError("boom")
+        assert p.available == POOL_SIZE
+        break
+
+
+@pytest.mark.asyncio
+async def test_acquire_after_close(mock_client_cls):
+    """Test that a closed pool refuses checkouts."""
+    pool = BittensorClientPool(size=1, network=MOCK_NETWORK)
+    await pool.start()
+    await pool.close()
+
+    with pytest.raises(RuntimeError, match="Bittensor client pool is closed"):
+        async with pool.acquire():
+            pass
@@ -0,0 +1,85 @@
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+from app.services.block_watcher import BlockWatcher
+
+
+@pytest.fixture
+def mock_pool():
+    """Create a mock BittensorClientPool handing out one client."""
+    pool = MagicMock()
+    pool.client = AsyncMock()
+
+    @asynccontextmanager
+    async def acquire():
+        yield pool.client
+
+    pool.acquire = acquire
+    return pool
+
+
+@pytest.fixture
+def snapshots():
+    """Create a mock SubnetSnapshotStore."""
+    return MagicMock()
+
+
+@pytest.fixture
+def watcher(mock_pool, snapshots):
+    """Create a BlockWatcher."""
+    return BlockWatcher(mock_pool, snapshots, poll_interval=1)
+
+
+@pytest.mark.asyncio
+async def test_first_poll_records_epochs(watcher, mock_pool, snapshots):
+    """Test that the first poll records epoch blocks without invalidating."""
+    mock_pool.client.get_subnet_epoch_blocks.return_value = (100, {1: 90, 2: 95})
+
+    await watcher.poll()
+
+    assert watcher.latest_block == 100
+    assert watcher.epoch_block(1) == 90
+    assert watcher.epoch_block(3) is None
+    snapshots.invalidate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_poll_invalidates_changed_subnets(watcher, mock_pool, snapshots):
+    """Test that only subnets whose epoch ran are invalidated."""
+    mock_pool.client.get_subnet_epoch_blocks.return_value = (100, {1: 90, 2: 95})
+    await watcher.poll()
+
+    mock_pool.client.get_subnet_epoch_blocks.return_value = (101, {1: 101, 2: 95})
+    await watcher.poll()
+
+    assert watcher.epoch_block(1) == 101
+    snapshots.invalidate.assert_called_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_is_outdated(watcher, mock_pool):
+    """Test comparing a read block against the subnet's last epoch."""
+    mock_pool.client.get_subnet_epoch_blocks.return_value = (100, {1: 90})
+    await watcher.poll()
+
+    assert watcher.is_outdated(1, 89) is True
+    assert watcher.is_outdated(1, 90) is False
+    assert watcher.is_outdated(1, None) is None
+    assert watcher.is_outdated(2, 89) is None
+
+
+@pytest.mark.asyncio
+async def test_poll_notifies_listeners(watcher, mock_pool):
+    """Test that listeners receive the new epoch block of changed subnets."""
+    listener = AsyncMock()
+    failing_listener = AsyncMock(side_effect=Exception("boom"))
+    watcher.add_listener(failing_listener)
+    watcher.add_listener(listener)
+    mock_pool.client.get_subnet_epoch_blocks.return_value = (100, {1: 90, 2: 95})
+    await watcher.poll()
+    listener.assert_not_called()
+
+    mock_pool.client.get_subnet_epoch_blocks.return_value = (101, {1: 101, 2: 95})
+    await watcher.poll()
+
+    listener.assert_called_once_with(101, {1: 101})
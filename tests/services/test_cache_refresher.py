@@ -0,0 +1,109 @@
+import asyncio
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+from app.services.cache_refresher import CacheRefresher
+
+
+@pytest.fixture
+def mock_pool():
+    """Create a mock BittensorClientPool handing out one client."""
+    pool = MagicMock()
+    pool.client = AsyncMock()
+
+    @asynccontextmanager
+    async def acquire():
+        yield pool.client
+
+    pool.acquire = acquire
+    return pool
+
+
+@pytest.fixture
+def refresher(mock_pool):
+    """Create a CacheRefresher with a short hot key window."""
+    return CacheRefresher(mock_pool, hot_key_window=60, max_tracked_keys=3)
+
+
+def test_record_access_counts_within_window(refresher):
+    """Test that accesses to a key are counted."""
+    assert refresher.record_access("a") == 1
+    assert refresher.record_access("a") == 2
+    assert refresher.record_access("b") == 1
+
+
+def test_record_access_resets_after_window(mock_pool):
+    """Test that counts restart once the window has passed."""
+    refresher = CacheRefresher(mock_pool, hot_key_window=0.000001, max_tracked_keys=3)
+    refresher.record_access("a")
+    assert refresher.record_access("a") == 1
+
+
+def test_record_access_bounds_tracked_keys(refresher):
+    """Test that at most max_tracked_keys keys are tracked."""
+    for key in "abcde":
+        refresher.record_access(key)
+    assert len(refresher._accesses) <= 3
+
+
+def test_record_access_evicts_oldest_window(refresher):
+    """Test that the key whose window started first is evicted, even if it was read since."""
+    for key in "abc":
+        refresher.record_access(key)
+    refresher.record_access("a")
+    refresher.record_access("d")
+
+    assert list(refresher._accesses) == ["b", "c", "d"]
+    assert refresher.record_access("a") == 1
+
+
+@pytest.mark.asyncio
+async def test_schedule_runs_with_pooled_client(refresher, mock_pool):
+    """Test that a refresh receives a client checked out of the pool."""
+    fn = AsyncMock()
+
+    assert refresher.schedule("a", fn) is True
+    await asyncio.sleep(0.01)
+
+    fn.assert_called_once_with(mock_pool.client)
+    assert refresher.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_schedule_skips_running_key(refresher):
+    """Test that a key already being refreshed is not scheduled twice."""
+    release = asyncio.Event()
+
+    async def fn(client):
+        await release.wait()
+
+    assert refresher.schedule("a", fn) is True
+    assert refresher.schedule("a", fn) is False
+    assert refresher.pending == 1
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert refresher.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_schedule_logs_failures(refresher):
+    """Test that a failing refresh does not raise into the event loop."""
+    fn = AsyncMock(side_effect=Exception("Network error"))
+
+    refresher.schedule("a", fn)
+    await asyncio.sleep(0.01)
+
+    assert refresher.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_running_refreshes(refresher):
+    """Test that closing cancels refreshes still in progress."""
+    async def fn(client):
+        await asyncio.sleep(10)
+
+    refresher.schedule("a", fn)
+    await refresher.close()
+
+    assert refresher.pending == 0
@@ -0,0 +1,81 @@
+import json
+import time
+import pytest
+from app.services.cache_serializer import (
+    DIVIDEND_FIELDS,
+    MSGPACK_FORMAT,
+    DividendStructSerializer,
+    JsonSerializer,
+    MsgpackSerializer,
+    get_serializer,
+    loads,
+)
+
+DIVIDEND_ENTRY = {
+    "dividend": 123456789.0,
+    "stake_tx_triggered": False,
+    "block": 4000000,
+    "snapshot_age_seconds": None,
+    "cached_at": time.time(),
+    "computed_at_block": 3999990,
+}
+SUBNET_BLOB = {"netuid": 1, "block": 4000000, "dividends": {"5A": 1.0, "5B": 2.5}, "cached_at": 1.5}
+
+
+@pytest.mark.parametrize("serializer", [JsonSerializer(), MsgpackSerializer(), DividendStructSerializer()])
+@pytest.mark.parametrize("value", [DIVIDEND_ENTRY, SUBNET_BLOB])
+def test_round_trip(serializer, value):
+    """Test that every serializer's output is read back by loads."""
+    assert loads(serializer.dumps(value)) == value
+
+
+def test_json_is_headerless():
+    """Test that the json serializer writes what workers without format headers read."""
+    assert JsonSerializer().dumps(SUBNET_BLOB) == json.dumps(SUBNET_BLOB).encode()
+
+
+def test_struct_packs_dividend_entries_compactly():
+    """Test the fixed layout of dividend entries and its optional fields."""
+    entry = {**DIVIDEND_ENTRY, "stake_tx_triggered": True, "block": None, "snapshot_age_seconds": 3.5}
+
+    encoded = DividendStructSerializer().dumps(entry)
+
+    assert len(encoded) == 44
+    assert set(entry) == DIVIDEND_FIELDS
+    assert loads(encoded) == entry
+    assert len(encoded) < len(JsonSerializer().dumps(entry)) / 3
+
+
+def test_struct_falls_back_to_msgpack():
+    """Test that values not shaped like a dividend entry are written as MessagePack."""
+    entry = {**DIVIDEND_ENTRY, "extra": 1}
+
+    assert DividendStructSerializer().dumps(entry) == MsgpackSerializer().dumps(entry)
+    assert DividendStructSerializer().dumps({**DIVIDEND_ENTRY, "block": -1}) == MsgpackSerializer().dumps(
+        {**DIVIDEND_ENTRY, "block": -1}
+    )
+
+
+def test_loads_rejects_unknown_versions():
+    """Test that a format version this worker does not know is refused rather than misread."""
+    encoded = bytearray(MsgpackSerializer().dumps(SUBNET_BLOB))
+    encoded[2] = 99
+
+    with pytest.raises(ValueError, match="version 99"):
+        loads(bytes(encoded))
+
+
+def test_get_serializer():
+    assert get_serializer("struct").name == "struct"
+    with pytest.raises(ValueError, match="Unknown cache serializer"):
+        get_serializer("pickle")
+
+
+def test_struct_reads_entries_with_response_body():
+    """Test that version 2 entries, which carry a pre-encoded body, are still readable."""
+    body = '{"netuid":1,"dividend":123456789.0}'
+    encoded = bytearray(DividendStructSerializer().dumps(DIVIDEND_ENTRY) + body.encode())
+    encoded[2] = 2
+
+    assert loads(bytes(encoded)) == {**DIVIDEND_ENTRY, "body": body}
+    assert DividendStructSerializer().dumps({**DIVIDEND_ENTRY, "body": body})[1] == MSGPACK_FORMAT
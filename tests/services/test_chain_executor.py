@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from prometheus_client import CollectorRegistry, Gauge
+from app.services.chain_executor import ChainExecutor
+
+
+@pytest.fixture
+def executor():
+    """Create a ChainExecutor with a single worker thread."""
+    executor = ChainExecutor(max_workers=1, timeout=5)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_returns_result(executor):
+    """Test that the callable's return value is passed back."""
+    result = await executor.run(lambda a, b=0: a + b, 1, b=2)
+    assert result == 3
+    assert executor.stats()["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_does_not_block_event_loop(executor):
+    """Test that a blocking call leaves the event loop free."""
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    await executor.run(time.sleep, 0.2)
+    task.cancel()
+
+    assert ticks > 5
+
+
+@pytest.mark.asyncio
+async def test_run_timeout(executor):
+    """Test that a slow call raises TimeoutError and is counted."""
+    with pytest.raises(TimeoutError, match="timed out"):
+        await executor.run(time.sleep, 0.5, timeout=0.05)
+
+    assert executor.stats()["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_queued_call_abandoned_on_timeout(executor):
+    """Test that a call timing out while queued never runs."""
+    release = threading.Event()
+    ran = threading.Event()
+
+    blocker = asyncio.create_task(executor.run(release.wait))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(TimeoutError):
+        await executor.run(ran.set, timeout=0.05)
+
+    release.set()
+    await blocker
+    await asyncio.sleep(0.05)
+
+    assert not ran.is_set()
+    assert executor.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stats_queue_wait(executor):
+    """Test that queue wait is recorded when all workers are busy."""
+    await asyncio.gather(executor.run(time.sleep, 0.1), executor.run(time.sleep, 0))
+
+    stats = executor.stats()
+    assert stats["calls"] == 2
+    assert stats["queued"] == 0
+    assert stats["running"] == 0
+    assert stats["max_queue_wait_seconds"] >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_queue_depth_exported_to_prometheus(executor):
+    """Test that the queue depth gauge follows calls waiting for a thread."""
+    # The default gauges are process-wide and may still count calls
+    # abandoned by other tests, so this test observes its own
+    registry = CollectorRegistry()
+    queued_gauge = Gauge("queued", "", registry=registry)
+    running_gauge = Gauge("running", "", registry=registry)
+    release = threading.Event()
+
+    with patch("app.services.chain_executor.CHAIN_EXECUTOR_QUEUED", queued_gauge), \
+            patch("app.services.chain_executor.CHAIN_EXECUTOR_RUNNING", running_gauge):
+        blocker = asyncio.create_task(executor.run(release.wait))
+        queued = asyncio.create_task(executor.run(time.sleep, 0))
+        try:
+            await asyncio.sleep(0.05)
+
+            assert registry.get_sample_value("queued") == 1
+            assert registry.get_sample_value("running") == 1
+        finally:
+            release.set()
+            await asyncio.gather(blocker, queued)
+
+    assert registry.get_sample_value("queued") == 0
+    assert registry.get_sample_value("running") == 0
@@ -0,0 +1,214 @@
+import json
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+from app.services.dividend_feed import DividendFeed, FeedSubscription
+from app.services.subnet_snapshot import SubnetSnapshot
+
+VALID_NETUID = 1
+MOCK_BLOCK = 4200000
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands used by the feed."""
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+        self.published = []
+
+    async def get(self, key):
+        value = self.values.get(key)
+        return str(value).encode() if value is not None else None
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+    async def hmget(self, key, fields):
+        stored = self.hashes.get(key, {})
+        return [str(stored[field]).encode() if field in stored else None for field in fields]
+
+    async def hgetall(self, key):
+        return {field.encode(): str(value).encode() for field, value in self.hashes.get(key, {}).items()}
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+    @asynccontextmanager
+    async def pipeline(self, transaction=True):
+        pipe = MagicMock()
+        calls = []
+        pipe.hset = lambda *args, **kwargs: calls.append((self.hset, args, kwargs))
+        pipe.set = lambda *args, **kwargs: calls.append((self.set, args, kwargs))
+        pipe.publish = lambda *args, **kwargs: calls.append((self.publish, args, kwargs))
+
+        async def execute():
+            for fn, args, kwargs in calls:
+                result = fn(*args, **kwargs)
+                if hasattr(result, "__await__"):
+                    await result
+
+        pipe.execute = execute
+        yield pipe
+
+
+@pytest.fixture
+def redis():
+    """Create an empty fake Redis."""
+    return FakeRedis()
+
+
+@pytest.fixture
+def snapshots():
+    """Create a mock SubnetSnapshotStore returning one subnet."""
+    store = MagicMock()
+    store.get = AsyncMock(return_value=SubnetSnapshot(
+        netuid=VALID_NETUID, block=MOCK_BLOCK, dividends={"5A": 1.0, "5B": 2.0}
+    ))
+    return store
+
+
+@pytest.fixture
+def mock_pool():
+    """Create a mock BittensorClientPool handing out one client."""
+    pool = MagicMock()
+
+    @asynccontextmanager
+    async def acquire():
+        yield AsyncMock()
+
+    pool.acquire = acquire
+    return pool
+
+
+@pytest.fixture
+def feed(redis, mock_pool, snapshots):
+    """Create a DividendFeed on fake Redis."""
+    return DividendFeed(redis, mock_pool, snapshots, channel_prefix="feed", max_queued=10)
+
+
+def drain(subscription: FeedSubscription) -> list:
+    """Take every queued message of a subscription."""
+    messages = []
+    while not subscription.queue.empty():
+        messages.append(subscription.queue.get_nowait())
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_watch_seeds_unpublished_subnet(feed, redis, snapshots):
+    """Test that watching a never-published subnet reads and publishes it once."""
+    subscription = feed.open()
+
+    await feed.watch(subscription, [(VALID_NETUID, "5A")])
+
+    snapshots.get.assert_called_once()
+    channel, message = redis.published[0]
+    assert channel == "feed:updates:1"
+    assert json.loads(message) == {"netuid": 1, "block": MOCK_BLOCK, "changes": {"5A": 1.0, "5B": 2.0}}
+    assert feed.watched_netuids == {VALID_NETUID}
+
+
+@pytest.mark.asyncio
+async def test_watch_pushes_last_published_value(feed, redis, snapshots):
+    """Test that a subnet already published is served from Redis without a chain read."""
+    redis.values["feed:block:1"] = MOCK_BLOCK
+    redis.hashes["feed:last:1"] = {"5A": 1.5}
+    subscription = feed.open()
+
+    await feed.watch(subscription, [(VALID_NETUID, "5A"), (VALID_NETUID, "5Z")])
+
+    snapshots.get.assert_not_called()
+    assert drain(subscription) == [
+        {"type": "update", "netuid": 1, "hotkey": "5A", "dividend": 1.5, "block": MOCK_BLOCK}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_publish_changes_only_changed_hotkeys(feed, redis):
+    """Test that only changed and removed hotkeys are published, once per claim."""
+    redis.hashes["feed:last:1"] = {"5A": 1.0, "5B": 3.0, "5C": 4.0}
+
+    changes = await feed.publish_changes(VALID_NETUID, "epoch:1:100")
+    again = await feed.publish_changes(VALID_NETUID, "epoch:1:100")
+
+    assert changes == {"5B": 2.0, "5C": 0.0}
+    assert again is None
+    assert len(redis.published) == 1
+
+
+@pytest.mark.asyncio
+async def test_publish_changes_releases_claim_on_failure(feed, redis, snapshots):
+    """Test that a failed read releases its claim so the epoch can be read again."""
+    snapshots.get.side_effect = [TimeoutError("pool exhausted"), snapshots.get.return_value]
+
+    with pytest.raises(TimeoutError):
+        await feed.publish_changes(VALID_NETUID, "epoch:1:100")
+    changes = await feed.publish_changes(VALID_NETUID, "epoch:1:100")
+
+    assert changes == {"5A": 1.0, "5B": 2.0}
+
+
+@pytest.mark.asyncio
+async def test_watch_reports_failed_seed(feed, snapshots):
+    """Test that a subnet that cannot be read is reported and its pairs stay watched."""
+    snapshots.get.side_effect = RuntimeError("chain unavailable")
+    subscription = feed.open()
+
+    await feed.watch(subscription, [(VALID_NETUID, "5A")])
+
+    [message] = drain(subscription)
+    assert (message["type"], message["netuid"]) == ("error", VALID_NETUID)
+    assert feed.watched_netuids == {VALID_NETUID}
+
+
+@pytest.mark.asyncio
+async def test_on_epochs_skips_unwatched_subnets(feed, snapshots):
+    """Test that epochs of subnets nobody watches are not read."""
+    await feed.on_epochs(MOCK_BLOCK, {2: MOCK_BLOCK})
+    snapshots.get.assert_not_called()
+
+
+def test_handle_fans_out_to_watchers(feed):
+    """Test that a published change set reaches only subscriptions watching it."""
+    watching, other = feed.open(), feed.open()
+    feed._watchers[(VALID_NETUID, "5A")] = {watching}
+    feed._watchers[(VALID_NETUID, "5Z")] = {other}
+
+    queued = feed.handle(json.dumps({"netuid": 1, "block": MOCK_BLOCK, "changes": {"5A": 2.0}}))
+
+    assert queued == 1
+    assert drain(watching)[0]["dividend"] == 2.0
+    assert drain(other) == []
+    assert feed.handle(b"not json") == 0
+
+
+@pytest.mark.asyncio
+async def test_close_drops_pairs(feed, redis):
+    """Test that closing a subscription forgets its pairs."""
+    redis.values["feed:block:1"] = MOCK_BLOCK
+    subscription = feed.open()
+    await feed.watch(subscription, [(VALID_NETUID, "5A")])
+
+    feed.close(subscription)
+
+    assert feed.watched_netuids == set()
+    assert feed._watchers == {}
+
+
+def test_slow_subscription_drops_oldest():
+    """Test that a full queue drops the oldest message."""
+    subscription = FeedSubscription(max_queued=2)
+    for index in range(3):
+        subscription.push({"index": index})
+
+    assert drain(subscription) == [{"index": 1}, {"index": 2}]
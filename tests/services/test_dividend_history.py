@@ -0,0 +1,59 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.services.dividend_history import DividendHistoryWriter
+
+MOCK_BLOCK = 4200000
+
+
+@pytest.fixture
+def mock_connection():
+    """Create a mock asyncpg connection."""
+    connection = MagicMock()
+    connection.execute = AsyncMock(return_value="INSERT 0 2")
+    connection.copy_records_to_table = AsyncMock()
+    transaction = MagicMock()
+    transaction.__aenter__ = AsyncMock()
+    transaction.__aexit__ = AsyncMock(return_value=False)
+    connection.transaction = MagicMock(return_value=transaction)
+    return connection
+
+
+@pytest.fixture
+def writer(mock_connection):
+    """Create a DividendHistoryWriter with small partitions."""
+    return DividendHistoryWriter(mock_connection, partition_blocks=1000)
+
+
+@pytest.mark.asyncio
+async def test_ensure_partition_once(writer, mock_connection):
+    """Test that a partition is created once per block range."""
+    assert await writer.ensure_partition(4200500) == "dividend_history_4200000"
+    await writer.ensure_partition(4200999)
+
+    mock_connection.execute.assert_called_once_with(
+        "CREATE TABLE IF NOT EXISTS dividend_history_4200000 PARTITION OF dividend_history "
+        "FOR VALUES FROM (4200000) TO (4201000)"
+    )
+
+
+@pytest.mark.asyncio
+async def test_write_copies_through_staging(writer, mock_connection):
+    """Test that rows are copied into staging and moved skipping duplicates."""
+    written = await writer.write(MOCK_BLOCK, 1, [("5A", 1.0), ("5B", 2.0)])
+
+    assert written == 2
+    mock_connection.copy_records_to_table.assert_called_once_with(
+        "dividend_history_staging",
+        records=[(1, "5A", MOCK_BLOCK, 1.0), (1, "5B", MOCK_BLOCK, 2.0)],
+        columns=["netuid", "hotkey", "block", "value"]
+    )
+    insert = mock_connection.execute.call_args.args[0]
+    assert insert.startswith("INSERT INTO dividend_history")
+    assert insert.endswith("ON CONFLICT DO NOTHING")
+
+
+@pytest.mark.asyncio
+async def test_write_empty_page(writer, mock_connection):
+    """Test that an empty page does not touch the database."""
+    assert await writer.write(MOCK_BLOCK, 1, []) == 0
+    mock_connection.execute.assert_not_called()
@@ -0,0 +1,58 @@
+import json
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+from app.services.dividends_export import DividendsExportService
+
+PAGES = [
+    (4200000, 1, [("5A", 1.0), ("5B", 2.0)]),
+    (4200000, 2, [("5C", 3.0)]),
+]
+
+
+@pytest.fixture
+def mock_pool():
+    """Create a mock BittensorClientPool whose client yields two pages."""
+    pool = MagicMock()
+    pool.client = MagicMock()
+
+    async def iter_network_dividends():
+        for page in PAGES:
+            yield page
+
+    pool.client.iter_network_dividends = iter_network_dividends
+
+    @asynccontextmanager
+    async def acquire():
+        yield pool.client
+
+    pool.acquire = acquire
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_stream_ndjson(mock_pool):
+    """Test that each page becomes one chunk of JSON lines."""
+    service = DividendsExportService(mock_pool)
+
+    chunks = [chunk async for chunk in service.stream("ndjson")]
+
+    assert len(chunks) == 2
+    rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert rows[0] == {"block": 4200000, "netuid": 1, "hotkey": "5A", "dividend": 1.0}
+    assert [row["hotkey"] for row in rows] == ["5A", "5B", "5C"]
+
+
+@pytest.mark.asyncio
+async def test_stream_csv(mock_pool):
+    """Test that CSV output starts with a header row."""
+    service = DividendsExportService(mock_pool)
+
+    body = "".join([chunk async for chunk in service.stream("csv")])
+
+    assert body.splitlines() == [
+        "block,netuid,hotkey,dividend",
+        "4200000,1,5A,1.0",
+        "4200000,1,5B,2.0",
+        "4200000,2,5C,3.0",
+    ]
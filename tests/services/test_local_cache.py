@@ -0,0 +1,81 @@
+import json
+import pytest
+from unittest.mock import patch
+from prometheus_client import REGISTRY
+from app.services.local_cache import CacheInvalidationListener, CacheStats, LocalCache
+
+
+@pytest.fixture
+def local_cache():
+    """Create a small LocalCache."""
+    return LocalCache(max_size=2, ttl=5)
+
+
+def test_get_and_set(local_cache):
+    """Test storing and reading a value."""
+    local_cache.set("a", "1")
+    assert local_cache.get("a") == "1"
+    assert local_cache.get("b") is None
+
+
+def test_evicts_least_recently_used(local_cache):
+    """Test that the least recently used entry is evicted when full."""
+    local_cache.set("a", "1")
+    local_cache.set("b", "2")
+    local_cache.get("a")
+    local_cache.set("c", "3")
+
+    assert local_cache.get("a") == "1"
+    assert local_cache.get("b") is None
+    assert len(local_cache) == 2
+
+
+def test_entries_expire(local_cache):
+    """Test that entries are not served after their TTL."""
+    with patch("app.services.local_cache.time.monotonic", return_value=100.0):
+        local_cache.set("a", "1")
+    with patch("app.services.local_cache.time.monotonic", return_value=106.0):
+        assert local_cache.get("a") is None
+    assert len(local_cache) == 0
+
+
+def test_stats_snapshot():
+    """Test hit ratios computed per tier."""
+    stats = CacheStats()
+    stats.record("l1", True, 3)
+    stats.record("l1", False)
+
+    snapshot = stats.snapshot()
+    assert snapshot["l1"] == {"hits": 3, "misses": 1, "hit_ratio": 0.75}
+    assert snapshot["redis"] == {"hits": 0, "misses": 0, "hit_ratio": 0.0}
+
+
+def test_stats_exported_to_prometheus():
+    """Test that recorded lookups are counted per tier and result."""
+    labels = {"tier": "redis", "result": "miss"}
+    before = REGISTRY.get_sample_value("tao_watch_cache_lookups_total", labels) or 0.0
+
+    CacheStats().record("redis", False, 2)
+
+    assert REGISTRY.get_sample_value("tao_watch_cache_lookups_total", labels) == before + 2
+
+
+def test_listener_evicts_keys_from_other_workers(local_cache):
+    """Test that invalidations from other processes evict local entries."""
+    local_cache.set("a", "1")
+    listener = CacheInvalidationListener(None, local_cache, channel="test")
+
+    listener.handle(json.dumps({"origin": "other", "keys": ["a"]}))
+
+    assert local_cache.get("a") is None
+
+
+def test_listener_ignores_own_invalidations(local_cache):
+    """Test that a process keeps entries it wrote itself."""
+    local_cache.set("a", "1")
+    listener = CacheInvalidationListener(None, local_cache, channel="test")
+
+    listener.handle(json.dumps({"origin": local_cache.instance_id, "keys": ["a"]}))
+    listener.handle(b"not json")
+
+    assert local_cache.get("a") == "1"
@@ -1,6 +1,8 @@
 import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock
+from app.services.cache_serializer import MsgpackSerializer
+from app.services.local_cache import CacheStats, LocalCache
 from app.services.redis_cache import RedisCache
 
 @pytest.fixture
@@ -27,7 +29,7 @@ async def test_get_cache_hit(cache, mock_redis):
     result = await cache.get("test", "key1", "key2")
     
     # Assert
-    assert result == '{"test": "value"}'
+    assert result == {"test": "value"}
     mock_redis.get.assert_called_once_with("test:key1:key2")
 
 @pytest.mark.asyncio
@@ -70,7 +72,7 @@ async def test_set_cache_success(cache, mock_redis):
     assert result is True
     mock_redis.set.assert_called_once_with(
         "test:key1",
-        json.dumps(value),
+        json.dumps(value).encode(),
         ex=120  # Default expiration from settings
     )
 
@@ -111,4 +113,228 @@ async def test_delete_cache_error(cache, mock_redis):
     
     # Assert
     assert result is False
-    mock_redis.delete.assert_called_once_with("test:key1") 
\ No newline at end of file
+    mock_redis.delete.assert_called_once_with("test:key1") 
+@pytest.mark.asyncio
+async def test_get_many(cache, mock_redis):
+    """Test getting several values with one MGET."""
+    # Setup
+    mock_redis.mget = AsyncMock(return_value=[b'{"test": "value"}', None])
+    
+    # Execute
+    result = await cache.get_many("test", [(1, "a"), (2, "b")])
+    
+    # Assert
+    assert result == [{"test": "value"}, None]
+    mock_redis.mget.assert_called_once_with(["test:1:a", "test:2:b"])
+
+@pytest.mark.asyncio
+async def test_get_many_error(cache, mock_redis):
+    """Test getting several values when Redis errors."""
+    # Setup
+    mock_redis.mget = AsyncMock(side_effect=Exception("Redis error"))
+    
+    # Execute
+    result = await cache.get_many("test", [(1, "a"), (2, "b")])
+    
+    # Assert
+    assert result == [None, None]
+
+@pytest.mark.asyncio
+async def test_set_many(cache, mock_redis):
+    """Test setting several values in one pipeline."""
+    # Setup
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[True, True])
+    pipeline_context = MagicMock()
+    pipeline_context.__aenter__ = AsyncMock(return_value=pipe)
+    pipeline_context.__aexit__ = AsyncMock(return_value=False)
+    mock_redis.pipeline = MagicMock(return_value=pipeline_context)
+    
+    # Execute
+    result = await cache.set_many("test", {(1, "a"): {"v": 1}, (2, "b"): {"v": 2}})
+    
+    # Assert
+    assert result is True
+    mock_redis.pipeline.assert_called_once_with(transaction=False)
+    pipe.set.assert_any_call("test:1:a", json.dumps({"v": 1}).encode(), ex=120)
+    pipe.set.assert_any_call("test:2:b", json.dumps({"v": 2}).encode(), ex=120)
+    pipe.execute.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_set_many_empty(cache, mock_redis):
+    """Test that an empty batch does not touch Redis."""
+    mock_redis.pipeline = MagicMock()
+    
+    result = await cache.set_many("test", {})
+    
+    assert result is True
+    mock_redis.pipeline.assert_not_called()
+
+def test_lock(cache, mock_redis):
+    """Test creating a distributed lock for a key."""
+    mock_redis.lock = MagicMock(return_value="lock")
+    
+    result = cache.lock("test_lock", 1, "a", timeout=30)
+    
+    assert result == "lock"
+    mock_redis.lock.assert_called_once_with("test_lock:1:a", timeout=30)
+
+@pytest.fixture
+def layered_cache(mock_redis):
+    """Create a RedisCache fronted by a local cache."""
+    return RedisCache(mock_redis, LocalCache(max_size=10, ttl=60), CacheStats())
+
+@pytest.mark.asyncio
+async def test_get_served_from_local_cache(layered_cache, mock_redis):
+    """Test that a Redis hit is kept locally and answers the next lookup."""
+    mock_redis.get.return_value = b'{"test": "value"}'
+    
+    assert await layered_cache.get("test", "key1") == {"test": "value"}
+    assert await layered_cache.get("test", "key1") == {"test": "value"}
+    
+    mock_redis.get.assert_called_once_with("test:key1")
+    stats = layered_cache._stats.snapshot()
+    assert stats["l1"]["hits"] == 1
+    assert stats["l1"]["misses"] == 1
+    assert stats["redis"]["hits"] == 1
+
+@pytest.mark.asyncio
+async def test_get_many_only_fetches_local_misses(layered_cache, mock_redis):
+    """Test that MGET is only sent for keys missing from the local cache."""
+    layered_cache._local.set("test:1:a", {"v": 1})
+    mock_redis.mget = AsyncMock(return_value=[b'{"v": 2}'])
+    
+    result = await layered_cache.get_many("test", [(1, "a"), (2, "b")])
+    
+    assert result == [{"v": 1}, {"v": 2}]
+    mock_redis.mget.assert_called_once_with(["test:2:b"])
+
+@pytest.mark.asyncio
+async def test_set_updates_local_cache_and_publishes(layered_cache, mock_redis):
+    """Test that a write is kept locally and announced to other workers."""
+    result = await layered_cache.set({"test": "value"}, "test", "key1")
+    
+    assert result is True
+    assert layered_cache._local.get("test:key1") == {"test": "value"}
+    channel, message = mock_redis.publish.call_args.args
+    assert json.loads(message) == {
+        "origin": layered_cache._local.instance_id,
+        "keys": ["test:key1"],
+    }
+
+@pytest.mark.asyncio
+async def test_delete_evicts_local_cache(layered_cache, mock_redis):
+    """Test that deleting a key also evicts it locally."""
+    layered_cache._local.set("test:key1", "value")
+    
+    await layered_cache.delete("test", "key1")
+    
+    assert layered_cache._local.get("test:key1") is None
+    mock_redis.publish.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_set_uses_serializer_and_get_reads_any_format(mock_redis):
+    """Test that writes use the configured serializer and reads detect the format."""
+    cache = RedisCache(mock_redis, serializer=MsgpackSerializer())
+    
+    await cache.set({"test": "value"}, "test", "key1")
+    
+    stored = mock_redis.set.call_args.args[1]
+    assert stored == MsgpackSerializer().dumps({"test": "value"})
+    mock_redis.get.return_value = stored
+    assert await cache.get("test", "key1") == {"test": "value"}
+    mock_redis.get.return_value = b'{"test": "legacy"}'
+    assert await cache.get("test", "key1") == {"test": "legacy"}
+
+@pytest.mark.asyncio
+async def test_get_unreadable_format_is_miss(cache, mock_redis):
+    """Test that a value written in an unknown format version counts as a miss."""
+    mock_redis.get.return_value = b"\x00\x01\x63payload"
+    
+    assert await cache.get("test", "key1") is None
+
+def mock_pipeline(mock_redis, replies):
+    """Make mock_redis.pipeline() yield a pipe whose execute returns replies."""
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=replies)
+    pipeline_context = MagicMock()
+    pipeline_context.__aenter__ = AsyncMock(return_value=pipe)
+    pipeline_context.__aexit__ = AsyncMock(return_value=False)
+    mock_redis.pipeline = MagicMock(return_value=pipeline_context)
+    return pipe
+
+@pytest.mark.asyncio
+async def test_get_fields(layered_cache, mock_redis):
+    """Test that hash fields missing locally are read with one pipelined HMGET per hash."""
+    layered_cache._local.set("test:1:a", {"v": 1})
+    pipe = mock_pipeline(mock_redis, [[b'{"v": 2}', None], [b'{"v": 3}']])
+    
+    result = await layered_cache.get_fields("test", {(1,): ["a", "b", "c"], (2,): ["d"]})
+    
+    assert result == {(1,): [{"v": 1}, {"v": 2}, None], (2,): [{"v": 3}]}
+    pipe.hmget.assert_any_call("test:1", ["b", "c"])
+    pipe.hmget.assert_any_call("test:2", ["d"])
+    assert layered_cache._local.get("test:1:b") == {"v": 2}
+
+@pytest.mark.asyncio
+async def test_get_all_fields(cache, mock_redis):
+    """Test reading a whole hash with HGETALL."""
+    mock_redis.hgetall = AsyncMock(return_value={b"a": b"1.5", b"_block": b"100"})
+    
+    result = await cache.get_all_fields("test", 1)
+    
+    assert result == {"a": 1.5, "_block": 100}
+    mock_redis.hgetall.assert_called_once_with("test:1")
+
+@pytest.mark.asyncio
+async def test_set_fields(layered_cache, mock_redis):
+    """Test that hash fields are written, kept locally and only set a TTL on hashes that have none."""
+    pipe = mock_pipeline(mock_redis, [1, True])
+    
+    result = await layered_cache.set_fields("test", {(1,): {"a": {"v": 1}}, (2,): {}})
+    
+    assert result is True
+    pipe.hset.assert_called_once_with("test:1", mapping={"a": json.dumps({"v": 1}).encode()})
+    pipe.expire.assert_called_once_with("test:1", 120, nx=True)
+    assert layered_cache._local.get("test:1:a") == {"v": 1}
+    assert json.loads(mock_redis.publish.call_args.args[1])["keys"] == ["test:1:a"]
+
+@pytest.mark.asyncio
+async def test_replace_hash_renames_staged_copy(layered_cache, mock_redis):
+    """Test that a hash is written under a staging key and renamed over the old one in one MULTI."""
+    layered_cache._local.set("test:1:a", {"v": 0})
+    layered_cache._local.set("test:1:gone", {"v": 0})
+    pipe = mock_pipeline(mock_redis, [[b"a", b"gone"], 2, True, True])
+    
+    result = await layered_cache.replace_hash("test", (1,), {"a": 1.0, "_block": 100})
+    
+    assert result is True
+    mock_redis.pipeline.assert_called_once_with(transaction=True)
+    staging_key = pipe.hset.call_args.args[0]
+    assert staging_key.startswith("test:1:staging:")
+    assert pipe.hset.call_args.kwargs["mapping"] == {"a": b"1.0", "_block": b"100"}
+    pipe.expire.assert_called_once_with(staging_key, 120)
+    pipe.rename.assert_called_once_with(staging_key, "test:1")
+    assert layered_cache._local.get("test:1:a") is None
+    assert layered_cache._local.get("test:1:gone") is None
+    assert set(json.loads(mock_redis.publish.call_args.args[1])["keys"]) == {"test:1:a", "test:1:_block", "test:1:gone"}
+
+@pytest.mark.asyncio
+async def test_replace_hash_with_no_fields_deletes_hash(layered_cache, mock_redis):
+    """Test that replacing a hash with nothing deletes it and evicts every local field copy."""
+    layered_cache._local.set("test:1:a", {"v": 0})
+    pipe = mock_pipeline(mock_redis, [[b"a"], 1])
+    
+    assert await layered_cache.replace_hash("test", (1,), {}) is True
+    
+    pipe.delete.assert_called_once_with("test:1")
+    pipe.rename.assert_not_called()
+    assert layered_cache._local.get("test:1:a") is None
+
+@pytest.mark.asyncio
+async def test_replace_hash_error(cache, mock_redis):
+    """Test that a failed swap leaves the old hash and reports failure."""
+    pipe = mock_pipeline(mock_redis, [])
+    pipe.execute.side_effect = Exception("Redis error")
+    
+    assert await cache.replace_hash("test", (1,), {"a": 1.0}) is False
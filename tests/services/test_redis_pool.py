@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from redis.asyncio import BlockingConnectionPool
+from app.services.redis_pool import InstrumentedConnectionPool, create_redis_pool
+
+
+@pytest.fixture
+def pool():
+    """Create an InstrumentedConnectionPool that never touches the network."""
+    return InstrumentedConnectionPool(max_connections=5, timeout=1)
+
+
+def test_stats_empty_pool(pool):
+    """Test statistics of a pool that has not handed out connections."""
+    stats = pool.stats()
+    assert stats["max_connections"] == 5
+    assert stats["in_use"] == 0
+    assert stats["idle"] == 0
+    assert stats["acquisitions"] == 0
+    assert stats["avg_wait_seconds"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_get_connection_records_wait(pool):
+    """Test that checkouts are counted and timed."""
+    connection = MagicMock()
+    with patch.object(BlockingConnectionPool, "get_connection", AsyncMock(return_value=connection)):
+        result = await pool.get_connection()
+
+    assert result is connection
+    stats = pool.stats()
+    assert stats["acquisitions"] == 1
+    assert stats["max_wait_seconds"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_drain_disconnects(pool):
+    """Test that draining an idle pool disconnects it."""
+    pool.disconnect = AsyncMock()
+    await pool.drain(timeout=0)
+    pool.disconnect.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_drain_waits_for_in_use_connections(pool):
+    """Test that connections still in use after the timeout are disconnected anyway."""
+    pool.disconnect = AsyncMock()
+    pool._in_use_connections.add(MagicMock())
+    await pool.drain(timeout=0.1)
+    pool.disconnect.assert_called_once()
+
+
+def test_create_redis_pool_uses_settings():
+    """Test that the shared pool is sized from settings."""
+    with patch("app.services.redis_pool.settings") as mock_settings:
+        mock_settings.REDIS_URI = "redis://localhost:6379/0"
+        mock_settings.REDIS_POOL_MAX_CONNECTIONS = 7
+        mock_settings.REDIS_POOL_TIMEOUT_SECONDS = 2
+        pool = create_redis_pool()
+
+    assert isinstance(pool, InstrumentedConnectionPool)
+    assert pool.max_connections == 7
+    assert pool.timeout == 2
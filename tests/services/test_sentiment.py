@@ -0,0 +1,69 @@
+import json
+import httpx
+import pytest
+from app.services.sentiment import ChutesSentimentScorer, DaturaTweetSource
+
+
+def stub_service(handler) -> httpx.AsyncClient:
+    """Create an HTTP client whose requests are answered by a local stub."""
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_datura_search_returns_tweet_texts():
+    """Test that tweet texts are extracted from the search response."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=[{"text": "sn1 is great"}, {"text": ""}, {"text": "sn1 up"}])
+
+    async with stub_service(handler) as http:
+        source = DaturaTweetSource(http, api_key="datura-key", url="http://stub/twitter")
+        texts = await source.search("Bittensor netuid 1", 20)
+
+    assert texts == ["sn1 is great", "sn1 up"]
+    assert requests[0].headers["Authorization"] == "datura-key"
+    assert json.loads(requests[0].content) == {"query": "Bittensor netuid 1", "count": 20}
+
+
+@pytest.mark.asyncio
+async def test_datura_search_raises_on_error_status():
+    """Test that a failed search is raised rather than read as no tweets."""
+    async with stub_service(lambda request: httpx.Response(500)) as http:
+        source = DaturaTweetSource(http, api_key="datura-key", url="http://stub/twitter")
+        with pytest.raises(httpx.HTTPStatusError):
+            await source.search("Bittensor netuid 1", 20)
+
+
+@pytest.mark.asyncio
+async def test_chutes_score_sends_all_texts_in_one_request():
+    """Test that every text is scored by one completion request."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Score: 150"}}]})
+
+    async with stub_service(handler) as http:
+        scorer = ChutesSentimentScorer(http, api_key="chutes-key", url="http://stub/chat", model="stub-model")
+        score = await scorer.score(["first tweet", "second tweet"])
+
+    # Clamped to the scale
+    assert score == 100.0
+    assert len(requests) == 1
+    body = json.loads(requests[0].content)
+    assert body["model"] == "stub-model"
+    assert "first tweet" in body["messages"][0]["content"]
+    assert "second tweet" in body["messages"][0]["content"]
+    assert requests[0].headers["Authorization"] == "Bearer chutes-key"
+
+
+@pytest.mark.asyncio
+async def test_chutes_score_rejects_reply_without_number():
+    """Test that a reply without a score is an error."""
+    reply = {"choices": [{"message": {"content": "I cannot tell"}}]}
+    async with stub_service(lambda request: httpx.Response(200, json=reply)) as http:
+        scorer = ChutesSentimentScorer(http, api_key="chutes-key", url="http://stub/chat")
+        with pytest.raises(ValueError):
+            await scorer.score(["tweet"])
@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from app.services.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_do_shares_concurrent_calls():
+    """Test that concurrent callers with the same key share one call."""
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "value"
+
+    results = await asyncio.gather(*(single_flight.do("key", fetch) for _ in range(10)))
+
+    assert results == ["value"] * 10
+    assert calls == 1
+    assert single_flight.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_do_different_keys_run_separately():
+    """Test that different keys are not deduplicated."""
+    single_flight = SingleFlight()
+    fetch = AsyncMock(return_value="value")
+
+    await asyncio.gather(single_flight.do("a", fetch), single_flight.do("b", fetch))
+
+    assert fetch.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_do_sequential_calls_run_again():
+    """Test that a finished call is not reused by later callers."""
+    single_flight = SingleFlight()
+    fetch = AsyncMock(return_value="value")
+
+    await single_flight.do("key", fetch)
+    await single_flight.do("key", fetch)
+
+    assert fetch.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_do_propagates_exception_to_all_callers():
+    """Test that every waiting caller receives the shared exception."""
+    single_flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        raise ValueError("chain error")
+
+    results = await asyncio.gather(
+        *(single_flight.do("key", fetch) for _ in range(3)),
+        return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert single_flight.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_do_cancelled_caller_does_not_abort_others():
+    """Test that cancelling the first caller leaves the shared call running."""
+    single_flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "value"
+
+    first = asyncio.create_task(single_flight.do("key", fetch))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(single_flight.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "value"
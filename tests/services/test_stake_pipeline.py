@@ -0,0 +1,208 @@
+import pytest
+from typing import Dict, List
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.services.stake_pipeline import StakeJobQueue, StakePipeline, StakeSubmissionQueue
+
+MOCK_NETUID = 1
+
+
+def mock_redis(results: list) -> MagicMock:
+    """Create a mock Redis client whose pipeline returns results."""
+    redis = MagicMock()
+    redis.delete = AsyncMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=results)
+    pipeline_context = MagicMock()
+    pipeline_context.__aenter__ = AsyncMock(return_value=pipe)
+    pipeline_context.__aexit__ = AsyncMock(return_value=False)
+    redis.pipeline = MagicMock(return_value=pipeline_context)
+    redis.pipe = pipe
+    return redis
+
+
+class StubTweets:
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.queries: List[str] = []
+
+    async def search(self, query: str, count: int) -> List[str]:
+        self.queries.append(query)
+        return self.texts
+
+
+class StubScorer:
+    def __init__(self, score: float):
+        self.value = score
+        self.calls = 0
+
+    async def score(self, texts: List[str]) -> float:
+        self.calls += 1
+        return self.value
+
+
+class StubSubmitter:
+    def __init__(self):
+        self.submitted: List[Dict[str, float]] = []
+
+    async def submit_stake(self, netuid: int, amounts: Dict[str, float]) -> str:
+        self.submitted.append(amounts)
+        return "0xhash"
+
+
+@pytest.mark.asyncio
+async def test_enqueue_schedules_first_job_of_window():
+    """Test that the first job of a subnet schedules its batch after the debounce delay."""
+    redis = mock_redis([1, True, True])
+    dispatch = MagicMock()
+
+    queued = await StakeJobQueue(redis, dispatch, debounce=5.0, prefix="test").enqueue(MOCK_NETUID, "5A")
+
+    assert queued is True
+    redis.pipe.sadd.assert_called_once_with("test:pending:1", "5A")
+    dispatch.assert_called_once_with(MOCK_NETUID, 5.0)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_joins_scheduled_batch():
+    """Test that later jobs of a window join the scheduled batch."""
+    redis = mock_redis([1, True, None])
+    dispatch = MagicMock()
+
+    queued = await StakeJobQueue(redis, dispatch, prefix="test").enqueue(MOCK_NETUID, "5B")
+
+    assert queued is True
+    dispatch.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_releases_schedule_when_dispatch_fails():
+    """Test that a failed dispatch lets the next job schedule the batch."""
+    redis = mock_redis([1, True, True])
+    dispatch = MagicMock(side_effect=ConnectionError("broker down"))
+
+    queued = await StakeJobQueue(redis, dispatch, prefix="test").enqueue(MOCK_NETUID, "5A")
+
+    assert queued is False
+    redis.delete.assert_called_once_with("test:scheduled:1")
+
+
+@pytest.mark.asyncio
+async def test_take_drains_pending_jobs():
+    """Test that the pending hotkeys and schedule marker are taken together."""
+    redis = mock_redis([{b"5B", b"5A"}, 2])
+
+    hotkeys = await StakeJobQueue(redis, MagicMock(), prefix="test").take(MOCK_NETUID)
+
+    assert hotkeys == ["5A", "5B"]
+    redis.pipeline.assert_called_once_with(transaction=True)
+    redis.pipe.delete.assert_called_once_with("test:pending:1", "test:scheduled:1")
+
+
+@pytest.mark.asyncio
+async def test_pipeline_batches_hotkeys_into_one_extrinsic():
+    """Test that a batch makes one sentiment call and one stake submission."""
+    tweets, scorer, submitter = StubTweets(["up only"]), StubScorer(50.0), StubSubmitter()
+
+    result = await StakePipeline(tweets, scorer, submitter, tao_per_point=0.01).run(MOCK_NETUID, ["5A", "5B"])
+
+    assert scorer.calls == 1
+    assert len(tweets.queries) == 1
+    assert submitter.submitted == [{"5A": 0.5, "5B": 0.5}]
+    assert result["sentiment"] == 50.0
+    assert result["submission"] == "0xhash"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_unstakes_on_negative_sentiment():
+    """Test that negative sentiment submits negative amounts."""
+    submitter = StubSubmitter()
+
+    await StakePipeline(StubTweets(["down"]), StubScorer(-20.0), submitter, tao_per_point=0.01).run(
+        MOCK_NETUID, ["5A"]
+    )
+
+    assert submitter.submitted == [{"5A": -0.2}]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_stake_without_signal():
+    """Test that nothing is submitted without tweets or with neutral sentiment."""
+    submitter = StubSubmitter()
+    scorer = StubScorer(0.0)
+
+    no_tweets = await StakePipeline(StubTweets([]), scorer, submitter).run(MOCK_NETUID, ["5A"])
+    neutral = await StakePipeline(StubTweets(["meh"]), scorer, submitter).run(MOCK_NETUID, ["5A"])
+
+    assert no_tweets["submission"] is None
+    assert neutral["submission"] is None
+    assert scorer.calls == 1
+    assert submitter.submitted == []
+
+
+@pytest.mark.asyncio
+async def test_submission_schedules_first_change_of_window():
+    """Test that the first change of a window schedules a submission under its task id."""
+    redis = mock_redis([50_000_000, True, True, b"unused"])
+    dispatch = MagicMock()
+
+    task_id = await StakeSubmissionQueue(redis, dispatch, window=6.0, prefix="test").submit_stake(
+        MOCK_NETUID, {"5A": 0.05}
+    )
+
+    redis.pipe.hincrby.assert_called_once_with("test:amounts:1", "5A", 50_000_000)
+    dispatch.assert_called_once_with(MOCK_NETUID, task_id, 6.0)
+
+
+@pytest.mark.asyncio
+async def test_submission_joins_scheduled_window():
+    """Test that later changes of a window return the scheduled task id."""
+    redis = mock_redis([-20_000_000, True, None, b"scheduled-id"])
+    dispatch = MagicMock()
+
+    task_id = await StakeSubmissionQueue(redis, dispatch, prefix="test").submit_stake(
+        MOCK_NETUID, {"5A": -0.02}
+    )
+
+    assert task_id == "scheduled-id"
+    dispatch.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_submission_take_nets_amounts():
+    """Test that pending amounts are taken as net TAO without cancelled hotkeys."""
+    redis = mock_redis([{b"5A": b"30000000", b"5B": b"0", b"5C": b"-1000000000"}, 2])
+
+    amounts = await StakeSubmissionQueue(redis, MagicMock(), prefix="test").take(MOCK_NETUID)
+
+    assert amounts == {"5A": 0.03, "5C": -1.0}
+    redis.pipe.delete.assert_called_once_with("test:amounts:1", "test:scheduled:1")
+
+
+@pytest.mark.asyncio
+async def test_submission_retry_backs_off():
+    """Test that consecutive retries of a subnet are scheduled twice as late each time."""
+    redis = mock_redis([])
+    dispatch = MagicMock()
+    queue = StakeSubmissionQueue(redis, dispatch, window=6.0, prefix="test")
+    redis.pipe.execute.side_effect = [[2, True], [50_000_000, True, True, b"unused"]]
+
+    with patch("app.services.stake_pipeline.settings.STAKE_SUBMIT_MAX_RETRIES", 3):
+        task_id = await queue.retry(MOCK_NETUID, {"5A": 0.05})
+
+    redis.pipe.incr.assert_called_once_with("test:attempts:1")
+    dispatch.assert_called_once_with(MOCK_NETUID, task_id, 24.0)
+
+
+@pytest.mark.asyncio
+async def test_submission_retry_drops_after_max_retries():
+    """Test that changes are dropped once a subnet used up its retries."""
+    redis = mock_redis([4, True])
+    dispatch = MagicMock()
+
+    with patch("app.services.stake_pipeline.settings.STAKE_SUBMIT_MAX_RETRIES", 3):
+        task_id = await StakeSubmissionQueue(redis, dispatch, prefix="test").retry(MOCK_NETUID, {"5A": 0.05})
+
+    assert task_id is None
+    dispatch.assert_not_called()
+    redis.pipe.hincrby.assert_not_called()
+    redis.delete.assert_called_once_with("test:attempts:1")
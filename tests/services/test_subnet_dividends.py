@@ -0,0 +1,162 @@
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.services.subnet_dividends import SubnetDividendsService
+from app.services.subnet_snapshot import SubnetSnapshotStore
+from app.services.tao_dividends import TaoDividendsService
+
+VALID_NETUID = 1
+MOCK_BLOCK = 4200000
+MOCK_DIVIDENDS = {"5A": 3.0, "5B": 1.0, "5C": 3.0, "5D": 2.0}
+
+
+@pytest.fixture
+def mock_bittensor_client():
+    """Create a mock BittensorClient holding one subnet."""
+    client = AsyncMock()
+    client.get_subnet_dividends = AsyncMock(return_value=(MOCK_BLOCK, dict(MOCK_DIVIDENDS)))
+    return client
+
+
+@pytest.fixture
+def mock_redis_cache():
+    """Create a mock RedisCache that misses."""
+    cache = AsyncMock()
+    cache.get = AsyncMock(return_value=None)
+    cache.set = AsyncMock(return_value=True)
+    return cache
+
+
+@pytest.fixture
+def service(mock_bittensor_client, mock_redis_cache):
+    """Create a SubnetDividendsService instance with mocks."""
+    return SubnetDividendsService(mock_bittensor_client, mock_redis_cache)
+
+
+@pytest.mark.asyncio
+async def test_get_page_top_n(service, mock_bittensor_client, mock_redis_cache):
+    """Test that the first page sorted by dividend is the top-N, ties broken by hotkey."""
+    page = await service.get_page(VALID_NETUID, limit=2)
+
+    assert page.block == MOCK_BLOCK
+    assert page.total == 4
+    assert page.cached is False
+    assert [item.hotkey for item in page.items] == ["5C", "5A"]
+    assert page.next_cursor is not None
+    mock_bittensor_client.get_subnet_dividends.assert_called_once_with(VALID_NETUID)
+
+    cached_blob = mock_redis_cache.set.call_args.args[0]
+    assert cached_blob["dividends"] == MOCK_DIVIDENDS
+    assert mock_redis_cache.set.call_args.args[1:] == ("subnet_dividends", VALID_NETUID)
+
+
+@pytest.mark.asyncio
+async def test_get_page_follows_cursor(service):
+    """Test that following cursors walks every hotkey exactly once."""
+    hotkeys = []
+    cursor = None
+    while True:
+        page = await service.get_page(VALID_NETUID, sort_by="hotkey", order="asc", limit=3, cursor=cursor)
+        hotkeys.extend(item.hotkey for item in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert hotkeys == ["5A", "5B", "5C", "5D"]
+
+
+@pytest.mark.asyncio
+async def test_get_page_from_cached_blob(service, mock_bittensor_client, mock_redis_cache):
+    """Test that a cached subnet blob is paged without touching the chain."""
+    mock_redis_cache.get.return_value = {
+        "netuid": VALID_NETUID,
+        "block": MOCK_BLOCK,
+        "dividends": MOCK_DIVIDENDS,
+        "cached_at": time.time()
+    }
+
+    page = await service.get_page(VALID_NETUID, order="asc", limit=10)
+
+    assert page.cached is True
+    assert [item.hotkey for item in page.items] == ["5B", "5D", "5A", "5C"]
+    assert page.next_cursor is None
+    mock_bittensor_client.get_subnet_dividends.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_page_outdated_blob_refetched(mock_bittensor_client, mock_redis_cache):
+    """Test that a blob read before the subnet's last epoch is refetched."""
+    mock_redis_cache.get.return_value = {
+        "netuid": VALID_NETUID,
+        "block": MOCK_BLOCK - 10,
+        "dividends": {},
+        "cached_at": time.time()
+    }
+    watcher = MagicMock()
+    watcher.is_outdated.return_value = True
+    service = SubnetDividendsService(mock_bittensor_client, mock_redis_cache, block_watcher=watcher)
+
+    page = await service.get_page(VALID_NETUID)
+
+    assert page.total == 4
+    mock_bittensor_client.get_subnet_dividends.assert_called_once_with(VALID_NETUID)
+
+
+@pytest.mark.asyncio
+async def test_get_page_from_snapshot(mock_bittensor_client, mock_redis_cache):
+    """Test that a fresh in-process snapshot answers before Redis."""
+    snapshots = SubnetSnapshotStore(ttl=60)
+    service = SubnetDividendsService(mock_bittensor_client, mock_redis_cache, snapshots)
+    await service.get_page(VALID_NETUID)
+    mock_redis_cache.get.reset_mock()
+
+    page = await service.get_page(VALID_NETUID)
+
+    assert page.cached is True
+    mock_redis_cache.get.assert_not_called()
+    mock_bittensor_client.get_subnet_dividends.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_page_invalid_cursor(service):
+    """Test that a malformed cursor is rejected."""
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        await service.get_page(VALID_NETUID, cursor="not-a-cursor")
+
+    hotkey_cursor = SubnetDividendsService.encode_cursor(("5A",))
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        await service.get_page(VALID_NETUID, sort_by="dividend", cursor=hotkey_cursor)
+
+
+@pytest.mark.asyncio
+async def test_hash_layout_reads_and_replaces_subnet_hash(mock_bittensor_client, mock_redis_cache):
+    """Test that the hash layout serves a subnet from the shared subnet hash and caches it with one swap."""
+    mock_redis_cache.get_all_fields = AsyncMock(return_value={})
+    mock_redis_cache.replace_hash = AsyncMock(return_value=True)
+    service = SubnetDividendsService(mock_bittensor_client, mock_redis_cache)
+
+    with patch("app.services.subnet_dividends.settings.CACHE_LAYOUT", "hash"):
+        await service.get_page(VALID_NETUID)
+        prefix, key_args, fields = mock_redis_cache.replace_hash.call_args.args
+        mock_redis_cache.get_all_fields.return_value = dict(fields)
+        block, dividends, cached = await service.get_subnet(VALID_NETUID)
+
+    assert (prefix, key_args) == (TaoDividendsService.CACHE_PREFIX, (VALID_NETUID,))
+    assert fields[TaoDividendsService.BLOCK_FIELD] == MOCK_BLOCK
+    assert fields["5A"]["computed_at_block"] == MOCK_BLOCK
+    assert (block, dividends, cached) == (MOCK_BLOCK, MOCK_DIVIDENDS, True)
+    mock_bittensor_client.get_subnet_dividends.assert_called_once_with(VALID_NETUID)
+    mock_redis_cache.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_hash_layout_hash_without_block_is_miss(mock_bittensor_client, mock_redis_cache):
+    """Test that a subnet hash holding only hotkeys written one by one is not served as the whole subnet."""
+    mock_redis_cache.get_all_fields = AsyncMock(return_value={"5A": {"dividend": 3.0}})
+    mock_redis_cache.replace_hash = AsyncMock(return_value=True)
+    service = SubnetDividendsService(mock_bittensor_client, mock_redis_cache)
+
+    with patch("app.services.subnet_dividends.settings.CACHE_LAYOUT", "hash"):
+        block, dividends, cached = await service.get_subnet(VALID_NETUID)
+
+    assert (dividends, cached) == (MOCK_DIVIDENDS, False)
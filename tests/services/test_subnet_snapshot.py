@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from app.services.subnet_snapshot import SubnetSnapshot, SubnetSnapshotStore
+
+VALID_NETUID = 1
+VALID_HOTKEY = "5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v"
+MOCK_BLOCK = 4200000
+MOCK_DIVIDENDS = {VALID_HOTKEY: 1000.0, "5Other...": 7.0}
+
+
+@pytest.fixture
+def mock_bittensor_client():
+    """Create a mock BittensorClient returning a subnet map."""
+    client = AsyncMock()
+    client.get_subnet_dividends = AsyncMock(return_value=(MOCK_BLOCK, MOCK_DIVIDENDS))
+    return client
+
+
+def test_snapshot_get_unknown_hotkey():
+    """Test that hotkeys missing from the subnet have no dividend."""
+    snapshot = SubnetSnapshot(netuid=VALID_NETUID, block=MOCK_BLOCK, dividends=MOCK_DIVIDENDS)
+    assert snapshot.get(VALID_HOTKEY) == 1000.0
+    assert snapshot.get("5Unknown...") == 0.0
+    assert snapshot.age >= 0
+
+
+@pytest.mark.asyncio
+async def test_get_fetches_once_within_ttl(mock_bittensor_client):
+    """Test that lookups within the TTL are served from the index."""
+    store = SubnetSnapshotStore(ttl=60)
+
+    first = await store.get(VALID_NETUID, mock_bittensor_client)
+    second = await store.get(VALID_NETUID, mock_bittensor_client)
+
+    assert first is second
+    assert first.block == MOCK_BLOCK
+    mock_bittensor_client.get_subnet_dividends.assert_called_once_with(VALID_NETUID)
+
+
+@pytest.mark.asyncio
+async def test_get_refetches_after_ttl(mock_bittensor_client):
+    """Test that an expired snapshot is refetched."""
+    store = SubnetSnapshotStore(ttl=0)
+
+    await store.get(VALID_NETUID, mock_bittensor_client)
+    await store.get(VALID_NETUID, mock_bittensor_client)
+
+    assert mock_bittensor_client.get_subnet_dividends.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_concurrent_callers_share_fetch(mock_bittensor_client):
+    """Test that concurrent misses for a subnet trigger a single fetch."""
+    store = SubnetSnapshotStore(ttl=60)
+
+    snapshots = await asyncio.gather(*(store.get(VALID_NETUID, mock_bittensor_client) for _ in range(10)))
+
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+    mock_bittensor_client.get_subnet_dividends.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_invalidate(mock_bittensor_client):
+    """Test that invalidated subnets are refetched."""
+    store = SubnetSnapshotStore(ttl=60)
+
+    await store.get(VALID_NETUID, mock_bittensor_client)
+    store.invalidate(VALID_NETUID)
+
+    assert store.peek(VALID_NETUID) is None
+    await store.get(VALID_NETUID, mock_bittensor_client)
+    assert mock_bittensor_client.get_subnet_dividends.call_count == 2
@@ -1,8 +1,17 @@
+import asyncio
 import json
+import time
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from contextlib import asynccontextmanager
+from typing import Optional
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.services.cache_serializer import DIVIDEND_FIELDS
+from app.services.single_flight import SingleFlight
 from app.services.tao_dividends import TaoDividendsService
+from app.services.subnet_snapshot import SubnetSnapshotStore
 from app.api.v1.schemas.tao import TaoDividendsResponse
+from app.core.config import settings
+from app.core.responses import encode_model
 
 VALID_NETUID = 1
 VALID_HOTKEY = "5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v"
@@ -52,6 +61,8 @@ async def test_get_dividends_cache_miss(service, mock_bittensor_client, mock_red
         VALID_NETUID,
         VALID_HOTKEY
     )
+    # The key holds the netuid and hotkey, so the payload fits the struct layout
+    assert set(mock_redis_cache.set.call_args.args[0]) == DIVIDEND_FIELDS
 
 @pytest.mark.asyncio
 async def test_get_dividends_cache_hit(service, mock_bittensor_client, mock_redis_cache):
@@ -64,7 +75,7 @@ async def test_get_dividends_cache_hit(service, mock_bittensor_client, mock_redi
         "cached": True,
         "stake_tx_triggered": False
     }
-    mock_redis_cache.get.return_value = json.dumps(cached_data)
+    mock_redis_cache.get.return_value = cached_data
     
     # Execute
     response = await service.get_dividends(VALID_NETUID, VALID_HOTKEY)
@@ -119,4 +130,475 @@ async def test_get_dividends_client_error(service, mock_bittensor_client, mock_r
     
     # Verify interactions
     mock_redis_cache.get.assert_called_once()
-    mock_bittensor_client.get_tao_dividends.assert_called_once() 
\ No newline at end of file
+    mock_bittensor_client.get_tao_dividends.assert_called_once() 
+@pytest.mark.asyncio
+async def test_get_dividends_from_snapshot(mock_bittensor_client, mock_redis_cache):
+    """Test that lookups are answered from a fresh subnet snapshot when one is held."""
+    # Setup
+    mock_bittensor_client.get_subnet_dividends = AsyncMock(
+        return_value=(4200000, {VALID_HOTKEY: MOCK_DIVIDEND})
+    )
+    snapshots = SubnetSnapshotStore(ttl=60)
+    await snapshots.get(VALID_NETUID, mock_bittensor_client)
+    service = TaoDividendsService(mock_bittensor_client, mock_redis_cache, snapshots)
+    
+    # Execute
+    response = await service.get_dividends(VALID_NETUID, VALID_HOTKEY)
+    
+    # Assert
+    assert response.dividend == MOCK_DIVIDEND
+    assert response.block == 4200000
+    assert response.snapshot_age_seconds >= 0
+    mock_bittensor_client.get_subnet_dividends.assert_called_once_with(VALID_NETUID)
+    mock_bittensor_client.get_tao_dividends.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_get_dividends_point_lookup_without_snapshot(mock_bittensor_client, mock_redis_cache):
+    """Test that a single hotkey uses a point lookup when no snapshot is held."""
+    mock_bittensor_client.get_subnet_dividends = AsyncMock()
+    service = TaoDividendsService(mock_bittensor_client, mock_redis_cache, SubnetSnapshotStore(ttl=60))
+    
+    response = await service.get_dividends(VALID_NETUID, VALID_HOTKEY)
+    
+    assert response.dividend == MOCK_DIVIDEND
+    assert response.block is None
+    mock_bittensor_client.get_tao_dividends.assert_called_once_with(VALID_NETUID, VALID_HOTKEY)
+    mock_bittensor_client.get_subnet_dividends.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_fetch_dividends_multi_below_threshold(mock_bittensor_client, mock_redis_cache):
+    """Test that a few hotkeys of a subnet are read with query_multi."""
+    hotkeys = [f"5Hotkey{i}" for i in range(settings.SUBNET_SNAPSHOT_MIN_HOTKEYS - 1)]
+    mock_bittensor_client.get_tao_dividends_multi = AsyncMock(
+        return_value={hotkey: MOCK_DIVIDEND for hotkey in hotkeys}
+    )
+    mock_bittensor_client.get_subnet_dividends = AsyncMock()
+    service = TaoDividendsService(mock_bittensor_client, mock_redis_cache, SubnetSnapshotStore(ttl=60))
+    
+    dividends, snapshot = await service.fetch_dividends(VALID_NETUID, hotkeys)
+    
+    assert snapshot is None
+    assert dividends == {hotkey: MOCK_DIVIDEND for hotkey in hotkeys}
+    mock_bittensor_client.get_tao_dividends_multi.assert_called_once_with(VALID_NETUID, hotkeys)
+    mock_bittensor_client.get_subnet_dividends.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_fetch_dividends_snapshot_at_threshold(mock_bittensor_client, mock_redis_cache):
+    """Test that many hotkeys of a subnet are answered from a full-map snapshot."""
+    hotkeys = [f"5Hotkey{i}" for i in range(settings.SUBNET_SNAPSHOT_MIN_HOTKEYS)]
+    mock_bittensor_client.get_tao_dividends_multi = AsyncMock()
+    mock_bittensor_client.get_subnet_dividends = AsyncMock(
+        return_value=(4200000, {hotkeys[0]: MOCK_DIVIDEND})
+    )
+    service = TaoDividendsService(mock_bittensor_client, mock_redis_cache, SubnetSnapshotStore(ttl=60))
+    
+    dividends, snapshot = await service.fetch_dividends(VALID_NETUID, hotkeys)
+    
+    assert snapshot.block == 4200000
+    assert dividends[hotkeys[0]] == MOCK_DIVIDEND
+    assert dividends[hotkeys[1]] == 0.0
+    mock_bittensor_client.get_subnet_dividends.assert_called_once_with(VALID_NETUID)
+    mock_bittensor_client.get_tao_dividends_multi.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_get_dividends_batch(mock_bittensor_client, mock_redis_cache):
+    """Test that batch misses are grouped per subnet and written back together."""
+    # Setup: one cache hit on netuid 1, two misses on netuid 2, one on netuid 3
+    cached_data = {
+        "netuid": 1,
+        "hotkey": VALID_HOTKEY,
+        "dividend": MOCK_DIVIDEND,
+        "cached": True,
+        "stake_tx_triggered": False
+    }
+    mock_redis_cache.get_many = AsyncMock(return_value=[cached_data, None, None, None])
+    mock_redis_cache.set_many = AsyncMock(return_value=True)
+    mock_bittensor_client.get_tao_dividends_multi = AsyncMock(return_value={"5A": 1.0, "5B": 2.0})
+    mock_bittensor_client.get_tao_dividends = AsyncMock(return_value=3.0)
+    service = TaoDividendsService(mock_bittensor_client, mock_redis_cache)
+    pairs = [(1, VALID_HOTKEY), (2, "5A"), (2, "5B"), (3, "5C"), (2, "5A")]
+    
+    # Execute
+    responses = await service.get_dividends_batch(pairs)
+    
+    # Assert
+    assert [(r.netuid, r.hotkey) for r in responses] == pairs
+    assert [r.dividend for r in responses] == [MOCK_DIVIDEND, 1.0, 2.0, 3.0, 1.0]
+    assert [r.cached for r in responses] == [True, False, False, False, False]
+    
+    mock_redis_cache.get_many.assert_called_once_with(
+        TaoDividendsService.CACHE_PREFIX,
+        [(1, VALID_HOTKEY), (2, "5A"), (2, "5B"), (3, "5C")]
+    )
+    mock_bittensor_client.get_tao_dividends_multi.assert_called_once_with(2, ["5A", "5B"])
+    mock_bittensor_client.get_tao_dividends.assert_called_once_with(3, "5C")
+    
+    written = mock_redis_cache.set_many.call_args.args[1]
+    assert set(written) == {(2, "5A"), (2, "5B"), (3, "5C")}
+
+@pytest.mark.asyncio
+async def test_get_dividends_batch_all_cached(mock_bittensor_client, mock_redis_cache):
+    """Test that a fully cached batch never touches the chain."""
+    cached_data = {
+        "netuid": VALID_NETUID,
+        "hotkey": VALID_HOTKEY,
+        "dividend": MOCK_DIVIDEND,
+        "cached": True,
+        "stake_tx_triggered": False
+    }
+    mock_redis_cache.get_many = AsyncMock(return_value=[cached_data])
+    mock_redis_cache.set_many = AsyncMock(return_value=True)
+    service = TaoDividendsService(mock_bittensor_client, mock_redis_cache)
+    
+    responses = await service.get_dividends_batch([(VALID_NETUID, VALID_HOTKEY)])
+    
+    assert responses[0].cached is True
+    mock_bittensor_client.get_tao_dividends.assert_not_called()
+    mock_redis_cache.set_many.assert_called_once_with(TaoDividendsService.CACHE_PREFIX, {})
+
+@pytest.mark.asyncio
+async def test_get_dividends_concurrent_misses_share_fetch(mock_bittensor_client, mock_redis_cache):
+    """Test that concurrent misses for one key trigger a single chain fetch."""
+    async def slow_dividend(netuid, hotkey):
+        await asyncio.sleep(0.05)
+        return MOCK_DIVIDEND
+    
+    mock_bittensor_client.get_tao_dividends.side_effect = slow_dividend
+    single_flight = SingleFlight()
+    services = [
+        TaoDividendsService(mock_bittensor_client, mock_redis_cache, single_flight=single_flight)
+        for _ in range(5)
+    ]
+    
+    responses = await asyncio.gather(*(s.get_dividends(VALID_NETUID, VALID_HOTKEY) for s in services))
+    
+    assert all(response.dividend == MOCK_DIVIDEND for response in responses)
+    mock_bittensor_client.get_tao_dividends.assert_called_once_with(VALID_NETUID, VALID_HOTKEY)
+    mock_redis_cache.set.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_get_dividends_with_lock_acquired(service, mock_bittensor_client, mock_redis_cache):
+    """Test that the worker holding the Redis lock refreshes the key."""
+    lock = AsyncMock()
+    lock.acquire.return_value = True
+    mock_redis_cache.lock = MagicMock(return_value=lock)
+    
+    with patch("app.services.tao_dividends.settings.CACHE_LOCK_ENABLED", True):
+        response = await service.get_dividends(VALID_NETUID, VALID_HOTKEY)
+    
+    assert response.cached is False
+    lock.acquire.assert_called_once_with(blocking=False)
+    lock.release.assert_called_once()
+    mock_bittensor_client.get_tao_dividends.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_get_dividends_with_lock_held_elsewhere(service, mock_bittensor_client, mock_redis_cache):
+    """Test that a worker without the lock waits for the refreshed cache entry."""
+    lock = AsyncMock()
+    lock.acquire.return_value = False
+    mock_redis_cache.lock = MagicMock(return_value=lock)
+    values = iter([None, None, make_cached_value(-1)])
+    mock_redis_cache.get.side_effect = lambda *args: next(values)
+    
+    with patch("app.services.tao_dividends.settings.CACHE_LOCK_ENABLED", True):
+        response = await service.get_dividends(VALID_NETUID, VALID_HOTKEY)
+    
+    assert response.cached is True
+    assert response.stale is False
+    lock.release.assert_not_called()
+    mock_bittensor_client.get_tao_dividends.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_lock_wait_skips_entry_older_than_refresh(service, mock_bittensor_client, mock_redis_cache):
+    """Test that a worker waiting on the lock does not take the entry being refreshed for its result."""
+    lock = AsyncMock()
+    lock.acquire.return_value = False
+    mock_redis_cache.lock = MagicMock(return_value=lock)
+    old_value = {**make_cached_value(60), "dividend": 1.0}
+    values = iter([old_value, old_value, make_cached_value(-1)])
+    mock_redis_cache.get.side_effect = lambda *args: next(values)
+    
+    with patch("app.services.tao_dividends.settings.CACHE_LOCK_ENABLED", True), \
+            patch("app.services.tao_dividends.settings.CACHE_LOCK_POLL_INTERVAL_SECONDS", 0):
+        response = await service._refresh(VALID_NETUID, VALID_HOTKEY)
+    
+    assert (response.dividend, response.stale) == (MOCK_DIVIDEND, False)
+    mock_bittensor_client.get_tao_dividends.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_lock_wait_timeout_serves_old_entry_stale(service, mock_bittensor_client, mock_redis_cache):
+    """Test that the entry being refreshed is served flagged stale when the refresh does not land in time."""
+    lock = AsyncMock()
+    lock.acquire.return_value = False
+    mock_redis_cache.lock = MagicMock(return_value=lock)
+    mock_redis_cache.get.return_value = make_cached_value(60)
+    
+    with patch("app.services.tao_dividends.settings.CACHE_LOCK_ENABLED", True), \
+            patch("app.services.tao_dividends.settings.CACHE_LOCK_WAIT_SECONDS", 0.05), \
+            patch("app.services.tao_dividends.settings.CACHE_LOCK_POLL_INTERVAL_SECONDS", 0.01):
+        response = await service._refresh(VALID_NETUID, VALID_HOTKEY)
+    
+    assert (response.cached, response.stale) == (True, True)
+    mock_bittensor_client.get_tao_dividends.assert_not_called()
+
+def make_cached_value(age: float, computed_at_block: Optional[int] = None) -> dict:
+    """Create a cached payload written age seconds ago."""
+    return {
+        "netuid": VALID_NETUID,
+        "hotkey": VALID_HOTKEY,
+        "dividend": MOCK_DIVIDEND,
+        "cached": False,
+        "stake_tx_triggered": False,
+        "cached_at": time.time() - age,
+        "computed_at_block": computed_at_block
+    }
+
+@pytest.fixture
+def mock_refresher():
+    """Create a mock CacheRefresher."""
+    refresher = MagicMock()
+    refresher.record_access.return_value = 1
+    refresher.schedule.return_value = True
+    return refresher
+
+@pytest.mark.asyncio
+async def test_get_dividends_stale_served_and_refreshed(mock_bittensor_client, mock_redis_cache, mock_refresher):
+    """Test that an entry past the soft TTL is served stale and refreshed in the background."""
+    mock_redis_cache.get.return_value = make_cached_value(settings.CACHE_SOFT_TTL_SECONDS + 1)
+    service = TaoDividendsService(mock_bittensor_client, mock_redis_cache, refresher=mock_refresher)
+    
+    response = await service.get_dividends(VALID_NETUID, VALID_HOTKEY)
+    
+    assert response.cached is True
+    assert response.stale is True
+    mock_refresher.schedule.assert_called_once()
+    assert mock_refresher.schedule.call_args.args[0] == (VALID_NETUID, VALID_HOTKEY)
+    mock_bittensor_client.get_tao_dividends.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_get_dividends_fresh_not_refreshed(mock_bittensor_client, mock_redis_cache, mock_refresher):
+    """Test that a fresh, cold entry is served without a refresh."""
+    mock_redis_cache.get.return_value = make_cached_value(1)
+    service = TaoDividendsService(mock_bittensor_client, mock_redis_cache, refresher=mock_refresher)
+    
+    response = await service.get_dividends(VALID_NETUID, VALID_HOTKEY)
+    
+    assert response.stale is False
+    mock_refresher.schedule.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_get_dividends_hot_key_refreshed_ahead(mock_bittensor_client, mock_redis_cache, mock_refresher):
+    """Test that a hot entry nearing its soft TTL is refreshed ahead of expiry."""
+    age = settings.CACHE_SOFT_TTL_SECONDS * settings.CACHE_REFRESH_AHEAD_RATIO + 1
+    mock_redis_cache.get.return_value = make_cached_value(age)
+    mock_refresher.record_access.return_value = settings.CACHE_HOT_KEY_MIN_HITS
+    service = TaoDividendsService(mock_bittensor_client, mock_redis_cache, refresher=mock_refresher)
+    
+    response = await service.get_dividends(VALID_NETUID, VALID_HOTKEY)
+    
+    assert response.stale is False
+    mock_refresher.schedule.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_get_dividends_stale_without_refresher(service, mock_bittensor_client, mock_redis_cache):
+    """Test that a stale entry is treated as a miss when nothing can revalidate it."""
+    mock_redis_cache.get.return_value = make_cached_value(settings.CACHE_SOFT_TTL_SECONDS + 1)
+    
+    response = await service.get_dividends(VALID_NETUID, VALID_HOTKEY)
+    
+    assert response.cached is False
+    mock_bittensor_client.get_tao_dividends.assert_called_once_with(VALID_NETUID, VALID_HOTKEY)
+
+@pytest.mark.asyncio
+async def test_scheduled_refresh_updates_cache(mock_bittensor_client, mock_redis_cache, mock_refresher):
+    """Test that the scheduled refresh fetches with the pooled client and rewrites the cache."""
+    mock_redis_cache.get.return_value = make_cached_value(settings.CACHE_SOFT_TTL_SECONDS + 1)
+    service = TaoDividendsService(mock_bittensor_client, mock_redis_cache, refresher=mock_refresher)
+    await service.get_dividends(VALID_NETUID, VALID_HOTKEY)
+    
+    pooled_client = AsyncMock()
+    pooled_client.get_tao_dividends = AsyncMock(return_value=2000.0)
+    refresh = mock_refresher.schedule.call_args.args[1]
+    response = await refresh(pooled_client)
+    
+    assert response.dividend == 2000.0
+    pooled_client.get_tao_dividends.assert_called_once_with(VALID_NETUID, VALID_HOTKEY)
+    cached_payload = mock_redis_cache.set.call_args.args[0]
+    assert cached_payload["dividend"] == 2000.0
+    assert "cached_at" in cached_payload
+
+@pytest.fixture
+def mock_block_watcher():
+    """Create a mock BlockWatcher whose subnet last ran its epoch at block 100."""
+    watcher = MagicMock()
+    watcher.latest_block = 105
+    watcher.is_outdated.side_effect = lambda netuid, block: None if block is None else block < 100
+    return watcher
+
+@pytest.mark.asyncio
+async def test_get_dividends_old_entry_current_block_not_stale(
+    mock_bittensor_client, mock_redis_cache, mock_refresher, mock_block_watcher
+):
+    """Test that an entry past the soft TTL stays fresh while its subnet has not changed."""
+    mock_redis_cache.get.return_value = make_cached_value(settings.CACHE_SOFT_TTL_SECONDS + 1, computed_at_block=101)
+    service = TaoDividendsService(
+        mock_bittensor_client, mock_redis_cache, refresher=mock_refresher, block_watcher=mock_block_watcher
+    )
+    
+    response = await service.get_dividends(VALID_NETUID, VALID_HOTKEY)
+    
+    assert response.stale is False
+    mock_refresher.schedule.assert_not_called()
+    mock_block_watcher.is_outdated.assert_called_once_with(VALID_NETUID, 101)
+
+@pytest.mark.asyncio
+async def test_get_dividends_entry_before_epoch_is_stale(
+    mock_bittensor_client, mock_redis_cache, mock_refresher, mock_block_watcher
+):
+    """Test that a young entry read before its subnet's last epoch is refreshed."""
+    mock_redis_cache.get.return_value = make_cached_value(1, computed_at_block=99)
+    service = TaoDividendsService(
+        mock_bittensor_client, mock_redis_cache, refresher=mock_refresher, block_watcher=mock_block_watcher
+    )
+    
+    response = await service.get_dividends(VALID_NETUID, VALID_HOTKEY)
+    
+    assert response.stale is True
+    mock_refresher.schedule.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_fetch_stamps_chain_head(mock_bittensor_client, mock_redis_cache, mock_block_watcher):
+    """Test that fetched entries are cached with the chain head seen before the fetch."""
+    service = TaoDividendsService(mock_bittensor_client, mock_redis_cache, block_watcher=mock_block_watcher)
+    
+    await service.get_dividends(VALID_NETUID, VALID_HOTKEY)
+    
+    cached_payload = mock_redis_cache.set.call_args.args[0]
+    assert cached_payload["computed_at_block"] == 105
+
+@pytest.mark.asyncio
+async def test_hash_layout_reads_and_writes_subnet_hash(service, mock_bittensor_client, mock_redis_cache):
+    """Test that the hash layout reads a hotkey's field of its subnet hash and writes it back there."""
+    mock_redis_cache.get_fields = AsyncMock(return_value={(VALID_NETUID,): [None]})
+    mock_redis_cache.set_fields = AsyncMock(return_value=True)
+    
+    with patch("app.services.tao_dividends.settings.CACHE_LAYOUT", "hash"):
+        response = await service.get_dividends(VALID_NETUID, VALID_HOTKEY)
+    
+    assert response.dividend == MOCK_DIVIDEND
+    mock_redis_cache.get_fields.assert_called_once_with(
+        TaoDividendsService.CACHE_PREFIX, {(VALID_NETUID,): [VALID_HOTKEY]}
+    )
+    written = mock_redis_cache.set_fields.call_args.args[1]
+    assert written[(VALID_NETUID,)][VALID_HOTKEY]["dividend"] == MOCK_DIVIDEND
+    mock_redis_cache.get.assert_not_called()
+    mock_redis_cache.set.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_hash_layout_batch_reads_one_hmget_per_subnet(mock_bittensor_client, mock_redis_cache):
+    """Test that batch lookups are grouped into one field request per subnet and kept in order."""
+    cached = make_cached_value(1)
+    mock_redis_cache.get_fields = AsyncMock(return_value={(1,): [cached, cached], (2,): [cached]})
+    mock_redis_cache.set_fields = AsyncMock(return_value=True)
+    service = TaoDividendsService(mock_bittensor_client, mock_redis_cache)
+    pairs = [(1, "5A"), (2, "5B"), (1, "5C")]
+    
+    with patch("app.services.tao_dividends.settings.CACHE_LAYOUT", "hash"):
+        responses = await service.get_dividends_batch(pairs)
+    
+    assert [(r.netuid, r.hotkey, r.cached) for r in responses] == [(1, "5A", True), (2, "5B", True), (1, "5C", True)]
+    mock_redis_cache.get_fields.assert_called_once_with(
+        TaoDividendsService.CACHE_PREFIX, {(1,): ["5A", "5C"], (2,): ["5B"]}
+    )
+    mock_bittensor_client.get_tao_dividends_multi.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_hash_layout_prime_subnet_replaces_hash(service, mock_redis_cache):
+    """Test that priming a subnet swaps in its whole hash at once."""
+    snapshot = MagicMock(netuid=VALID_NETUID, block=100, age=0.0, dividends={"5A": 1.0, "5B": 2.0})
+    mock_redis_cache.replace_hash = AsyncMock(return_value=True)
+    
+    with patch("app.services.tao_dividends.settings.CACHE_LAYOUT", "hash"):
+        assert await service.prime_subnet(snapshot) == 2
+    
+    prefix, key_args, fields = mock_redis_cache.replace_hash.call_args.args
+    assert (prefix, key_args) == (TaoDividendsService.CACHE_PREFIX, (VALID_NETUID,))
+    assert set(fields) == {"5A", "5B", TaoDividendsService.BLOCK_FIELD, TaoDividendsService.CACHED_AT_FIELD}
+    assert fields["5B"]["computed_at_block"] == 100
+    assert fields[TaoDividendsService.BLOCK_FIELD] == 100
+
+@pytest.mark.asyncio
+async def test_get_dividends_body_fresh_hit_matches_model(service, mock_bittensor_client, mock_redis_cache):
+    """Test that a fresh hit is encoded from the cached entry exactly as the response model would be."""
+    cached_value = {**make_cached_value(1), "block": 100, "snapshot_age_seconds": 2.5}
+    mock_redis_cache.get.return_value = cached_value
+    
+    body = await service.get_dividends_body(VALID_NETUID, VALID_HOTKEY)
+    
+    expected = TaoDividendsService._response_from_cache(VALID_NETUID, VALID_HOTKEY, cached_value)
+    assert body == encode_model(expected)
+    mock_bittensor_client.get_tao_dividends.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_get_dividends_body_stale_hit_is_encoded(mock_bittensor_client, mock_redis_cache, mock_refresher):
+    """Test that a stale hit is encoded with its stale flag."""
+    mock_redis_cache.get.return_value = make_cached_value(settings.CACHE_SOFT_TTL_SECONDS + 1)
+    service = TaoDividendsService(mock_bittensor_client, mock_redis_cache, refresher=mock_refresher)
+    
+    body = json.loads(await service.get_dividends_body(VALID_NETUID, VALID_HOTKEY))
+    
+    assert (body["cached"], body["stale"], body["dividend"]) == (True, True, MOCK_DIVIDEND)
+    mock_refresher.schedule.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_get_dividends_body_miss_is_fetched(service, mock_bittensor_client, mock_redis_cache):
+    """Test that a miss is fetched, encoded, and cached without a body."""
+    body = json.loads(await service.get_dividends_body(VALID_NETUID, VALID_HOTKEY))
+    
+    assert (body["netuid"], body["hotkey"], body["cached"]) == (VALID_NETUID, VALID_HOTKEY, False)
+    assert set(mock_redis_cache.set.call_args.args[0]) == DIVIDEND_FIELDS
+
+@pytest.mark.asyncio
+async def test_shared_fetch_holds_its_own_pooled_client(mock_redis_cache):
+    """Test that a shared fetch keeps its pooled client when the caller that started it is cancelled."""
+    release = asyncio.Event()
+    client = AsyncMock()
+    
+    async def get_tao_dividends(netuid, hotkey):
+        await release.wait()
+        return MOCK_DIVIDEND
+    
+    client.get_tao_dividends = get_tao_dividends
+    checked_out = []
+    
+    @asynccontextmanager
+    async def acquire():
+        checked_out.append(client)
+        try:
+            yield client
+        finally:
+            checked_out.remove(client)
+    
+    service = TaoDividendsService(None, mock_redis_cache, single_flight=SingleFlight(), pool=MagicMock(acquire=acquire))
+    first = asyncio.create_task(service.get_dividends(VALID_NETUID, VALID_HOTKEY))
+    second = asyncio.create_task(service.get_dividends(VALID_NETUID, VALID_HOTKEY))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    await asyncio.sleep(0.01)
+    
+    assert checked_out == [client]
+    release.set()
+    assert (await second).dividend == MOCK_DIVIDEND
+    assert checked_out == []
+
+@pytest.mark.asyncio
+async def test_cache_hit_checks_out_no_client(mock_redis_cache):
+    """Test that a service with a pool serves cache hits without a client."""
+    mock_redis_cache.get.return_value = make_cached_value(1)
+    pool = MagicMock()
+    service = TaoDividendsService(None, mock_redis_cache, pool=pool)
+    
+    response = await service.get_dividends(VALID_NETUID, VALID_HOTKEY)
+    
+    assert response.cached is True
+    pool.acquire.assert_not_called()
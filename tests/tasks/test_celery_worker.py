@@ -0,0 +1,87 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from prometheus_client import REGISTRY
+from app.core.config import settings
+from app.tasks import celery_worker, dividend_history
+
+
+@pytest.fixture
+def mock_pool_class():
+    """Patch the client pool created for the worker process."""
+    with patch("app.tasks.celery_worker.BittensorClientPool") as pool_class, \
+            patch("app.tasks.celery_worker.ChainExecutor"):
+        pool = MagicMock()
+        pool.start = AsyncMock()
+        pool.close = AsyncMock()
+        pool_class.return_value = pool
+        yield pool_class
+    celery_worker.shutdown_worker_process()
+
+
+def test_concurrency_from_settings():
+    """Test that worker concurrency and prefetch come from settings."""
+    assert celery_worker.celery.conf.worker_concurrency == settings.CELERY_WORKER_CONCURRENCY
+    assert celery_worker.celery.conf.worker_prefetch_multiplier == settings.CELERY_WORKER_PREFETCH_MULTIPLIER
+
+
+def test_dividend_history_scheduled():
+    """Test that beat runs the dividend history ingestion every DIVIDEND_HISTORY_INTERVAL_SECONDS."""
+    entry = celery_worker.celery.conf.beat_schedule["ingest-dividend-history"]
+    assert entry["task"] == dividend_history.ingest_dividend_history.name
+    assert entry["task"] in celery_worker.celery.tasks
+    assert entry["schedule"] == settings.DIVIDEND_HISTORY_INTERVAL_SECONDS
+    assert entry["options"]["expires"] == settings.DIVIDEND_HISTORY_INTERVAL_SECONDS
+
+
+def test_worker_process_connects_once(mock_pool_class):
+    """Test that the worker pool is created at process init and reused by tasks."""
+    celery_worker.init_worker_process()
+    celery_worker.run_async(celery_worker._start_worker_pool())
+
+    mock_pool_class.assert_called_once()
+    assert mock_pool_class.call_args.kwargs["size"] == 1
+    mock_pool_class.return_value.start.assert_called_once()
+
+
+def test_worker_process_init_survives_connect_failure(mock_pool_class):
+    """Test that a failed connect at init does not stop the worker process."""
+    mock_pool_class.return_value.start.side_effect = Exception("Network error")
+
+    celery_worker.init_worker_process()
+
+    assert celery_worker._worker_pool is None
+
+
+def test_worker_process_shutdown_closes_pool(mock_pool_class):
+    """Test that shutting down closes the pool and the event loop."""
+    celery_worker.init_worker_process()
+    loop = celery_worker._worker_loop
+
+    celery_worker.shutdown_worker_process()
+
+    mock_pool_class.return_value.close.assert_called_once()
+    assert loop.is_closed()
+    assert celery_worker._worker_pool is None
+
+
+def test_worker_http_client_is_reused():
+    """Test that tasks of a worker process share one HTTP client until shutdown."""
+    http = celery_worker.worker_http_client()
+
+    assert celery_worker.worker_http_client() is http
+
+    celery_worker.shutdown_worker_process()
+    assert http.is_closed
+    assert celery_worker._worker_http is None
+
+
+def test_task_duration_recorded():
+    """Test that task run time is observed per task and state."""
+    labels = {"task": "test_celery", "state": "SUCCESS"}
+    before = REGISTRY.get_sample_value("tao_watch_celery_task_duration_seconds_count", labels) or 0.0
+
+    celery_worker.record_task_start(task_id="task-1")
+    celery_worker.record_task_duration(task_id="task-1", task=celery_worker.test_celery, state="SUCCESS")
+
+    assert REGISTRY.get_sample_value("tao_watch_celery_task_duration_seconds_count", labels) == before + 1
+    assert "task-1" not in celery_worker._task_started_at
@@ -0,0 +1,103 @@
+import json
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.tasks import prefetch
+
+MOCK_BLOCK = 4200000
+
+
+@pytest.fixture
+def mock_client():
+    """Patch the worker's persistent client used by the prefetch tasks."""
+    client = AsyncMock()
+    client.get_subnet_netuids.return_value = (MOCK_BLOCK, [1, 2])
+    client.get_subnet_dividends.return_value = (MOCK_BLOCK, {"5A": 1.0, "5B": 2.0})
+
+    @asynccontextmanager
+    async def worker_client():
+        yield client
+
+    with patch("app.tasks.prefetch.worker_client", worker_client):
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_prefetch_subnet_dividends_primes_caches(mock_client):
+    """Test that a subnet is written as hotkey entries and as a subnet blob."""
+    redis = AsyncMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    pipeline_context = MagicMock()
+    pipeline_context.__aenter__ = AsyncMock(return_value=pipe)
+    pipeline_context.__aexit__ = AsyncMock(return_value=False)
+    redis.pipeline = MagicMock(return_value=pipeline_context)
+
+    with patch("app.tasks.prefetch.Redis.from_url", return_value=redis):
+        result = await prefetch.prefetch_subnet_dividends(1)
+
+    assert result == {"netuid": 1, "block": MOCK_BLOCK, "hotkeys": 2}
+    assert pipe.set.call_count == 2
+    key, payload = pipe.set.call_args_list[0].args
+    assert key == "tao_dividends:1:5A"
+    assert json.loads(payload)["computed_at_block"] == MOCK_BLOCK
+    assert redis.set.call_args.args[0] == "subnet_dividends:1"
+    redis.aclose.assert_called_once()
+    mock_client.close.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_subnet_dividends_writes_one_hash(mock_client):
+    """Test that with the hash layout a subnet is written once, as the hash both endpoints read."""
+    redis = AsyncMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[[]])
+    pipeline_context = MagicMock()
+    pipeline_context.__aenter__ = AsyncMock(return_value=pipe)
+    pipeline_context.__aexit__ = AsyncMock(return_value=False)
+    redis.pipeline = MagicMock(return_value=pipeline_context)
+
+    with patch("app.tasks.prefetch.Redis.from_url", return_value=redis), \
+            patch("app.tasks.prefetch.settings.CACHE_LAYOUT", "hash"):
+        await prefetch.prefetch_subnet_dividends(1)
+
+    pipe.rename.assert_called_once_with(pipe.hset.call_args.args[0], "tao_dividends:1")
+    assert set(pipe.hset.call_args.kwargs["mapping"]) == {"5A", "5B", "_block", "_cached_at"}
+    redis.set.assert_not_called()
+
+
+def test_prefetch_network_dividends_fans_out(mock_client):
+    """Test that one task per subnet is dispatched with a recording callback."""
+    with patch("app.tasks.prefetch.chord") as mock_chord:
+        assert prefetch.prefetch_network_dividends() == 2
+
+    header = list(mock_chord.call_args.args[0])
+    assert [signature.args for signature in header] == [(1,), (2,)]
+    callback = mock_chord.return_value.call_args.args[0]
+    assert callback.task == "record_prefetch"
+    assert callback.args == (MOCK_BLOCK,)
+
+
+def test_prefetch_subnet_returns_errors(mock_client):
+    """Test that a failing subnet is reported instead of raised."""
+    mock_client.get_subnet_dividends.side_effect = Exception("Network error")
+
+    with patch("app.tasks.prefetch.Redis.from_url", return_value=AsyncMock()):
+        assert prefetch.prefetch_subnet(3) == {"netuid": 3, "error": "Network error"}
+
+
+def test_record_prefetch():
+    """Test that the run summary is stored in Redis."""
+    redis = MagicMock()
+    with patch("app.tasks.prefetch.SyncRedis.from_url") as from_url:
+        from_url.return_value.__enter__.return_value = redis
+        summary = prefetch.record_prefetch(
+            [{"netuid": 1, "block": MOCK_BLOCK, "hotkeys": 2}, {"netuid": 2, "error": "boom"}],
+            MOCK_BLOCK
+        )
+
+    assert summary["subnets"] == 1
+    assert summary["failed"] == [2]
+    assert summary["hotkeys"] == 2
+    key, value = redis.set.call_args.args
+    assert json.loads(value)["block"] == MOCK_BLOCK
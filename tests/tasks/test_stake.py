@@ -0,0 +1,149 @@
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.core.config import settings
+from app.services.bittensor_client import ExtrinsicNotSubmittedError
+from app.tasks import celery_worker, stake
+
+
+@pytest.fixture
+def mock_client():
+    """Patch the worker's persistent client used by the stake tasks."""
+    client = AsyncMock()
+    client.submit_stake.return_value = "0xhash"
+
+    @asynccontextmanager
+    async def worker_client():
+        yield client
+
+    with patch("app.tasks.stake.worker_client", worker_client):
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_run_subnet_stake_pipeline_queues_submission():
+    """Test that a batch's stake changes are added to the coalesced submission."""
+    redis = AsyncMock()
+    tweets = MagicMock()
+    tweets.search = AsyncMock(return_value=["sn1 up"])
+    scorer = MagicMock()
+    scorer.score = AsyncMock(return_value=10.0)
+    submit = AsyncMock(return_value="task-id")
+
+    with patch("app.tasks.stake.Redis.from_url", return_value=redis), \
+            patch("app.tasks.stake.StakeJobQueue.take", AsyncMock(return_value=["5A", "5B"])), \
+            patch("app.tasks.stake.StakeSubmissionQueue.submit_stake", submit), \
+            patch("app.tasks.stake.DaturaTweetSource", return_value=tweets), \
+            patch("app.tasks.stake.ChutesSentimentScorer", return_value=scorer), \
+            patch("app.tasks.stake.worker_http_client"):
+        result = await stake.run_subnet_stake_pipeline(1)
+
+    assert result["submission"] == "task-id"
+    netuid, amounts = submit.call_args.args
+    assert netuid == 1
+    assert set(amounts) == {"5A", "5B"}
+    redis.aclose.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_submit_subnet_stake_submits_net_amounts(mock_client):
+    """Test that the net amounts of a window are submitted in one extrinsic."""
+    redis = AsyncMock()
+
+    with patch("app.tasks.stake.Redis.from_url", return_value=redis), \
+            patch("app.tasks.stake.StakeSubmissionQueue.take", AsyncMock(return_value={"5A": 0.3})):
+        result = await stake.submit_subnet_stake(1)
+
+    assert result == {"netuid": 1, "amounts": {"5A": 0.3}, "extrinsic_hash": "0xhash"}
+    mock_client.submit_stake.assert_called_once_with(1, {"5A": 0.3})
+    # A submission that went through resets the subnet's retry count
+    redis.delete.assert_called_once()
+    redis.aclose.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_submit_subnet_stake_skips_cancelled_changes(mock_client):
+    """Test that nothing is submitted when the changes of a window cancel out."""
+    with patch("app.tasks.stake.Redis.from_url", return_value=AsyncMock()), \
+            patch("app.tasks.stake.StakeSubmissionQueue.take", AsyncMock(return_value={})):
+        result = await stake.submit_subnet_stake(1)
+
+    assert result["extrinsic_hash"] is None
+    mock_client.submit_stake.assert_not_called()
+
+
+async def submit_failing(error: Exception) -> AsyncMock:
+    """Submit a window of changes whose submission raises error, returning the patched retry."""
+    retry = AsyncMock(return_value="next-task-id")
+    with patch("app.tasks.stake.Redis.from_url", return_value=AsyncMock()), \
+            patch("app.tasks.stake.StakeSubmissionQueue.take", AsyncMock(return_value={"5A": 0.3})), \
+            patch("app.tasks.stake.StakeSubmissionQueue.retry", retry):
+        with pytest.raises(type(error)):
+            await stake.submit_subnet_stake(1)
+    return retry
+
+
+@pytest.mark.asyncio
+async def test_submit_subnet_stake_retries_changes_not_submitted(mock_client):
+    """Test that changes that failed before reaching the node are retried."""
+    mock_client.submit_stake.side_effect = ExtrinsicNotSubmittedError("Not connected to Bittensor network")
+
+    retry = await submit_failing(mock_client.submit_stake.side_effect)
+
+    retry.assert_called_once_with(1, {"5A": 0.3})
+
+
+@pytest.mark.asyncio
+async def test_submit_subnet_stake_retries_when_client_unavailable():
+    """Test that changes are retried when no client could be checked out."""
+    @asynccontextmanager
+    async def worker_client():
+        raise ConnectionError("node unreachable")
+        yield
+
+    with patch("app.tasks.stake.worker_client", worker_client):
+        retry = await submit_failing(ConnectionError("node unreachable"))
+
+    retry.assert_called_once_with(1, {"5A": 0.3})
+
+
+@pytest.mark.asyncio
+async def test_submit_subnet_stake_does_not_retry_after_submission(mock_client):
+    """Test that a timeout after submission is not retried, since the extrinsic may be broadcast."""
+    mock_client.submit_stake.side_effect = TimeoutError()
+
+    retry = await submit_failing(TimeoutError())
+
+    retry.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_submit_subnet_stake_drops_invalid_changes(mock_client):
+    """Test that permanent errors like a missing wallet are not retried."""
+    mock_client.submit_stake.side_effect = ValueError("BITTENSOR_WALLET_SEED is not configured")
+
+    retry = await submit_failing(mock_client.submit_stake.side_effect)
+
+    retry.assert_not_called()
+
+
+def test_schedule_stake_pipeline_uses_countdown():
+    """Test that a batch is scheduled to run after the debounce delay."""
+    with patch.object(stake.run_stake_pipeline, "apply_async") as apply_async:
+        stake.schedule_stake_pipeline(1, 12.0)
+
+    apply_async.assert_called_once_with(args=[1], countdown=12.0)
+
+
+def test_schedule_stake_submission_uses_dedup_task_id():
+    """Test that a submission runs under the task id handed out to its callers."""
+    with patch.object(stake.submit_stake_batch, "apply_async") as apply_async:
+        stake.schedule_stake_submission(1, "task-id", 12.0)
+
+    apply_async.assert_called_once_with(args=[1], task_id="task-id", countdown=12.0)
+
+
+def test_submissions_routed_to_stake_queue():
+    """Test that stake submissions go to their own queue."""
+    routes = celery_worker.celery.conf.task_routes
+    assert routes["submit_stake_batch"]["queue"] == settings.STAKE_SUBMIT_QUEUE
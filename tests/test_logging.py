@@ -0,0 +1,106 @@
+import io
+import json
+import logging
+import sys
+from typing import Any, Dict, Iterator, List
+from unittest.mock import patch
+import pytest
+from loguru import logger
+from app.core.config import settings
+from app.core.logging import InterceptHandler, JsonSink, SamplingFilter, configure_logging, get_logger
+
+
+@pytest.fixture
+def records() -> Iterator[List[Dict[str, Any]]]:
+    """Capture loguru records at every level, restoring the default handler afterwards."""
+    captured: List[Dict[str, Any]] = []
+    logger.remove()
+    logger.add(lambda message: captured.append(message.record), level=0)
+    yield captured
+    logger.remove()
+    logger.add(sys.stderr)
+
+
+def make_record(name: str, level: str = "DEBUG") -> Dict[str, Any]:
+    return {"name": "app.module", "level": logger.level(level), "extra": {"name": name}}
+
+
+def test_sampling_filter_keeps_one_in_n_per_logger():
+    """Test that a sampled logger keeps every n-th record and other loggers keep all of them."""
+    sampling = SamplingFilter({"hot": 0.25, "muted": 0.0})
+
+    assert [sampling(make_record("hot")) for _ in range(8)] == [True, False, False, False] * 2
+    assert not sampling(make_record("muted"))
+    assert all(sampling(make_record("other")) for _ in range(3))
+
+
+def test_sampling_filter_keeps_warnings():
+    """Test that warnings and errors of sampled loggers are never dropped."""
+    sampling = SamplingFilter({"hot": 0.0})
+
+    assert sampling(make_record("hot", "WARNING"))
+    assert sampling(make_record("hot", "ERROR"))
+
+
+def test_sampling_filter_falls_back_to_module_name():
+    """Test that records without a bound name are sampled by their module."""
+    sampling = SamplingFilter({"app.module": 0.0})
+
+    assert not sampling({"name": "app.module", "level": logger.level("INFO"), "extra": {}})
+
+
+def test_json_sink_writes_one_object_per_record(records):
+    """Test that the JSON sink writes the bound logger name, extra fields and traceback."""
+    stream = io.StringIO()
+    logger.add(JsonSink(stream), format="{message}")
+
+    get_logger("tao_dividends.hot_path").bind(netuid=1).info("Cache hit for netuid={}", 1)
+    try:
+        raise ValueError("bad value")
+    except ValueError:
+        logger.exception("Failed")
+
+    first, second = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert (first["logger"], first["level"], first["message"]) == ("tao_dividends.hot_path", "INFO", "Cache hit for netuid=1")
+    assert first["extra"] == {"netuid": 1}
+    assert second["logger"] == __name__
+    assert "ValueError: bad value" in second["exception"]
+
+
+def test_intercept_handler_keeps_record_origin(records):
+    """Test that standard logging records keep their logger name, function and line."""
+    std_logger = logging.getLogger("tests.intercepted")
+    std_logger.handlers = [InterceptHandler()]
+    std_logger.propagate = False
+    std_logger.setLevel(logging.INFO)
+
+    line = sys._getframe().f_lineno + 1
+    std_logger.warning("Disk %s", "full")
+
+    assert len(records) == 1
+    record = records[0]
+    assert (record["name"], record["function"], record["line"]) == (
+        "tests.intercepted", "test_intercept_handler_keeps_record_origin", line
+    )
+    assert (record["level"].name, record["message"]) == ("WARNING", "Disk full")
+
+
+def test_configure_logging_enqueues_json(records, capsys):
+    """Test that configured logging writes sampled JSON lines from the background writer."""
+    with patch.object(settings, "LOG_LEVEL", "DEBUG"), \
+            patch.object(settings, "LOG_JSON", True), \
+            patch.object(settings, "LOG_ENQUEUE", True), \
+            patch.object(settings, "LOG_SAMPLE_RATES", {"redis_cache.hot_path": 0.5}):
+        configure_logging()
+
+    for index in range(4):
+        get_logger("redis_cache.hot_path").debug("Cache hit for key: {}", index)
+    logging.getLogger("uvicorn.access").info("GET /metrics 200")
+    logger.complete()
+    logger.remove()
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["message"] for line in lines] == [
+        "Cache hit for key: 0", "Cache hit for key: 2", "GET /metrics 200"
+    ]
+    assert lines[-1]["logger"] == "uvicorn.access"